@@ -0,0 +1,6 @@
+"""
+Metrics API endpoint that exposes the metrics of the API to Prometheus.
+"""
+from foundationallm.hosting import create_metrics_router
+
+router = create_metrics_router()
@@ -1,31 +1,7 @@
 """
-Status API endpoint that acts as a health check for the API.
+Status API endpoints that act as health checks for the API.
 """
-import os
-from fastapi import APIRouter
-from foundationallm.config.environment_variables import HOSTNAME, FOUNDATIONALLM_VERSION
+from foundationallm.hosting import create_status_router
 from app.dependencies import API_NAME
 
-router = APIRouter(
-    prefix='/status',
-    tags=['status'],
-    responses={404: {'description':'Not found'}}
-)
-
-@router.get('')
-async def get_status():
-    """
-    Retrieves the status of the API.
-    
-    Returns
-    -------
-    JSON
-        Object containing the name, instance, version, and status of the API.
-    """    
-    statusMessage = {
-        "name": API_NAME,
-        "instance": os.environ[HOSTNAME],
-        "version": os.environ[FOUNDATIONALLM_VERSION],
-        "status": "ready"
-    }
-    return statusMessage
+router = create_status_router(API_NAME)
@@ -2,18 +2,66 @@
 Main entry-point for the FoundationaLLM DataSourceHubAPI.
 Runs web server exposing the API.
 """
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from app.dependencies import API_NAME, get_config
 from app.routers import (
     manage,
+    metrics,
     status
 )
+from foundationallm.config import CredentialManager
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS,
+    FOUNDATIONALLM_READINESS_PROBES_ENABLED
+)
+from foundationallm.hosting import Readiness, Startup
 from foundationallm.telemetry import Telemetry
 
-# Open a connection to the app configuration
-config = get_config()
-# Start collecting telemetry
-Telemetry.configure_monitoring(config, f'FoundationaLLM:APIs:{API_NAME}:AppInsightsConnectionString')
+def configure_telemetry():
+    """
+    Starts collecting telemetry.
+    """
+    Telemetry.configure_monitoring(get_config(), f'FoundationaLLM:APIs:{API_NAME}:AppInsightsConnectionString')
+
+def create_readiness(startup: Startup) -> Readiness:
+    """
+    Creates the checks that determine whether the API is ready to serve requests:
+    the startup tasks have finished and the configuration is loaded.
+    """
+    readiness = Readiness()
+    readiness.add_check('startup', lambda: startup.is_ready)
+    readiness.add_check('config', lambda: startup.get_status().get('config') == 'completed')
+    if os.environ.get(FOUNDATIONALLM_READINESS_PROBES_ENABLED, 'false').lower() == 'true':
+        readiness.add_check(
+            'app_configuration',
+            lambda: get_config().probe(),
+            cache_seconds=float(os.environ.get(FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS, 5)),
+            required=False)
+    return readiness
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the configuration and starts collecting telemetry before the API serves requests.
+    """
+    startup = Startup()
+    # Open a connection to the app configuration
+    startup.add_task('config', get_config)
+    startup.add_task('telemetry', configure_telemetry, depends_on=['config'])
+    app.state.startup = startup
+    app.state.readiness = create_readiness(startup)
+    Telemetry.add_cache_statistics('token', CredentialManager.get_statistics)
+
+    await startup.start()
+    app.extra['config'] = get_config()
+    event_loop_monitor = asyncio.create_task(Telemetry.monitor_event_loop())
+    yield
+    event_loop_monitor.cancel()
+    await startup.stop()
 
 app = FastAPI(
     title=f'FoundationaLLM {API_NAME}',
@@ -33,10 +81,13 @@ app = FastAPI(
         'name': 'FoundationaLLM Software License',
         'url': 'https://www.foundationallm.ai/license',
     },
-    config=get_config()
+    lifespan=lifespan
 )
+# Telemetry is configured at startup; requests are traced and measured once it is.
+FastAPIInstrumentor.instrument_app(app)
 
 app.include_router(manage.router)
+app.include_router(metrics.router)
 app.include_router(status.router)
 
 @app.get('/')
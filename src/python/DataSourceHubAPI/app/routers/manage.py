@@ -1,6 +1,7 @@
 """
 The endpoint for managing the LangChainAPI.
 """
+import asyncio
 import time
 from fastapi import APIRouter, Depends, HTTPException
 from foundationallm.telemetry import Telemetry
@@ -41,7 +42,8 @@ async def refresh_cache(name: str):
 
         if name=='config' or name=='configuration':
             try:
-                get_config('refresh')
+                # Requests keep using the current configuration until the reload completes.
+                await asyncio.wrap_future(get_config().refresh())
             except Exception as e:
                 Telemetry.record_exception(span, e)
                 handle_exception(e)
@@ -2,13 +2,56 @@
 Main entry-point for the FoundationaLLM DataSourceHubAPI.
 Runs web server exposing the API.
 """
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from app.dependencies import API_NAME, get_config
 from app.routers import (
     analyze,
     manage,
+    metrics,
     status
 )
+from foundationallm.integration.config.environment_variables import FOUNDATIONALLM_WARM_UP_ENABLED
+from foundationallm.integration.mspresidio import Analyzer
+from foundationallm.integration.telemetry import Telemetry
+
+async def warm_up_analyzer():
+    """
+    Loads the NLP models of the shared analyzer and anonymizer engines, so the first request does not wait on them.
+    A failure is logged, and the models are loaded again by the first request.
+    """
+    try:
+        await asyncio.to_thread(Analyzer.warm_up)
+    except Exception as e:
+        logging.error(e, stack_info=True, exc_info=True)
+        raise
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the configuration before the API serves requests,
+    while the NLP models are loaded concurrently in the background.
+    """
+    Telemetry.configure_metrics()
+    app.state.warm_up = None
+    if os.environ.get(FOUNDATIONALLM_WARM_UP_ENABLED, 'true').lower() == 'true':
+        app.state.warm_up = asyncio.create_task(warm_up_analyzer())
+    # Open a connection to the app configuration
+    try:
+        app.extra['config'] = await asyncio.to_thread(get_config)
+    except BaseException:
+        if app.state.warm_up is not None:
+            app.state.warm_up.cancel()
+        raise
+    event_loop_monitor = asyncio.create_task(Telemetry.monitor_event_loop())
+    yield
+    event_loop_monitor.cancel()
+    if app.state.warm_up is not None:
+        app.state.warm_up.cancel()
 
 app = FastAPI(
     title=f'FoundationaLLM {API_NAME}',
@@ -28,11 +71,14 @@ app = FastAPI(
         'name': 'FoundationaLLM Software License',
         'url': 'https://www.foundationallm.ai/license',
     },
-    config=get_config()
+    lifespan=lifespan
 )
+# Metrics are configured at startup; requests are measured once they are.
+FastAPIInstrumentor.instrument_app(app)
 
 app.include_router(analyze.router)
 app.include_router(manage.router)
+app.include_router(metrics.router)
 app.include_router(status.router)
 
 @app.get('/')
@@ -0,0 +1,25 @@
+"""
+Metrics API endpoint that exposes the metrics of the API to Prometheus.
+"""
+from fastapi import APIRouter, Response
+from foundationallm.integration.telemetry import Telemetry
+
+router = APIRouter(
+    prefix='/metrics',
+    tags=['metrics'],
+    responses={404: {'description':'Not found'}}
+)
+
+@router.get('')
+async def get_metrics() -> Response:
+    """
+    Retrieves the metrics of the API in the Prometheus text format.
+
+    Returns
+    -------
+    Response
+        The current value of every metric: request latency per route, in-flight requests,
+        event loop lag and the latency of the Presidio analyzer and anonymizer.
+    """
+    content, content_type = Telemetry.generate_metrics()
+    return Response(content=content, media_type=content_type)
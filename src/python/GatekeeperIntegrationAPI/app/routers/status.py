@@ -1,8 +1,8 @@
 """
-Status API endpoint that acts as a health check for the API.
+Status API endpoints that act as health checks for the API.
 """
 import os
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from foundationallm.integration.config.environment_variables import HOSTNAME, FOUNDATIONALLM_VERSION
 from app.dependencies import API_NAME
 
@@ -12,8 +12,32 @@ router = APIRouter(
     responses={404: {'description':'Not found'}}
 )
 
+"""
+The checks that determine readiness. The other checks are reported without gating.
+"""
+REQUIRED_CHECKS = ('config', 'warm_up')
+
+def get_checks(request: Request) -> dict:
+    """
+    Determines whether the configuration is loaded, whether the warm-up of the analyzer
+    has finished, and whether it loaded the NLP models. A failed warm-up does not keep
+    the API from being ready, because the models are then loaded by the first request.
+    """
+    warm_up = getattr(request.app.state, 'warm_up', None)
+    return {
+        "config": request.app.extra.get('config') is not None,
+        "warm_up": warm_up is None or warm_up.done(),
+        "analyzer": warm_up is None or (warm_up.done() and not warm_up.cancelled() and warm_up.exception() is None)
+    }
+
+def is_ready(checks: dict) -> bool:
+    """
+    Determines whether the required checks passed.
+    """
+    return all(checks[name] for name in REQUIRED_CHECKS)
+
 @router.get('')
-async def get_status():
+async def get_status(request: Request):
     """
     Retrieves the status of the API.
     
@@ -21,11 +45,50 @@ async def get_status():
     -------
     JSON
         Object containing the name, instance, version, and status of the API.
-    """    
+        The status is "starting" until the API is warmed up.
+    """
     statusMessage = {
         "name": API_NAME,
         "instance": os.environ[HOSTNAME],
         "version": os.environ[FOUNDATIONALLM_VERSION],
-        "status": "ready"
+        "status": "ready" if is_ready(get_checks(request)) else "starting"
     }
     return statusMessage
+
+@router.get('/live')
+async def get_liveness():
+    """
+    Retrieves the liveness of the API. Responds as long as the API process is serving requests,
+    whether or not it has finished starting.
+
+    Returns
+    -------
+    JSON
+        Object containing the name and liveness of the API.
+    """
+    return { "name": API_NAME, "status": "alive" }
+
+@router.get('/ready')
+async def get_readiness(request: Request, response: Response):
+    """
+    Retrieves the readiness of the API. Responds with status code 503 until the configuration
+    is loaded and the warm-up of the analyzer has finished, so traffic is only routed to the API
+    once it can serve requests. Whether the warm-up loaded the NLP models is reported only.
+
+    Returns
+    -------
+    JSON
+        Object containing the name, instance, version, and readiness of the API,
+        with the result of each readiness check.
+    """
+    checks = get_checks(request)
+    ready = is_ready(checks)
+    if not ready:
+        response.status_code = 503
+    return {
+        "name": API_NAME,
+        "instance": os.environ[HOSTNAME],
+        "version": os.environ[FOUNDATIONALLM_VERSION],
+        "status": "ready" if ready else "starting",
+        "checks": checks
+    }
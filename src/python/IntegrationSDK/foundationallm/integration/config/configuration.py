@@ -2,25 +2,73 @@
 Contains the implementation of the Configuration class that is responsible for resolving
 configuration settings from Azure App Configuration.
 """
+import logging
 import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Mapping, Optional
 from azure.identity import DefaultAzureCredential
 from azure.appconfiguration.provider import (
     AzureAppConfigurationKeyVaultOptions,
     SettingSelector,
     load
 )
+from .environment_variables import FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS
+
+"""
+The number of seconds between background reloads when not configured through the environment.
+"""
+DEFAULT_REFRESH_INTERVAL_SECONDS = 300
 
-# Configuration only has one method by design.
-# pylint: disable=too-few-public-methods
 class Configuration:
     """
     Configuration class that is responsible for resolving configuration settings
     from Azure App Configuration.
+
+    The settings are loaded once, on first use, and kept in memory. They are reloaded
+    in the background every FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS seconds
+    or when refresh() is called, and replaced once the reload succeeds, so reads never
+    wait on App Configuration or Key Vault after the first load.
     """
+    def __init__(self):
+        """
+        Initializes the configuration. The settings are loaded on first use.
+        """
+        self.__credential = None
+        self.__snapshot: Optional[Mapping[str, str]] = None
+        self.__load_lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+        self.__pending_refresh: Optional[Future] = None
+        self.__refresh_interval = float(os.environ.get(
+            FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS, DEFAULT_REFRESH_INTERVAL_SECONDS))
+
+    @property
+    def snapshot(self) -> Mapping[str, str]:
+        """
+        The read-only settings currently in use, loading them on first use.
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            with self.__load_lock:
+                if self.__snapshot is None:
+                    self.__snapshot = self.__load()
+                    if self.__refresh_interval > 0:
+                        threading.Thread(
+                            target=Configuration.__refresh_periodically,
+                            args=(weakref.ref(self), self.__refresh_interval),
+                            name='foundationallm-configuration-refresh',
+                            daemon=True
+                        ).start()
+                snapshot = self.__snapshot
+        return snapshot
+
     def get_value(self, key: str) -> str:
         """
         Retrieves the setting value from Azure App Configuration.
-        If the value is not found the method raises an exception.
+        If the value is not found the method raises a KeyError.
 
         Parameters
         ----------
@@ -31,15 +79,69 @@ class Configuration:
         -------
         The configuration value
 
-        Raises an exception if the configuration value is not found.
+        Raises a KeyError if the configuration value is not found.
+        """
+        return self.snapshot[key]
+
+    def refresh(self) -> Future:
+        """
+        Reloads the settings in the background and replaces them once the reload succeeds.
+        Calls made while a reload is running return the running reload.
+
+        Returns
+        -------
+        Future
+            Returns a future that completes once the reloaded settings are in use,
+            or with the error of a failed reload.
+        """
+        with self.__refresh_lock:
+            if self.__pending_refresh is None or self.__pending_refresh.done():
+                self.__pending_refresh = Future()
+                threading.Thread(
+                    target=self.__run_refresh,
+                    args=(self.__pending_refresh,),
+                    name='foundationallm-configuration-load',
+                    daemon=True
+                ).start()
+            return self.__pending_refresh
+
+    def __run_refresh(self, future: Future):
+        """
+        Reloads the settings and swaps them in.
+        """
+        try:
+            self.__snapshot = self.__load()
+            future.set_result(self.__snapshot)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            logging.error('The configuration could not be refreshed, '
+                          'the current configuration remains in use: %s', e)
+            future.set_exception(e)
+
+    def __load(self) -> Mapping[str, str]:
+        """
+        Loads the settings of the GatekeeperIntegrationAPI from Azure App Configuration.
         """
         app_config_uri = os.environ['foundationallm-app-configuration-uri']
-        credential = DefaultAzureCredential(
-            exclude_environment_credential=True)
+        if self.__credential is None:
+            self.__credential = DefaultAzureCredential(
+                exclude_environment_credential=True)
         # Connect to Azure App Configuration with key filter
         selectors = [SettingSelector(
             key_filter="FoundationaLLM:APIs:GatekeeperIntegrationAPI:*")]
-        app_config = load(endpoint=app_config_uri, credential=credential, selects=selectors,
-                            key_vault_options=
-                            AzureAppConfigurationKeyVaultOptions(credential=credential))
-        return app_config[key]
+        with load(endpoint=app_config_uri, credential=self.__credential, selects=selectors,
+                    key_vault_options=
+                    AzureAppConfigurationKeyVaultOptions(credential=self.__credential)) as app_config:
+            return MappingProxyType(dict(app_config))
+
+    @staticmethod
+    def __refresh_periodically(configuration_ref: 'weakref.ref[Configuration]', interval: float):
+        """
+        Reloads the settings on an interval until the configuration is no longer used.
+        """
+        while True:
+            time.sleep(interval)
+            configuration = configuration_ref()
+            if configuration is None:
+                return
+            configuration.refresh()
+            del configuration
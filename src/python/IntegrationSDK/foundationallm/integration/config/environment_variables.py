@@ -12,3 +12,14 @@ The build version of the container. This is also used for the app version used
 to validate the minimum version of the app required to use certain configuration entries.
 """
 FOUNDATIONALLM_VERSION = "FOUNDATIONALLM_VERSION"
+
+"""
+The number of seconds between background reloads of the configuration settings.
+Set to 0 to disable the background reloads.
+"""
+FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS = "FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS"
+
+"""
+Whether the APIs warm up clients and models at startup. Defaults to true.
+"""
+FOUNDATIONALLM_WARM_UP_ENABLED = "FOUNDATIONALLM_WARM_UP_ENABLED"
@@ -2,6 +2,7 @@
 The Analyzer is responsible for analyzing textual content and returning
 the PII entities found in the text, optionally anonymizing the text.
 """
+import threading
 from typing import List
 from presidio_analyzer import AnalyzerEngine, RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
@@ -10,6 +11,7 @@ from foundationallm.integration.models import (
         AnalyzeRequest, AnalyzeResponse,
         PIIResult, PIIResultAnonymized
     )
+from foundationallm.integration.telemetry import Telemetry
 
 # Analyzer only has one method by design.
 # pylint: disable=too-few-public-methods
@@ -17,17 +19,39 @@ class Analyzer:
     """
     The Analyzer is responsible for analyzing textual content and returning
     the PII entities found in the text, optionally anonymizing the text.
+
+    The analyzer and anonymizer engines load NLP models when they are created,
+    so they are created once and shared by every request.
     """
+    _analyzer_engine: AnalyzerEngine = None
+    _anonymizer_engine: AnonymizerEngine = None
+    _lock = threading.Lock()
+
     def __init__(self, request: AnalyzeRequest):
         """
-        Initializes the analyzer and anonymizer engines and sets the request
+        Initializes the analyzer with the shared analyzer and anonymizer engines and sets the request
 
         Parameters:
             request (AnalyzeRequest): The request to analyze        
         """
         self.request = request
-        self.analyzer = AnalyzerEngine()
-        self.anonymizer = AnonymizerEngine()
+        self.analyzer, self.anonymizer = Analyzer.warm_up()
+
+    @classmethod
+    def warm_up(cls) -> tuple:
+        """
+        Creates the shared analyzer and anonymizer engines, loading their NLP models,
+        if they have not been created yet.
+
+        Returns:
+            tuple: The shared analyzer engine and anonymizer engine.
+        """
+        if cls._analyzer_engine is None:
+            with cls._lock:
+                if cls._analyzer_engine is None:
+                    cls._anonymizer_engine = AnonymizerEngine()
+                    cls._analyzer_engine = AnalyzerEngine()
+        return (cls._analyzer_engine, cls._anonymizer_engine)
 
     def analyze(self) -> AnalyzeResponse:
         """
@@ -54,11 +78,13 @@ class Analyzer:
         Uses the Presidio Analyzer to analyze the content and return the PII entities
         found in the text
         """
-        return self.analyzer.analyze(text=self.request.content, language=self.request.language)
+        with Telemetry.track_dependency('presidio'):
+            return self.analyzer.analyze(text=self.request.content, language=self.request.language)
 
     def __anonymize(self, results: List[RecognizerResult]) -> EngineResult:
         """
         Uses the Presidio Anonymizer to anonymize the content based on the PII entities found
         in the text
         """
-        return self.anonymizer.anonymize(text=self.request.content, analyzer_results=results)
+        with Telemetry.track_dependency('presidio'):
+            return self.anonymizer.anonymize(text=self.request.content, analyzer_results=results)
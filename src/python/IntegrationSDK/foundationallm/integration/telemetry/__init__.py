@@ -0,0 +1,4 @@
+"""
+This package contains the telemetry classes for the Gatekeeper Integration
+"""
+from .telemetry import Telemetry
@@ -0,0 +1,122 @@
+"""
+Records the metrics of the Gatekeeper Integration and exposes them to Prometheus.
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+from opentelemetry import metrics
+from opentelemetry.exporter.prometheus import PrometheusMetricReader
+from opentelemetry.metrics import Meter
+from opentelemetry.sdk.metrics import Histogram, MeterProvider
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+from opentelemetry.sdk.resources import Resource
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+# The number of seconds between measurements of the event loop lag.
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 1.0
+
+# The bucket boundaries of the histograms of durations measured in seconds.
+# The default boundaries are meant for durations measured in milliseconds.
+SECONDS_HISTOGRAM_BOUNDARIES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Telemetry:
+    """
+    Records metrics with the OpenTelemetry metrics SDK and exposes them
+    in the Prometheus text format, to be scraped from the /metrics endpoint.
+    """
+    _metrics_configured = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure_metrics():
+        """
+        Configures the OpenTelemetry meter provider to expose metrics to Prometheus.
+        Metrics are only configured once per process.
+        """
+        with Telemetry._lock:
+            if Telemetry._metrics_configured:
+                return
+            views = [
+                View(
+                    instrument_type=Histogram,
+                    instrument_unit='s',
+                    aggregation=ExplicitBucketHistogramAggregation(SECONDS_HISTOGRAM_BOUNDARIES))
+            ]
+            metrics.set_meter_provider(MeterProvider(
+                metric_readers=[PrometheusMetricReader()],
+                resource=Resource.create(),
+                views=views))
+            Telemetry._metrics_configured = True
+
+    @staticmethod
+    def get_meter(name: str) -> Meter:
+        """
+        Creates an OpenTelemetry meter with the specified name.
+
+        Parameters:
+            name (str): The name to assign to the meter.
+
+        Returns:
+            Meter: An OpenTelemetry meter for creating metric instruments.
+        """
+        return metrics.get_meter(name)
+
+    @staticmethod
+    def generate_metrics() -> Tuple[bytes, str]:
+        """
+        Renders the current value of every metric in the Prometheus text format.
+
+        Returns:
+            Tuple[bytes, str]: The metrics and their content type.
+        """
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+    @staticmethod
+    @contextmanager
+    def track_dependency(dependency: str) -> Iterator[None]:
+        """
+        Records the duration of a call to a downstream dependency while the context is entered.
+
+        Parameters:
+            dependency (str): The name of the dependency, such as presidio.
+        """
+        start = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            dependency_duration.record(
+                time.perf_counter() - start,
+                { 'dependency': dependency, 'success': success })
+
+    @staticmethod
+    async def monitor_event_loop(interval: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        """
+        Measures how late the running event loop resumes a task, until cancelled.
+        A growing lag means the event loop is saturated or blocked by synchronous work.
+
+        Parameters:
+            interval (float): The number of seconds between measurements.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            event_loop_lag.record(max(loop.time() - start - interval, 0))
+
+# The instruments are named apart from those of the Python SDK,
+# so no metric name is registered by both telemetry classes.
+meter = Telemetry.get_meter(__name__)
+dependency_duration = meter.create_histogram(
+    'foundationallm.integration.dependency.duration',
+    unit='s',
+    description='The duration of calls to downstream dependencies.'
+)
+event_loop_lag = meter.create_histogram(
+    'foundationallm.integration.event_loop.lag',
+    unit='s',
+    description='How late the event loop resumes a task that is ready to run.'
+)
@@ -2,19 +2,128 @@
 Main entry-point for the FoundationaLLM LangChainAPI.
 Runs web server exposing the API.
 """
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from app.dependencies import API_NAME, get_config
 from app.routers import (
     manage,
+    metrics,
     orchestration,
     status
 )
+from foundationallm.config import CredentialManager
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS,
+    FOUNDATIONALLM_READINESS_PROBES_ENABLED,
+    FOUNDATIONALLM_WARM_UP_ENABLED,
+    FOUNDATIONALLM_WARM_UP_TOKEN_SCOPES
+)
+from foundationallm.hosting import Readiness, Startup
+from foundationallm.langchain.agents import LangChainAgentBase
+from foundationallm.langchain.cache import (
+    QueryEmbeddingCache,
+    RetrievalResultCache,
+    SemanticCompletionCache
+)
+from foundationallm.langchain.retrievers import SearchClientPool
 from foundationallm.telemetry import Telemetry
 
-# Open a connection to the app configuration
-config = get_config()
-# Start collecting telemetry
-Telemetry.configure_monitoring(config, f'FoundationaLLM:APIs:{API_NAME}:AppInsightsConnectionString')
+# The scopes of the access tokens acquired at startup: Azure OpenAI and Azure AI Search.
+WARM_UP_TOKEN_SCOPES = 'https://cognitiveservices.azure.com/.default,https://search.azure.com/.default'
+
+def load_config():
+    """
+    Opens a connection to the app configuration.
+    """
+    config = get_config()
+    # Compiled agent plans hold values resolved from the previous configuration.
+    config.add_refresh_listener(LangChainAgentBase.clear_agent_plans)
+
+def configure_telemetry():
+    """
+    Starts collecting telemetry.
+    """
+    Telemetry.configure_monitoring(get_config(), f'FoundationaLLM:APIs:{API_NAME}:AppInsightsConnectionString')
+
+def get_warm_up_token_scopes() -> list:
+    """
+    Retrieves the scopes of the access tokens acquired at startup.
+    """
+    scopes = os.environ.get(FOUNDATIONALLM_WARM_UP_TOKEN_SCOPES, WARM_UP_TOKEN_SCOPES)
+    return [scope for scope in map(str.strip, scopes.split(',')) if scope]
+
+def acquire_tokens():
+    """
+    Acquires the access tokens used by the language and search clients, so the first request does not wait on them.
+    """
+    for scope in get_warm_up_token_scopes():
+        CredentialManager.get_token(scope)
+
+def load_tokenizer():
+    """
+    Loads the tokenizer used to count the tokens of the text sent to the embedding model.
+    The tokenizer is downloaded the first time it is loaded.
+    """
+    import tiktoken
+    tiktoken.get_encoding('cl100k_base')
+
+def create_readiness(startup: Startup, warm_up: bool) -> Readiness:
+    """
+    Creates the checks that determine whether the API is ready to serve requests:
+    the startup tasks have finished and the configuration is loaded.
+    Whether the access tokens are cached and the search sessions are open is reported without gating,
+    because the optional warm-up tasks may fail and the clients then connect on first use.
+    """
+    readiness = Readiness()
+    readiness.add_check('startup', lambda: startup.is_ready)
+    readiness.add_check('config', lambda: startup.get_status().get('config') == 'completed')
+    if warm_up:
+        readiness.add_check(
+            'credentials',
+            lambda: all(CredentialManager.has_token(scope) for scope in get_warm_up_token_scopes()),
+            required=False)
+        readiness.add_check('search_sessions', SearchClientPool.is_open, required=False)
+    if os.environ.get(FOUNDATIONALLM_READINESS_PROBES_ENABLED, 'false').lower() == 'true':
+        readiness.add_check(
+            'app_configuration',
+            lambda: get_config().probe(),
+            cache_seconds=float(os.environ.get(FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS, 5)),
+            required=False)
+    return readiness
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the configuration and starts collecting telemetry before the API serves requests,
+    while tokens, caches and the tokenizer are warmed up concurrently in the background.
+    Closes the pooled clients when the API shuts down.
+    """
+    warm_up = os.environ.get(FOUNDATIONALLM_WARM_UP_ENABLED, 'true').lower() == 'true'
+    startup = Startup()
+    startup.add_task('config', load_config)
+    startup.add_task('telemetry', configure_telemetry, depends_on=['config'])
+    if warm_up:
+        startup.add_task('tokens', acquire_tokens, required=False)
+        startup.add_task('search_sessions', SearchClientPool.open, required=False)
+        startup.add_task('embedding_cache', QueryEmbeddingCache.load, required=False)
+        startup.add_task('tokenizer', load_tokenizer, required=False)
+    app.state.startup = startup
+    app.state.readiness = create_readiness(startup, warm_up)
+    Telemetry.add_cache_statistics('token', CredentialManager.get_statistics)
+    Telemetry.add_cache_statistics('query_embedding', QueryEmbeddingCache.get_statistics)
+    Telemetry.add_cache_statistics('retrieval_result', RetrievalResultCache.get_statistics)
+    Telemetry.add_cache_statistics('semantic_completion', SemanticCompletionCache.get_statistics)
+
+    await startup.start()
+    app.extra['config'] = get_config()
+    event_loop_monitor = asyncio.create_task(Telemetry.monitor_event_loop())
+    yield
+    event_loop_monitor.cancel()
+    await startup.stop()
+    await SearchClientPool.aclose()
 
 app = FastAPI(
     title=f'FoundationaLLM {API_NAME}',
@@ -34,10 +143,13 @@ app = FastAPI(
         'name': 'FoundationaLLM Software License',
         'url': 'https://www.foundationallm.ai/license',
     },
-    config=config
+    lifespan=lifespan
 )
+# Telemetry is configured at startup; requests are traced and measured once it is.
+FastAPIInstrumentor.instrument_app(app)
 
 app.include_router(manage.router)
+app.include_router(metrics.router)
 app.include_router(orchestration.router)
 app.include_router(status.router)
 
@@ -1,8 +1,11 @@
 """
 The endpoint for managing the LangChainAPI.
 """
+import asyncio
 import time
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
+from foundationallm.langchain.cache import RetrievalResultCache
 from foundationallm.telemetry import Telemetry
 from app.dependencies import (
     API_NAME,
@@ -23,7 +26,7 @@ router = APIRouter(
 )
 
 @router.post('/cache/{name}/refresh')
-async def refresh_cache(name: str):
+async def refresh_cache(name: str, index_name: Optional[str] = None):
     """
     Refreshes the cache for the named object.
 
@@ -32,6 +35,10 @@ async def refresh_cache(name: str):
     name : str
         The name of the cache object to refresh.
         "config", for example.
+    index_name : str
+        When refreshing the "retrieval" cache, the name of the index whose
+        cached search results are invalidated. All cached search results are
+        invalidated when not specified.
     """
     with tracer.start_as_current_span('refresh_cache') as span:
         span.set_attribute('cache_name', name)
@@ -41,10 +48,16 @@ async def refresh_cache(name: str):
 
         if name=='config' or name=='configuration':
             try:
-                get_config('refresh')
+                # Requests keep using the current configuration until the reload completes.
+                await asyncio.wrap_future(get_config().refresh())
             except Exception as e:
                 Telemetry.record_exception(span, e)
                 handle_exception(e)
+        elif name=='retrieval':
+            if index_name is not None:
+                span.set_attribute('index_name', index_name)
+            count = RetrievalResultCache.invalidate(index_name)
+            span.add_event(f'{count} cached search results invalidated.')
         else:
             raise HTTPException(status_code=404, detail=f'Cache named {name} not found.')
 
@@ -1,10 +1,22 @@
 """
 The API endpoint for returning the completion from the LLM for the specified user prompt.
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, Header, Request, Body
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, List, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Body, Query
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from foundationallm.config import Context
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_BATCH_MAX_CONCURRENCY,
+    FOUNDATIONALLM_BATCH_MAX_SIZE
+)
+from foundationallm.langchain.exceptions import LangChainException
 from foundationallm.models.orchestration import (
+    BatchCompletionResult,
     CompletionRequestBase,    
     CompletionResponse
 )
@@ -17,6 +29,30 @@ from app.dependencies import handle_exception, validate_api_key_header
 logger = Telemetry.get_logger(__name__)
 tracer = Telemetry.get_tracer(__name__)
 
+def get_batch_limit(name: str, default: int) -> int:
+    """
+    Reads a batch limit from the environment, falling back to the default
+    when the configured value is not an integer or is less than 1.
+    """
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(
+            '%s must be an integer, but is set to %s. Using %s instead.',
+            name, os.environ.get(name), default
+        )
+        return default
+    if value < 1:
+        logger.warning('%s must be at least 1, but is set to %s. Using %s instead.', name, value, default)
+        return default
+    return value
+
+# The maximum number of completion requests of a batch executed concurrently.
+BATCH_MAX_CONCURRENCY = get_batch_limit(FOUNDATIONALLM_BATCH_MAX_CONCURRENCY, 8)
+
+# The maximum number of completion requests in a batch.
+BATCH_MAX_SIZE = get_batch_limit(FOUNDATIONALLM_BATCH_MAX_SIZE, 100)
+
 # Initialize API routing
 router = APIRouter(
     prefix='/orchestration',
@@ -27,7 +63,13 @@ router = APIRouter(
 
 # temporary to support legacy agents alongside the knowledge-management and internal context agent
 async def resolve_completion_request(request_body: dict = Body(...)) -> CompletionRequestBase:   
-    agent_type = request_body.get("agent", {}).get("type", None)    
+    return create_completion_request(request_body)
+
+def create_completion_request(request_body: dict) -> CompletionRequestBase:
+    if not isinstance(request_body, dict):
+        raise TypeError("The completion request must be a JSON object.")
+    agent = request_body.get("agent")
+    agent_type = agent.get("type", None) if isinstance(agent, dict) else None
     
     match agent_type:
         case "knowledge-management" | "internal-context":
@@ -69,6 +111,230 @@ async def get_completion(
                 configuration=request.app.extra['config'],
                 context=Context(user_identity=x_user_identity)
             )
-            return orchestration_manager.invoke(completion_request)
+            return await orchestration_manager.ainvoke(completion_request)
         except Exception as e:
             handle_exception(e)
+
+@router.post('/completion/stream')
+async def get_completion_stream(
+    request : Request,
+    completion_request: CompletionRequestBase = Depends(resolve_completion_request),
+    x_user_identity: Optional[str] = Header(None)) -> StreamingResponse:
+    """
+    Streams a completion response from a language model as server-sent events.
+
+    A "token" event is sent for each token as it is generated, followed by a single
+    "completion" event containing the full CompletionResponse with citations and
+    token usage. If the request fails after streaming has started, an "error" event
+    is sent instead of the "completion" event.
+    
+    Parameters
+    ----------
+    completion_request : CompletionRequestBase
+        The request object containing the metadata required to build a LangChain agent
+        and generate a completion.
+    request : Request
+        The underlying HTTP request.
+    x_user_identity : str
+        The optional X-USER-IDENTITY header value.
+
+    Returns
+    -------
+    StreamingResponse
+        The text/event-stream response.
+    """
+    try:
+        orchestration_manager = OrchestrationManager(
+            completion_request = completion_request,
+            configuration=request.app.extra['config'],
+            context=Context(user_identity=x_user_identity)
+        )
+    except Exception as e:
+        handle_exception(e)
+
+    return StreamingResponse(
+        format_server_sent_events(completion_request, orchestration_manager.astream(completion_request)),
+        media_type='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+async def format_server_sent_events(
+    completion_request: CompletionRequestBase,
+    events: AsyncIterator[Union[str, CompletionResponse]]) -> AsyncIterator[str]:
+    """
+    Formats the streamed completion events as server-sent events.
+
+    Parameters
+    ----------
+    completion_request : CompletionRequestBase
+        The completion request being executed.
+    events : AsyncIterator[Union[str, CompletionResponse]]
+        The completion tokens followed by the completion response.
+
+    Returns
+    -------
+    AsyncIterator[str]
+        Yields the server-sent events.
+    """
+    with tracer.start_as_current_span('completion_stream') as span:
+        span.set_attribute('request_id', completion_request.request_id)
+        try:
+            async for event in events:
+                if isinstance(event, CompletionResponse):
+                    yield f'event: completion\ndata: {event.model_dump_json()}\n\n'
+                else:
+                    yield f'event: token\ndata: {json.dumps({"token": event})}\n\n'
+        except Exception as e:
+            Telemetry.record_exception(span, e)
+            logging.error(e, stack_info=True, exc_info=True)
+            yield f'event: error\ndata: {json.dumps({"detail": str(e)})}\n\n'
+
+@router.post('/completions/batch')
+async def get_completion_batch(
+    request : Request,
+    request_bodies: List[Any] = Body(...),
+    max_concurrency: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
+    x_user_identity: Optional[str] = Header(None)):
+    """
+    Retrieves the completion responses for a batch of independent completion requests.
+
+    The requests are executed concurrently, sharing the pooled language model and
+    search clients, with at most max_concurrency requests in flight at any time.
+    A failed request does not fail the batch; its result carries the status code and error.
+    Batches larger than the configured maximum batch size are rejected with a 400 status code.
+
+    Parameters
+    ----------
+    request : Request
+        The underlying HTTP request.
+    request_bodies : List[Any]
+        The completion requests to execute. Items that are not JSON objects
+        fail with a 400 status code without failing the batch.
+    max_concurrency : int
+        The maximum number of requests executed concurrently.
+        Defaults to, and is capped at, the configured batch concurrency limit.
+    stream : bool
+        When True, the results are streamed as newline-delimited JSON in the order
+        in which the requests complete. Otherwise, all results are returned in the
+        order of the requests once the batch has completed.
+    x_user_identity : str
+        The optional X-USER-IDENTITY header value.
+
+    Returns
+    -------
+    List[BatchCompletionResult] | StreamingResponse
+        The results of the completion requests, or the application/x-ndjson response.
+    """
+    if len(request_bodies) > BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code = 400,
+            detail = f'The batch contains {len(request_bodies)} requests, which exceeds the maximum batch size of {BATCH_MAX_SIZE}.'
+        )
+
+    limit = min(max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+    context = Context(user_identity=x_user_identity)
+
+    async def execute(index: int, request_body: dict) -> BatchCompletionResult:
+        async with semaphore:
+            return await execute_batch_completion(
+                index, request_body, request.app.extra['config'], context)
+
+    tasks = [asyncio.create_task(execute(index, body)) for index, body in enumerate(request_bodies)]
+
+    if not stream:
+        with tracer.start_as_current_span('completion_batch') as span:
+            span.set_attribute('batch_size', len(tasks))
+            span.set_attribute('max_concurrency', limit)
+            return await asyncio.gather(*tasks)
+
+    return StreamingResponse(
+        format_ndjson_results(tasks, limit),
+        media_type='application/x-ndjson',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+async def execute_batch_completion(
+    index: int,
+    request_body: Any,
+    configuration,
+    context: Context) -> BatchCompletionResult:
+    """
+    Executes one completion request of a batch.
+
+    Parameters
+    ----------
+    index : int
+        The position of the request in the batch.
+    request_body : Any
+        The completion request to execute.
+    configuration : Configuration
+        The application configuration.
+    context : Context
+        The user context under which to execute the completion request.
+
+    Returns
+    -------
+    BatchCompletionResult
+        The completion response, or the status code and error if the request failed.
+    """
+    request_id = request_body.get('request_id') if isinstance(request_body, dict) else None
+    with tracer.start_as_current_span('completion') as span:
+        span.set_attribute('batch_index', index)
+        try:
+            completion_request = create_completion_request(request_body)
+            request_id = completion_request.request_id
+            span.set_attribute('request_id', request_id)
+
+            orchestration_manager = OrchestrationManager(
+                completion_request = completion_request,
+                configuration=configuration,
+                context=context
+            )
+            response = await orchestration_manager.ainvoke(completion_request)
+            return BatchCompletionResult(index=index, request_id=request_id, response=response)
+        except Exception as e:
+            Telemetry.record_exception(span, e)
+            logging.error(e, stack_info=True, exc_info=True)
+            if isinstance(e, LangChainException):
+                status_code = e.code
+            elif isinstance(e, (ValidationError, ValueError, TypeError)):
+                status_code = 400
+            else:
+                status_code = 500
+            return BatchCompletionResult(index=index, request_id=request_id, status_code=status_code, error=str(e))
+
+async def format_ndjson_results(tasks: List[asyncio.Task], max_concurrency: int) -> AsyncIterator[str]:
+    """
+    Formats the results of a batch as newline-delimited JSON, in the order in which they complete.
+    Requests that have not completed are cancelled if the client disconnects.
+
+    Parameters
+    ----------
+    tasks : List[asyncio.Task]
+        The tasks executing the completion requests of the batch.
+    max_concurrency : int
+        The maximum number of requests executed concurrently.
+
+    Returns
+    -------
+    AsyncIterator[str]
+        Yields one JSON document per line for each result.
+    """
+    with tracer.start_as_current_span('completion_batch') as span:
+        span.set_attribute('batch_size', len(tasks))
+        span.set_attribute('max_concurrency', max_concurrency)
+        try:
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                yield f'{result.model_dump_json()}\n'
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,6 +1,7 @@
 """
 Provides dependencies for API calls.
 """
+import hmac
 import logging
 import time
 from typing import Annotated
@@ -9,11 +10,22 @@ from fastapi.security import APIKeyHeader
 from foundationallm.config import Configuration
 
 __config: Configuration = None
+__api_keys: tuple = (None, [])
 API_NAME = 'PromptHubAPI'
+# The settings loaded at startup. Other settings are fetched when they are first read.
+CONFIGURATION_KEY_PREFIXES = [
+    f'FoundationaLLM:APIs:{API_NAME}:',
+    'FoundationaLLM:PromptHub:'
+]
 
 def get_config(action: str = None) -> Configuration:
     """
     Obtains the application configuration settings.
+
+    Parameters
+    ----------
+    action : str
+        "refresh" starts a background reload of the configuration settings.
     
     Returns
     -------
@@ -22,18 +34,46 @@ def get_config(action: str = None) -> Configuration:
     """
     global __config
 
-    start = time.time()
-    if action is not None and action=='refresh':
-        __config = Configuration()
-    else:
-        __config = __config or Configuration()
-    end = time.time()
-    print(f'Time to load config: {end-start}')
+    if __config is None:
+        start = time.time()
+        __config = Configuration(key_prefixes=CONFIGURATION_KEY_PREFIXES)
+        end = time.time()
+        logging.info(f'Time to load config: {end-start}')
+    elif action is not None and action=='refresh':
+        # The configuration is reloaded in the background and swapped in when the reload completes.
+        __config.refresh()
     return __config
 
+def get_api_keys() -> list:
+    """
+    Obtains the API keys accepted by this API: the current key and, while keys are being
+    rotated, the secondary key. The keys are read once per configuration snapshot.
+
+    Returns
+    -------
+    list
+        Returns the accepted API keys, encoded as UTF-8.
+    """
+    global __api_keys
+
+    config = get_config()
+    snapshot = config.snapshot
+    source, api_keys = __api_keys
+    if source is not snapshot:
+        api_keys = [config.get_value(f'FoundationaLLM:APIs:{API_NAME}:APIKey').encode('utf-8')]
+        try:
+            secondary_api_key = config.get_value(f'FoundationaLLM:APIs:{API_NAME}:SecondaryAPIKey')
+            if secondary_api_key:
+                api_keys.append(secondary_api_key.encode('utf-8'))
+        except KeyError:
+            # The secondary key is only configured while keys are being rotated.
+            pass
+        __api_keys = (snapshot, api_keys)
+    return api_keys
+
 def validate_api_key_header(x_api_key: str = Depends(APIKeyHeader(name='X-API-Key'))):
     """
-    Validates that the X-API-Key value in the request header matches the key expected for this API.
+    Validates that the X-API-Key value in the request header matches one of the keys expected for this API.
     
     Parameters
     ----------
@@ -46,7 +86,11 @@ def validate_api_key_header(x_api_key: str = Depends(APIKeyHeader(name='X-API-Ke
         Otherwise, returns False.
     """
 
-    result = x_api_key == get_config().get_value(f'FoundationaLLM:APIs:{API_NAME}:APIKey')
+    # Every key is compared in constant time, so the response time does not reveal the expected key.
+    x_api_key = x_api_key.encode('utf-8')
+    result = False
+    for api_key in get_api_keys():
+        result |= hmac.compare_digest(x_api_key, api_key)
 
     if not result:
         logging.error('Invalid API key. You must provide a valid API key in the X-API-KEY header.')
@@ -1,6 +1,9 @@
 """ 
 Configuration classes for FoundationaLLM Python SDK
 """
+from .configuration_snapshot import ConfigurationSnapshot, KeyVaultReference
+from .configuration_snapshot_store import ConfigurationSnapshotStore
 from .configuration import Configuration
 from .user_identity import UserIdentity
 from .context import Context
+from .credential_manager import CredentialManager
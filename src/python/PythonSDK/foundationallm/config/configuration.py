@@ -1,34 +1,179 @@
-import os
-import logging
+import asyncio
 import json
-from tenacity import retry, wait_random_exponential, stop_after_attempt, RetryError
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Set
+from azure.appconfiguration import (
+    AzureAppConfigurationClient,
+    ConfigurationSetting,
+    FeatureFlagConfigurationSetting,
+    SecretReferenceConfigurationSetting
+)
 from azure.appconfiguration.provider import (
     AzureAppConfigurationKeyVaultOptions,
+    AzureAppConfigurationProvider,
+    SettingSelector,
     load
 )
-from azure.identity import DefaultAzureCredential
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+    ServiceResponseError
+)
+from azure.keyvault.secrets import KeyVaultSecretIdentifier, SecretClient
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+from .configuration_snapshot import ConfigurationSnapshot, KeyVaultReference
+from .configuration_snapshot_store import ConfigurationSnapshotStore
+from .credential_manager import CredentialManager
+from .environment_variables import (
+    FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS,
+    FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY
+)
+
+"""
+Defaults used when the configuration refresh is not configured through environment variables.
+"""
+DEFAULT_REFRESH_INTERVAL_SECONDS = 30
+DEFAULT_SENTINEL_KEY = 'FoundationaLLM:Configuration:Sentinel'
+
+"""
+The prefix of the keys under which Azure App Configuration stores feature flags.
+"""
+FEATURE_FLAG_KEY_PREFIX = '.appconfig.featureflag/'
+
+def is_transient_error(exception: BaseException) -> bool:
+    """
+    Determines whether a failed request to Azure App Configuration or Key Vault may succeed on a retry.
+
+    Parameters
+    ----------
+    exception : BaseException
+        The exception raised by the request.
+
+    Returns
+    -------
+    bool
+        Returns True for connection failures, timeouts, throttling and server errors.
+    """
+    if isinstance(exception, (ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(exception, HttpResponseError):
+        return exception.status_code in (408, 429) or (exception.status_code or 0) >= 500
+    return False
+
+def log_retry_attempt(retry_state):
+    """
+    Logs the outcome of a failed attempt before it is retried.
+    """
+    message = f"""Retrying {retry_state.fn}:
+                    attempt {retry_state.attempt_number}
+                    ended with: {retry_state.outcome}"""
+    if retry_state.outcome.failed:
+        ex = retry_state.outcome.exception()
+        message += f"; Exception: {ex.__class__.__name__}: {ex}"
+    logging.warning(message)
 
 class Configuration():
-    def __init__(self):
-        """Init"""
+    """
+    Application configuration loaded from Azure App Configuration and Key Vault.
+
+    Values are served from an immutable in-memory snapshot. The snapshot is reloaded
+    in the background, either when refresh() is called or when the sentinel key changes,
+    and replaced atomically once the reload succeeds, so reads never wait on a reload.
+
+    Only the settings whose keys start with one of the key prefixes of the API are loaded
+    up front. Other settings are fetched from App Configuration the first time they are read.
+    Fetched settings, and the keys found to be missing, are cached until the snapshot is replaced.
+    The Key Vault references of the loaded settings are resolved while the configuration is loaded,
+    on the loading thread. Those of fetched settings are resolved the first time they are read.
+    Use aget_value() on the event loop, so settings that are not in memory are fetched on a worker thread.
+
+    When a ConfigurationSnapshotStore is configured, the last configuration loaded is kept
+    in an encrypted file. A new process starts from that file right away and reconciles
+    with App Configuration in the background.
+
+    The background refresh is configured with the following environment variables:
+        FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS: seconds between checks of the sentinel key, 0 disables the checks
+        FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY: the key whose change triggers a reload
+    """
+    def __init__(self, key_prefixes: Optional[List[str]] = None):
+        """
+        Loads the configuration.
+
+        Parameters
+        ----------
+        key_prefixes : List[str]
+            The prefixes of the keys of the settings loaded up front, for example "FoundationaLLM:APIs:LangChainAPI:".
+            All settings are loaded up front when not specified.
+        """
         try:
             app_config_uri = os.environ['foundationallm-app-configuration-uri']
         except Exception as e:
             raise e
 
-        credential = DefaultAzureCredential(
-            exclude_environment_credential=True)
+        self.__app_config_uri = app_config_uri
+        self.__credential = CredentialManager.get_credential()
+        self.__key_prefixes = tuple(key_prefixes) if key_prefixes else None
+
+        # will have future usage with Azure App Configuration
+        # if foundationallm-configuration-allow-environment-variables exists and is True, 
+        #   then the environment variables will be checked first, then KV
+        # if foundationallm-configuration-allow-environment-variables does not exist 
+        #   OR foundationallm-configuration-allow-environment-variables is False, 
+        #   then check App config and then KV
+        self.__allow_env_vars = False
+        if "foundationallm-configuration-allow-environment-variables" in os.environ:
+            self.__allow_env_vars = bool(os.environ[
+                    "foundationallm-configuration-allow-environment-variables"
+                    ])
+
+        self.__refresh_interval = float(os.environ.get(
+            FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS, DEFAULT_REFRESH_INTERVAL_SECONDS))
+        self.__sentinel_key = os.environ.get(FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY, DEFAULT_SENTINEL_KEY)
+        self.__sentinel_etag: Optional[str] = None
+        self.__client: Optional[AzureAppConfigurationClient] = None
+        self.__secret_clients: Dict[str, SecretClient] = {}
+        self.__secrets: Dict[str, str] = {}
+        self.__secrets_lock = threading.Lock()
+        self.__fetched_settings: Dict[str, Any] = {}
+        self.__missing_keys: Set[str] = set()
+        self.__fetched_lock = threading.Lock()
+        self.__refresh_listeners: List[Callable[[], None]] = []
+        self.__refresh_lock = threading.Lock()
+        self.__pending_refresh: Optional[Future] = None
+
+        self.__store = ConfigurationSnapshotStore.from_environment(key_prefixes)
+        self.__store_lock = threading.Lock()
+
+        if not self.__restore():
+            self.__snapshot = self.__load(reload_secrets=True)
+            self.__save()
 
-        # Connect to Azure App Configuration.
-        self.__config = load(endpoint=app_config_uri, credential=credential,
-                             key_vault_options=
-                                AzureAppConfigurationKeyVaultOptions(credential=credential))
+        if self.__refresh_interval > 0:
+            threading.Thread(
+                target=Configuration.__watch_sentinel,
+                args=(weakref.ref(self), self.__refresh_interval),
+                name='foundationallm-configuration-refresh',
+                daemon=True
+            ).start()
+
+    @property
+    def snapshot(self) -> ConfigurationSnapshot:
+        """
+        The immutable snapshot of the configuration settings and feature flags.
+        """
+        return self.__snapshot
 
     def get_value(self, key: str) -> str:
         """
         Retrieves the value from Azure App Configuration.
         Otherwise, retrieves the value from the environment variable.
-        If the value is not found the method raises an exception.
+        If the value is not found the method raises a KeyError.
 
         Parameters
         ----------
@@ -39,38 +184,56 @@ class Configuration():
         -------
         The configuration value
 
-        Raises an exception if the configuration value is not found.
+        Raises a KeyError if the configuration value is not found.
         """
         if key is None:
             raise Exception('The key parameter is required for Configuration.get_value().')
 
-        value = None
+        snapshot = self.__snapshot
+        if key in self.__missing_keys:
+            raise KeyError(f'The configuration variable {key} was not found.')
 
-        # will have future usage with Azure App Configuration
-        # if foundationallm-configuration-allow-environment-variables exists and is True, 
-        #   then the environment variables will be checked first, then KV
-        # if foundationallm-configuration-allow-environment-variables does not exist 
-        #   OR foundationallm-configuration-allow-environment-variables is False, 
-        #   then check App config and then KV
-        allow_env_vars = False
-        if "foundationallm-configuration-allow-environment-variables" in os.environ:
-            allow_env_vars = bool(os.environ[
-                    "foundationallm-configuration-allow-environment-variables"
-                    ])
+        value = None
 
-        if allow_env_vars is True:
+        if self.__allow_env_vars is True:
             value = os.environ.get(key)
 
         if value is None:
-            try:
-                value = self.__get_config_with_retry(name=key)
-            except Exception as e:
-                pass
+            value = snapshot.settings.get(key)
+
+        if value is None and self.__key_prefixes is not None and not key.startswith(self.__key_prefixes):
+            value = self.__get_unloaded_setting(snapshot, key)
+
+        if isinstance(value, KeyVaultReference):
+            value = self.__resolve_secret(value.secret_id)
 
         if value is not None:
             return value
         else:
-            raise Exception(f'The configuration variable {key} was not found.')
+            with self.__fetched_lock:
+                if self.__snapshot is snapshot:
+                    self.__missing_keys.add(key)
+            raise KeyError(f'The configuration variable {key} was not found.')
+
+    async def aget_value(self, key: str) -> str:
+        """
+        Retrieves a configuration value without blocking the event loop.
+        Values that are not in memory are retrieved by get_value() on a worker thread.
+
+        Parameters
+        ----------
+        - key : str
+            The key name of the configuration setting to retrieve.
+
+        Returns
+        -------
+        The configuration value
+
+        Raises a KeyError if the configuration value is not found.
+        """
+        if self.__is_in_memory(key):
+            return self.get_value(key)
+        return await asyncio.to_thread(self.get_value, key)
 
     def get_feature_flag(self, key: str) -> bool:
         """
@@ -91,42 +254,292 @@ class Configuration():
         if key is None:
             raise KeyError('The key parameter is required for Configuration.get_feature_flag().')
 
-        value = False
+        return self.__snapshot.feature_flags.get(key, False)
 
-        if "FeatureManagementFeatureFlags" in self.__config.keys():
-            if key in self.__config["FeatureManagementFeatureFlags"].keys():
-                try:
-                    feature_flag_setting = self.__config["FeatureManagementFeatureFlags"][key]
-                    obj = json.loads(feature_flag_setting)
-                    value = obj["enabled"]
-                except Exception as e:
-                    pass
+    def refresh(self, reload_secrets: bool = True) -> Future:
+        """
+        Reloads the configuration in the background and replaces the snapshot once the reload succeeds.
+        Requests keep reading the current snapshot while the reload runs.
+        Calls made while a reload is running do not start another one and return the running reload.
 
-        return value
+        Parameters
+        ----------
+        reload_secrets : bool
+            Whether the secrets of the loaded settings are retrieved from Key Vault again before the swap.
+            When False, cached secrets are reused for unchanged Key Vault references.
 
-    def __retry_before_sleep(self, retry_state):
-        # Log the outcome of each retry attempt.
-        message = f"""Retrying {retry_state.fn}:
-                        attempt {retry_state.attempt_number}
-                        ended with: {retry_state.outcome}"""
-        if retry_state.outcome.failed:
-            ex = retry_state.outcome.exception()
-            message += f"; Exception: {ex.__class__.__name__}: {ex}"
-        if retry_state.attempt_number < 1:
-            logging.info(message)
-        else:
-            logging.warning(message)
+        Returns
+        -------
+        Future
+            Returns a future that completes with the new snapshot, or with the error of a failed reload.
+        """
+        with self.__refresh_lock:
+            if self.__pending_refresh is None or self.__pending_refresh.done():
+                self.__pending_refresh = Future()
+                threading.Thread(
+                    target=self.__run_refresh,
+                    args=(self.__pending_refresh, reload_secrets),
+                    name='foundationallm-configuration-load',
+                    daemon=True
+                ).start()
+            return self.__pending_refresh
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Starts a background reload if the sentinel key changed since the configuration was loaded.
+
+        Returns
+        -------
+        bool
+            Returns True if a reload was started.
+        """
+        if self.__get_sentinel_etag() == self.__sentinel_etag:
+            return False
+        self.refresh(reload_secrets=False)
+        return True
+
+    def probe(self) -> bool:
+        """
+        Checks that App Configuration can be reached by reading the sentinel key.
+
+        Returns
+        -------
+        bool
+            Returns True if App Configuration responded. Raises an exception otherwise.
+        """
+        self.__get_sentinel_etag()
+        return True
+
+    def add_refresh_listener(self, listener: Callable[[], None]):
+        """
+        Registers a function called after every reload, once the new snapshot is in use.
+
+        Parameters
+        ----------
+        listener : Callable[[], None]
+            The function to call, for example to clear values derived from the configuration.
+        """
+        self.__refresh_listeners.append(listener)
+
+    def __run_refresh(self, future: Future, reload_secrets: bool):
+        """
+        Reloads the configuration, swaps the snapshot and notifies the refresh listeners.
+        """
+        try:
+            snapshot = self.__load(reload_secrets)
+        except Exception as e:
+            logging.error(f'The configuration could not be refreshed, the current configuration remains in use: {e}')
+            future.set_exception(e)
+            return
+
+        self.__set_snapshot(snapshot)
+        self.__save()
+        for listener in list(self.__refresh_listeners):
+            try:
+                listener()
+            except Exception as e:
+                logging.error(f'A configuration refresh listener failed: {e}', exc_info=True)
+        future.set_result(snapshot)
+
+    def __load(self, reload_secrets: bool) -> ConfigurationSnapshot:
+        """
+        Loads the settings from Azure App Configuration into a new snapshot.
+        """
+        # The sentinel is read first, so a change made during the load triggers another reload.
+        sentinel_etag = None
+        if self.__refresh_interval > 0:
+            try:
+                sentinel_etag = self.__get_sentinel_etag()
+            except Exception as e:
+                logging.warning(f'The configuration sentinel key could not be read: {e}')
+        with self.__load_with_retry() as config:
+            snapshot = ConfigurationSnapshot(config)
+        self.__secrets = self.__resolve_secrets(snapshot, reload_secrets)
+        self.__sentinel_etag = sentinel_etag
+        return snapshot
+
+    def __resolve_secrets(self, snapshot: ConfigurationSnapshot, reload_secrets: bool) -> Dict[str, str]:
+        """
+        Resolves the Key Vault references of the loaded settings, so reading them never calls Key Vault.
+        A secret that cannot be retrieved stays unresolved and is retrieved again when it is read.
+        """
+        # Secrets of settings fetched on first read are kept unless the secrets are reloaded.
+        secrets = {} if reload_secrets else dict(self.__secrets)
+        for value in snapshot.settings.values():
+            if not isinstance(value, KeyVaultReference) or value.secret_id in secrets:
+                continue
+            try:
+                secrets[value.secret_id] = self.__get_secret(value.secret_id)
+            except Exception as e:
+                logging.warning(f'The Key Vault secret {value.secret_id} could not be retrieved: {e}')
+        return secrets
+
+    def __set_snapshot(self, snapshot: ConfigurationSnapshot):
+        """
+        Replaces the snapshot and forgets the settings fetched and the keys found missing under the old one.
+        """
+        with self.__fetched_lock:
+            self.__snapshot = snapshot
+            self.__fetched_settings = {}
+            self.__missing_keys = set()
+
+    def __restore(self) -> bool:
+        """
+        Starts from the configuration kept by the snapshot store, if there is one,
+        and reconciles it with App Configuration in the background.
+        """
+        if self.__store is None:
+            return False
+        try:
+            restored = self.__store.load()
+        except Exception as e:
+            logging.warning(f'The configuration could not be restored from {self.__store.path}: {e}')
+            return False
+        if restored is None:
+            return False
+
+        self.__snapshot, self.__secrets = restored
+        self.refresh()
+        return True
+
+    def __save(self):
+        """
+        Writes the current configuration to the snapshot store, if there is one.
+        """
+        if self.__store is None:
+            return
+        try:
+            with self.__store_lock:
+                self.__store.save(self.__snapshot, dict(self.__secrets))
+        except Exception as e:
+            logging.warning(f'The configuration could not be persisted to {self.__store.path}: {e}')
 
     # Retry with jitter on transient errors. Initially up to 2^x * 1 seconds between each retry
-    # until the range reaches 30 seconds, then randomly up to 60 seconds afterwards.
-    # Stop after five retry attempts.
+    # until the range reaches 5 seconds. Stop after five attempts.
+    # Errors that cannot succeed on a retry, such as authentication failures, are raised immediately.
     @retry(
+        retry=retry_if_exception(is_transient_error),
         wait=wait_random_exponential(multiplier=1, max=5),
         stop=stop_after_attempt(5),
-        before_sleep=__retry_before_sleep
+        before_sleep=log_retry_attempt,
+        reraise=True
     )
-    def __get_config_with_retry(self, name):
+    def __load_with_retry(self) -> AzureAppConfigurationProvider:
+        if self.__key_prefixes is None:
+            selects = [SettingSelector(key_filter='*')]
+        else:
+            selects = [SettingSelector(key_filter=f'{prefix}*') for prefix in self.__key_prefixes]
+            selects.append(SettingSelector(key_filter=f'{FEATURE_FLAG_KEY_PREFIX}*'))
+        return load(endpoint=self.__app_config_uri, credential=self.__credential, selects=selects,
+                    key_vault_options=
+                        AzureAppConfigurationKeyVaultOptions(secret_resolver=KeyVaultReference))
+
+    def __is_in_memory(self, key: str) -> bool:
+        """
+        Determines whether get_value() can return the value of a key, or raise, without calling a service.
+        """
+        if key is None or key in self.__missing_keys:
+            return True
+        value = os.environ.get(key) if self.__allow_env_vars is True else None
+        if value is None:
+            value = self.__snapshot.settings.get(key)
+        if value is None and self.__key_prefixes is not None and not key.startswith(self.__key_prefixes):
+            fetched_settings = self.__fetched_settings
+            if key not in fetched_settings:
+                return False
+            value = fetched_settings[key]
+        return not isinstance(value, KeyVaultReference) or value.secret_id in self.__secrets
+
+    def __get_unloaded_setting(self, snapshot: ConfigurationSnapshot, key: str):
+        """
+        Retrieves a setting that was not loaded up front, fetching it from App Configuration on first access.
+        Returns None if the setting does not exist.
+        """
+        fetched_settings = self.__fetched_settings
+        if key in fetched_settings:
+            return fetched_settings[key]
         try:
-            return self.__config[name]
-        except RetryError:
-            pass
+            setting = self.__get_client().get_configuration_setting(key=key)
+        except ResourceNotFoundError:
+            return None
+        value = self.__get_setting_value(setting)
+        # A setting fetched while the snapshot was being replaced is not cached with the new snapshot.
+        with self.__fetched_lock:
+            if self.__snapshot is snapshot:
+                self.__fetched_settings[key] = value
+        return value
+
+    @staticmethod
+    def __get_setting_value(setting: ConfigurationSetting):
+        """
+        Converts a setting retrieved from App Configuration the way the provider converts loaded settings.
+        """
+        if isinstance(setting, SecretReferenceConfigurationSetting):
+            return KeyVaultReference(setting.secret_id)
+        if isinstance(setting, FeatureFlagConfigurationSetting):
+            return setting.value
+        content_type = (setting.content_type or '').split(';')[0].strip().lower()
+        if content_type.startswith('application/') and 'json' in content_type.split('/')[1].split('+'):
+            try:
+                return json.loads(setting.value)
+            except json.JSONDecodeError:
+                pass
+        return setting.value
+
+    def __resolve_secret(self, secret_id: str) -> str:
+        """
+        Resolves a Key Vault reference, retrieving the secret from Key Vault on first access.
+        The secret is persisted to the snapshot store by the next load or refresh, not by the read.
+        """
+        value = self.__secrets.get(secret_id)
+        if value is None:
+            with self.__secrets_lock:
+                value = self.__secrets.get(secret_id)
+                if value is None:
+                    value = self.__get_secret(secret_id)
+                    self.__secrets[secret_id] = value
+        return value
+
+    def __get_secret(self, secret_id: str) -> str:
+        """
+        Retrieves a secret from Key Vault.
+        """
+        identifier = KeyVaultSecretIdentifier(secret_id)
+        client = self.__secret_clients.get(identifier.vault_url)
+        if client is None:
+            client = SecretClient(vault_url=identifier.vault_url, credential=self.__credential)
+            self.__secret_clients[identifier.vault_url] = client
+        return client.get_secret(identifier.name, version=identifier.version).value
+
+    def __get_client(self) -> AzureAppConfigurationClient:
+        """
+        Retrieves the client used to read individual settings, creating it on first use.
+        """
+        if self.__client is None:
+            self.__client = AzureAppConfigurationClient(self.__app_config_uri, self.__credential)
+        return self.__client
+
+    def __get_sentinel_etag(self) -> Optional[str]:
+        """
+        Retrieves the ETag of the sentinel key, or None if the key does not exist.
+        """
+        try:
+            return self.__get_client().get_configuration_setting(key=self.__sentinel_key).etag
+        except ResourceNotFoundError:
+            return None
+
+    @staticmethod
+    def __watch_sentinel(configuration_ref: 'weakref.ref[Configuration]', interval: float):
+        """
+        Checks the sentinel key on an interval until the configuration is no longer used.
+        """
+        while True:
+            time.sleep(interval)
+            configuration = configuration_ref()
+            if configuration is None:
+                return
+            try:
+                configuration.refresh_if_changed()
+            except Exception as e:
+                logging.warning(f'The configuration sentinel key could not be checked: {e}')
+            del configuration
@@ -0,0 +1,87 @@
+import json
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+"""
+The key under which Azure App Configuration feature flags are loaded.
+"""
+FEATURE_FLAGS_KEY = 'FeatureManagementFeatureFlags'
+
+class ConfigurationSnapshot:
+    """
+    Immutable, fully resolved copy of the application configuration.
+
+    Settings (including resolved Key Vault references) and parsed feature flags
+    are materialized once when the snapshot is created, so every lookup is a plain
+    dictionary read. A configuration refresh replaces the whole snapshot instead of
+    modifying it, so readers always see a consistent set of values.
+
+    Key Vault references may be kept unresolved as KeyVaultReference values,
+    to be resolved when they are first read.
+    """
+    __slots__ = ('settings', 'feature_flags')
+
+    def __init__(self, settings: Mapping[str, Any], feature_flags: Optional[Mapping[str, bool]] = None):
+        """
+        Initializes a snapshot.
+
+        Parameters
+        ----------
+        settings : Mapping[str, Any]
+            The configuration settings, keyed by name.
+        feature_flags : Mapping[str, bool]
+            The enabled state of the feature flags, keyed by name.
+            Defaults to the flags parsed from the FeatureManagementFeatureFlags setting.
+        """
+        settings = dict(settings)
+        if feature_flags is None:
+            feature_flags = ConfigurationSnapshot.parse_feature_flags(settings.get(FEATURE_FLAGS_KEY))
+        object.__setattr__(self, 'settings', MappingProxyType(settings))
+        object.__setattr__(self, 'feature_flags', MappingProxyType(dict(feature_flags)))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('ConfigurationSnapshot is immutable.')
+
+    @staticmethod
+    def parse_feature_flags(feature_flags: Optional[Mapping[str, str]]) -> dict:
+        """
+        Parses the feature flag definitions loaded from Azure App Configuration.
+
+        Parameters
+        ----------
+        feature_flags : Mapping[str, str]
+            The JSON definitions of the feature flags, keyed by name.
+
+        Returns
+        -------
+        dict
+            Returns the enabled state of each feature flag.
+            Flags whose definition cannot be parsed are disabled.
+        """
+        flags = {}
+        for name, definition in (feature_flags or {}).items():
+            try:
+                flags[name] = json.loads(definition)['enabled']
+            except Exception:
+                flags[name] = False
+        return flags
+
+class KeyVaultReference:
+    """
+    Key Vault reference whose secret has not been retrieved yet.
+    """
+    __slots__ = ('secret_id',)
+
+    def __init__(self, secret_id: str):
+        """
+        Initializes a reference.
+
+        Parameters
+        ----------
+        secret_id : str
+            The URI of the Key Vault secret.
+        """
+        self.secret_id = secret_id
+
+    def __repr__(self) -> str:
+        return f'KeyVaultReference({self.secret_id!r})'
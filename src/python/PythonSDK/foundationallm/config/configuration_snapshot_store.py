@@ -0,0 +1,123 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from cryptography.fernet import Fernet, InvalidToken
+from .configuration_snapshot import ConfigurationSnapshot, KeyVaultReference
+from .environment_variables import (
+    FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY,
+    FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH
+)
+
+"""
+The version of the file format. Files written in another format are ignored.
+"""
+FORMAT_VERSION = 1
+
+class ConfigurationSnapshotStore:
+    """
+    Encrypted file in which the last known good configuration is kept.
+
+    The file holds the settings loaded from App Configuration and the Key Vault secrets
+    resolved so far, encrypted with a Fernet key, so a new process can serve requests
+    right away and reconcile with App Configuration in the background.
+
+    The store is configured with the following environment variables:
+        FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH: the path of the file
+        FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY: the Fernet key used to encrypt the file
+    """
+    def __init__(self, path: str, key: str, key_prefixes: Optional[List[str]] = None):
+        """
+        Initializes the store.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        key : str
+            The URL-safe base64-encoded 32-byte Fernet key used to encrypt the file.
+        key_prefixes : List[str]
+            The key prefixes of the loaded settings. A file written with other prefixes is ignored.
+        """
+        self.path = path
+        self.key_prefixes = list(key_prefixes) if key_prefixes else None
+        self._fernet = Fernet(key)
+
+    @staticmethod
+    def from_environment(key_prefixes: Optional[List[str]] = None) -> Optional['ConfigurationSnapshotStore']:
+        """
+        Creates the store configured through the environment.
+
+        Parameters
+        ----------
+        key_prefixes : List[str]
+            The key prefixes of the loaded settings.
+
+        Returns
+        -------
+        ConfigurationSnapshotStore
+            Returns the store, or None if the path or the key is not configured.
+        """
+        path = os.environ.get(FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH)
+        key = os.environ.get(FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY)
+        if not path or not key:
+            return None
+        return ConfigurationSnapshotStore(path, key, key_prefixes)
+
+    def load(self) -> Optional[Tuple[ConfigurationSnapshot, Dict[str, str]]]:
+        """
+        Reads the configuration from the file.
+
+        Returns
+        -------
+        Tuple[ConfigurationSnapshot, Dict[str, str]]
+            Returns the snapshot and the resolved Key Vault secrets keyed by secret URI,
+            or None if the file does not exist, cannot be decrypted with the key
+            or was written for other key prefixes.
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                content = json.loads(self._fernet.decrypt(file.read()))
+        except (FileNotFoundError, InvalidToken):
+            return None
+
+        if content.get('version') != FORMAT_VERSION or content.get('key_prefixes') != self.key_prefixes:
+            return None
+
+        settings = content['settings']
+        for key, secret_id in content['key_vault_references'].items():
+            settings[key] = KeyVaultReference(secret_id)
+        return (ConfigurationSnapshot(settings), content['secrets'])
+
+    def save(self, snapshot: ConfigurationSnapshot, secrets: Dict[str, str]):
+        """
+        Writes the configuration to the file, replacing the previous file in a single step.
+
+        Parameters
+        ----------
+        snapshot : ConfigurationSnapshot
+            The snapshot loaded from App Configuration.
+        secrets : Dict[str, str]
+            The resolved Key Vault secrets, keyed by secret URI.
+        """
+        settings = {}
+        key_vault_references = {}
+        for key, value in snapshot.settings.items():
+            if isinstance(value, KeyVaultReference):
+                key_vault_references[key] = value.secret_id
+            else:
+                settings[key] = value
+        content = json.dumps({
+            'version': FORMAT_VERSION,
+            'created': time.time(),
+            'key_prefixes': self.key_prefixes,
+            'settings': settings,
+            'key_vault_references': key_vault_references,
+            'secrets': dict(secrets)
+        })
+
+        temporary_path = f'{self.path}.{os.getpid()}.tmp'
+        descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(self._fernet.encrypt(content.encode('utf-8')))
+        os.replace(temporary_path, self.path)
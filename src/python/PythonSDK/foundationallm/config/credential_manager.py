@@ -0,0 +1,381 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from azure.core.credentials import AccessToken, TokenCredential
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.identity import (
+    AzureCliCredential,
+    DefaultAzureCredential,
+    EnvironmentCredential,
+    ManagedIdentityCredential,
+    WorkloadIdentityCredential
+)
+from .environment_variables import (
+    FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID,
+    FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE
+)
+
+"""
+Tokens are refreshed in the background once they are within this many seconds of expiring.
+"""
+REFRESH_BEFORE_EXPIRY_SECONDS = 300
+
+"""
+Cached tokens with fewer than this many seconds left are never handed out.
+"""
+MINIMUM_VALIDITY_SECONDS = 30
+
+"""
+The number of seconds to wait before retrying a failed background refresh.
+"""
+REFRESH_RETRY_SECONDS = 10
+
+class CredentialManager:
+    """
+    Provides a single Azure credential and a per-scope access token cache
+    shared across the whole foundationallm package.
+
+    Tokens are fetched once per scope and refreshed by a background thread
+    before they expire, so requests never wait on a token acquisition
+    after the first one for a given scope.
+
+    The underlying credential is selected with the following environment variables:
+        FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE: Default, ManagedIdentity, WorkloadIdentity, AzureCli or Environment
+        FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID: optional client id of a user-assigned identity
+    Naming a single credential type avoids probing the whole DefaultAzureCredential chain,
+    some of whose probes time out on hosts where they do not apply.
+    """
+    _credential: Optional[TokenCredential] = None
+    _tokens: Dict[Tuple[str, ...], AccessToken] = {}
+    _scope_locks: Dict[Tuple[str, ...], threading.Lock] = {}
+    _lock = threading.Lock()
+    _refresh_event = threading.Event()
+    _refresh_thread: Optional[threading.Thread] = None
+    _statistics = {
+        'token_fetches': 0,
+        'token_cache_hits': 0,
+        'background_refreshes': 0,
+        'background_refresh_failures': 0
+    }
+
+    @classmethod
+    def get_credential(cls) -> TokenCredential:
+        """
+        Retrieves the shared credential. Tokens requested through the credential
+        are served from the shared token cache.
+
+        Returns
+        -------
+        TokenCredential
+            Returns a credential that can be passed to any Azure SDK client.
+        """
+        return CachedTokenCredential()
+
+    @classmethod
+    def get_async_credential(cls) -> 'AsyncCachedTokenCredential':
+        """
+        Retrieves the shared credential for use with asynchronous Azure SDK clients.
+
+        Returns
+        -------
+        AsyncCachedTokenCredential
+            Returns an asynchronous credential backed by the shared token cache.
+        """
+        return AsyncCachedTokenCredential()
+
+    @classmethod
+    def get_bearer_token_provider(cls, scope: str) -> Callable[[], str]:
+        """
+        Retrieves a callable that returns a bearer token for the specified scope.
+
+        Parameters
+        ----------
+        scope : str
+            The scope for which to acquire tokens.
+
+        Returns
+        -------
+        Callable[[], str]
+            Returns a bearer token provider backed by the shared token cache.
+        """
+        def token_provider() -> str:
+            return cls.get_token(scope).token
+        return token_provider
+
+    @classmethod
+    def get_token(cls, *scopes: str) -> AccessToken:
+        """
+        Retrieves an access token for the specified scopes from the cache.
+        The token is fetched if it is not cached or about to expire.
+
+        Parameters
+        ----------
+        scopes : str
+            The scopes for which to acquire the token.
+
+        Returns
+        -------
+        AccessToken
+            Returns the access token.
+        """
+        key = tuple(scopes)
+
+        token = cls._get_cached_token(*key)
+        if token is not None:
+            return token
+
+        with cls.__get_scope_lock(key):
+            token = cls._tokens.get(key)
+            if cls.__is_valid(token):
+                cls.__increment('token_cache_hits')
+                return token
+
+            token = cls.__get_underlying_credential().get_token(*key)
+            cls._tokens[key] = token
+            cls.__increment('token_fetches')
+
+        cls.__start_refresh_thread()
+        return token
+
+    @classmethod
+    def has_token(cls, *scopes: str) -> bool:
+        """
+        Determines whether a valid access token is cached for the specified scopes,
+        without fetching one.
+
+        Parameters
+        ----------
+        scopes : str
+            The scopes of the token.
+
+        Returns
+        -------
+        bool
+            Returns True if a token is cached and not about to expire.
+        """
+        return cls.__is_valid(cls._tokens.get(tuple(scopes)))
+
+    @classmethod
+    def get_statistics(cls) -> dict:
+        """
+        Retrieves the token cache counters.
+
+        Returns
+        -------
+        dict
+            Returns the number of token fetches on the request path, cache hits,
+            background refreshes and background refresh failures, and the ratio
+            of cache hits to token requests.
+        """
+        with cls._lock:
+            statistics = dict(cls._statistics)
+        requests = statistics['token_cache_hits'] + statistics['token_fetches']
+        statistics['hit_ratio'] = statistics['token_cache_hits'] / requests if requests > 0 else 0.0
+        return statistics
+
+    @classmethod
+    def __increment(cls, name: str):
+        """
+        Increments a token cache counter. Counters are updated by request threads and the refresh thread.
+        """
+        with cls._lock:
+            cls._statistics[name] += 1
+
+    @classmethod
+    def _get_cached_token(cls, *scopes: str) -> Optional[AccessToken]:
+        """
+        Retrieves the cached access token for the specified scopes,
+        or None if no valid token is cached.
+        """
+        token = cls._tokens.get(tuple(scopes))
+        if cls.__is_valid(token):
+            cls.__increment('token_cache_hits')
+            return token
+        return None
+
+    @classmethod
+    def _get_token_uncached(cls, *scopes: str, **kwargs) -> AccessToken:
+        """
+        Retrieves a token directly from the underlying credential, bypassing the cache.
+        Used for claims challenges and tenant-specific requests.
+        """
+        cls.__increment('token_fetches')
+        return cls.__get_underlying_credential().get_token(*scopes, **kwargs)
+
+    @staticmethod
+    def create_credential() -> TokenCredential:
+        """
+        Creates the Azure credential of the type configured through the environment.
+
+        Returns
+        -------
+        TokenCredential
+            Returns the credential.
+        """
+        credential_type = os.environ.get(FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE, 'Default')
+        client_id = os.environ.get(FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID)
+
+        match credential_type.lower():
+            case 'default':
+                # Without a client id, the AZURE_CLIENT_ID environment variable is used, if set.
+                if client_id:
+                    return DefaultAzureCredential(
+                        exclude_environment_credential=True,
+                        managed_identity_client_id=client_id,
+                        workload_identity_client_id=client_id)
+                return DefaultAzureCredential(exclude_environment_credential=True)
+            case 'managedidentity':
+                return ManagedIdentityCredential(client_id=client_id) if client_id else ManagedIdentityCredential()
+            case 'workloadidentity':
+                return WorkloadIdentityCredential(client_id=client_id) if client_id else WorkloadIdentityCredential()
+            case 'azurecli':
+                return AzureCliCredential()
+            case 'environment':
+                return EnvironmentCredential()
+            case _:
+                raise ValueError(f'The Azure credential type {credential_type} is not supported.')
+
+    @classmethod
+    def __get_underlying_credential(cls) -> TokenCredential:
+        """
+        Retrieves the underlying Azure credential, creating it on first use.
+        """
+        if cls._credential is None:
+            with cls._lock:
+                if cls._credential is None:
+                    cls._credential = cls.create_credential()
+        return cls._credential
+
+    @classmethod
+    def __get_scope_lock(cls, key: Tuple[str, ...]) -> threading.Lock:
+        """
+        Retrieves the lock that serializes token fetches for the specified scopes.
+        """
+        lock = cls._scope_locks.get(key)
+        if lock is None:
+            with cls._lock:
+                lock = cls._scope_locks.setdefault(key, threading.Lock())
+        return lock
+
+    @staticmethod
+    def __is_valid(token: Optional[AccessToken]) -> bool:
+        """
+        Determines whether a cached token can still be handed out.
+        """
+        return token is not None and token.expires_on - time.time() > MINIMUM_VALIDITY_SECONDS
+
+    @classmethod
+    def __start_refresh_thread(cls):
+        """
+        Starts the background refresh thread if it is not already running.
+        """
+        if cls._refresh_thread is not None:
+            cls._refresh_event.set()
+            return
+
+        with cls._lock:
+            if cls._refresh_thread is None:
+                cls._refresh_thread = threading.Thread(
+                    target=cls.__refresh_tokens,
+                    name='foundationallm-token-refresh',
+                    daemon=True)
+                cls._refresh_thread.start()
+
+    @classmethod
+    def __refresh_tokens(cls):
+        """
+        Refreshes cached tokens shortly before they expire.
+        """
+        while True:
+            next_refresh = None
+            for key, token in list(cls._tokens.items()):
+                refresh_at = token.expires_on - REFRESH_BEFORE_EXPIRY_SECONDS
+                if refresh_at <= time.time():
+                    try:
+                        with cls.__get_scope_lock(key):
+                            token = cls.__get_underlying_credential().get_token(*key)
+                            cls._tokens[key] = token
+                        cls.__increment('background_refreshes')
+                        refresh_at = max(
+                            token.expires_on - REFRESH_BEFORE_EXPIRY_SECONDS,
+                            time.time() + REFRESH_RETRY_SECONDS)
+                    except Exception as e:
+                        cls.__increment('background_refresh_failures')
+                        logging.warning(f'Failed to refresh the access token for {key}: {e}')
+                        refresh_at = time.time() + REFRESH_RETRY_SECONDS
+                if next_refresh is None or refresh_at < next_refresh:
+                    next_refresh = refresh_at
+
+            timeout = None if next_refresh is None else max(next_refresh - time.time(), 1)
+            cls._refresh_event.wait(timeout)
+            cls._refresh_event.clear()
+
+class CachedTokenCredential(TokenCredential):
+    """
+    Azure credential that serves tokens from the CredentialManager cache.
+    """
+    def get_token(self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs) -> AccessToken:
+        """
+        Retrieves an access token for the specified scopes.
+
+        Parameters
+        ----------
+        scopes : str
+            The scopes for which to acquire the token.
+        claims : str
+            Additional claims required in the token. Claims challenges bypass the cache.
+        tenant_id : str
+            The tenant to include in the token request. Tenant-specific requests bypass the cache.
+
+        Returns
+        -------
+        AccessToken
+            Returns the access token.
+        """
+        if claims is not None or tenant_id is not None:
+            return CredentialManager._get_token_uncached(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        return CredentialManager.get_token(*scopes)
+
+class AsyncCachedTokenCredential(AsyncTokenCredential):
+    """
+    Asynchronous Azure credential that serves tokens from the CredentialManager cache.
+    """
+    async def get_token(self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs) -> AccessToken:
+        """
+        Retrieves an access token for the specified scopes.
+        Cache misses are fetched on a worker thread so the event loop is never blocked.
+
+        Parameters
+        ----------
+        scopes : str
+            The scopes for which to acquire the token.
+        claims : str
+            Additional claims required in the token. Claims challenges bypass the cache.
+        tenant_id : str
+            The tenant to include in the token request. Tenant-specific requests bypass the cache.
+
+        Returns
+        -------
+        AccessToken
+            Returns the access token.
+        """
+        if claims is None and tenant_id is None:
+            token = CredentialManager._get_cached_token(*scopes)
+            if token is not None:
+                return token
+        return await asyncio.to_thread(
+            CachedTokenCredential().get_token, *scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+
+    async def close(self):
+        """
+        The shared credential is owned by the CredentialManager and is never closed by clients.
+        """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
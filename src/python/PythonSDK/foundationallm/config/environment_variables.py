@@ -12,3 +12,100 @@ The build version of the container. This is also used for the app version used
 to validate the minimum version of the app required to use certain configuration entries.
 """
 FOUNDATIONALLM_VERSION = "FOUNDATIONALLM_VERSION"
+
+"""
+The maximum number of query embeddings kept in the in-process embedding cache.
+Set to 0 to disable the cache.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES = "FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES"
+
+"""
+The number of seconds a cached query embedding remains valid.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS = "FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS"
+
+"""
+The path of the file used to persist the query embedding cache across restarts.
+The cache is kept in memory only when not set.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_PATH = "FOUNDATIONALLM_EMBEDDING_CACHE_PATH"
+
+"""
+The maximum number of search results kept in the in-process retrieval cache.
+The cache is disabled when not set or set to 0.
+"""
+FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES = "FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES"
+
+"""
+The number of seconds cached search results remain valid.
+"""
+FOUNDATIONALLM_RETRIEVAL_CACHE_TTL_SECONDS = "FOUNDATIONALLM_RETRIEVAL_CACHE_TTL_SECONDS"
+
+"""
+The maximum number of completion requests of a batch executed concurrently.
+"""
+FOUNDATIONALLM_BATCH_MAX_CONCURRENCY = "FOUNDATIONALLM_BATCH_MAX_CONCURRENCY"
+
+"""
+The maximum number of completion requests in a batch.
+"""
+FOUNDATIONALLM_BATCH_MAX_SIZE = "FOUNDATIONALLM_BATCH_MAX_SIZE"
+
+"""
+The number of seconds between checks of the configuration sentinel key.
+Set to 0 to disable the background configuration refresh.
+"""
+FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS = "FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS"
+
+"""
+The App Configuration key whose change triggers a background configuration refresh.
+"""
+FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY = "FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY"
+
+"""
+The path of the file in which the last configuration loaded from App Configuration is kept,
+so a new process can start from it without waiting on App Configuration and Key Vault.
+The configuration is not persisted when not set.
+"""
+FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH = "FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH"
+
+"""
+The Fernet key used to encrypt the persisted configuration.
+The configuration is not persisted when not set.
+"""
+FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY = "FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY"
+
+"""
+The type of Azure credential used to authenticate with Azure services:
+Default, ManagedIdentity, WorkloadIdentity, AzureCli or Environment.
+Defaults to Default, which tries each supported credential type in turn.
+"""
+FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE = "FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE"
+
+"""
+The client id of the user-assigned managed identity or workload identity used to
+authenticate with Azure services.
+"""
+FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID = "FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID"
+
+"""
+Whether the APIs warm up clients, tokens and models at startup. Defaults to true.
+"""
+FOUNDATIONALLM_WARM_UP_ENABLED = "FOUNDATIONALLM_WARM_UP_ENABLED"
+
+"""
+The comma-separated scopes for which access tokens are acquired at startup.
+Defaults to the scopes used by the API.
+"""
+FOUNDATIONALLM_WARM_UP_TOKEN_SCOPES = "FOUNDATIONALLM_WARM_UP_TOKEN_SCOPES"
+
+"""
+Whether the readiness endpoints also probe the dependencies of the API,
+such as App Configuration. Defaults to false.
+"""
+FOUNDATIONALLM_READINESS_PROBES_ENABLED = "FOUNDATIONALLM_READINESS_PROBES_ENABLED"
+
+"""
+The number of seconds the result of a readiness probe is reused. Defaults to 5.
+"""
+FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS = "FOUNDATIONALLM_READINESS_PROBE_CACHE_SECONDS"
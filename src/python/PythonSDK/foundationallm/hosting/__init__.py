@@ -0,0 +1,3 @@
+from .startup import Startup
+from .readiness import Readiness
+from .routers import create_metrics_router, create_status_router
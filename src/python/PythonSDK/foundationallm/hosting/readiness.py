@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Tuple
+
+class Readiness:
+    """
+    Evaluates whether an API is ready to serve requests.
+
+    Each check is a function returning whether one part of the API is ready,
+    such as the configuration being loaded or the access tokens being cached.
+    Only required checks determine readiness. Optional checks, such as those of warm-up tasks
+    or dependencies, are reported without gating, so a failed warm-up or a dependency outage
+    does not take every instance out of rotation. Checks that only inspect in-process state
+    run on every evaluation. Probes that call a dependency are given a cache duration,
+    so frequent readiness requests from the orchestrator do not turn into load on the dependency.
+    """
+    def __init__(self):
+        """
+        Initializes a readiness evaluation without checks.
+        """
+        self._checks: Dict[str, Tuple[Callable[[], Any], float, bool]] = {}
+        self._results: Dict[str, Tuple[float, bool]] = {}
+
+    def add_check(
+            self,
+            name: str,
+            check: Callable[[], Any],
+            cache_seconds: float = 0,
+            required: bool = True):
+        """
+        Adds a readiness check.
+
+        Parameters
+        ----------
+        name : str
+            The name of the check, reported in the readiness result.
+        check : Callable[[], Any]
+            The function or coroutine function to run. The check passes when it returns
+            a truthy value and fails when it returns a falsy value or raises.
+            Functions with a cache duration call a dependency, so they run on a worker thread.
+        cache_seconds : float
+            The number of seconds the result of the check is reused.
+            Set to 0 to run the check on every evaluation.
+        required : bool
+            Whether the API is not ready while the check fails.
+            The result of optional checks is reported only.
+        """
+        self._checks[name] = (check, cache_seconds, required)
+
+    async def evaluate(self) -> Tuple[bool, Dict[str, bool]]:
+        """
+        Runs the checks concurrently, reusing the cached results of the probes.
+
+        Returns
+        -------
+        Tuple[bool, Dict[str, bool]]
+            Returns whether every required check passed, and the result of each check keyed by name.
+        """
+        names = list(self._checks)
+        results = await asyncio.gather(*[self.__run(name) for name in names])
+        checks = dict(zip(names, results))
+        ready = all(checks[name] for name in names if self._checks[name][2])
+        return ready, checks
+
+    async def __run(self, name: str) -> bool:
+        """
+        Runs a check, or returns its cached result if it has not expired.
+        """
+        check, cache_seconds, _ = self._checks[name]
+        cached = self._results.get(name)
+        if cached is not None and time.time() - cached[0] < cache_seconds:
+            return cached[1]
+
+        try:
+            if asyncio.iscoroutinefunction(check):
+                result = bool(await check())
+            elif cache_seconds > 0:
+                result = bool(await asyncio.to_thread(check))
+            else:
+                result = bool(check())
+        except Exception as e:
+            logging.warning(f'The readiness check {name} failed: {e}')
+            result = False
+
+        if cache_seconds > 0:
+            self._results[name] = (time.time(), result)
+        return result
@@ -0,0 +1,124 @@
+"""
+Status and metrics API endpoints shared by the APIs built on the FoundationaLLM Python SDK.
+"""
+import os
+from fastapi import APIRouter, Request, Response
+from foundationallm.config.environment_variables import HOSTNAME, FOUNDATIONALLM_VERSION
+from foundationallm.telemetry import Telemetry
+
+def create_status_router(api_name: str) -> APIRouter:
+    """
+    Creates the status API endpoints that act as health checks for the API.
+
+    The readiness is evaluated from the Startup and Readiness stored in the state
+    of the application as startup and readiness.
+
+    Parameters
+    ----------
+    api_name : str
+        The name of the API, reported by every endpoint.
+
+    Returns
+    -------
+    APIRouter
+        Returns the router of the /status, /status/live and /status/ready endpoints.
+    """
+    router = APIRouter(
+        prefix='/status',
+        tags=['status'],
+        responses={404: {'description':'Not found'}}
+    )
+
+    @router.get('')
+    async def get_status(request: Request):
+        """
+        Retrieves the status of the API.
+
+        Returns
+        -------
+        JSON
+            Object containing the name, instance, version, and status of the API.
+            The status is "starting" until the startup tasks have finished.
+        """
+        startup = getattr(request.app.state, 'startup', None)
+        statusMessage = {
+            "name": api_name,
+            "instance": os.environ[HOSTNAME],
+            "version": os.environ[FOUNDATIONALLM_VERSION],
+            "status": "ready" if startup is not None and startup.is_ready else "starting"
+        }
+        return statusMessage
+
+    @router.get('/live')
+    async def get_liveness():
+        """
+        Retrieves the liveness of the API. Responds as long as the API process is serving requests,
+        whether or not it has finished starting.
+
+        Returns
+        -------
+        JSON
+            Object containing the name and liveness of the API.
+        """
+        return { "name": api_name, "status": "alive" }
+
+    @router.get('/ready')
+    async def get_readiness(request: Request, response: Response):
+        """
+        Retrieves the readiness of the API. Responds with status code 503 until the required
+        startup tasks have finished and the configuration is loaded, so traffic is only routed
+        to the API once it can serve requests. The warm-up and dependency checks are reported
+        without affecting the status code.
+
+        Returns
+        -------
+        JSON
+            Object containing the name, instance, version, and readiness of the API,
+            with the result of each readiness check and the status of each startup task.
+        """
+        startup = getattr(request.app.state, 'startup', None)
+        readiness = getattr(request.app.state, 'readiness', None)
+        ready, checks = await readiness.evaluate() if readiness is not None else (False, {})
+        if not ready:
+            response.status_code = 503
+        return {
+            "name": api_name,
+            "instance": os.environ[HOSTNAME],
+            "version": os.environ[FOUNDATIONALLM_VERSION],
+            "status": "ready" if ready else "starting",
+            "checks": checks,
+            "startup": startup.get_status() if startup is not None else {}
+        }
+
+    return router
+
+def create_metrics_router() -> APIRouter:
+    """
+    Creates the metrics API endpoint that exposes the metrics of the API to Prometheus.
+
+    Returns
+    -------
+    APIRouter
+        Returns the router of the /metrics endpoint.
+    """
+    router = APIRouter(
+        prefix='/metrics',
+        tags=['metrics'],
+        responses={404: {'description':'Not found'}}
+    )
+
+    @router.get('')
+    async def get_metrics() -> Response:
+        """
+        Retrieves the metrics of the API in the Prometheus text format.
+
+        Returns
+        -------
+        Response
+            The current value of every metric: request latency per route, in-flight requests,
+            event loop lag, downstream call latency, cache hit ratios and token usage.
+        """
+        content, content_type = Telemetry.generate_metrics()
+        return Response(content=content, media_type=content_type)
+
+    return router
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+class Startup:
+    """
+    Runs the startup tasks of an API concurrently and tracks when the API is ready.
+
+    Required tasks, such as loading the configuration, must complete before the API
+    starts serving requests. Warm-up tasks run in the background once the API is serving;
+    a failed warm-up is logged and does not prevent the API from becoming ready.
+    The API is ready once every task has finished.
+    """
+    def __init__(self):
+        """
+        Initializes a startup without tasks.
+        """
+        self._tasks: Dict[str, Tuple[Callable[[], Any], Tuple[str, ...], bool]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._status: Dict[str, str] = {}
+        self._errors: Dict[str, Exception] = {}
+
+    def add_task(
+            self,
+            name: str,
+            task: Callable[[], Any],
+            depends_on: Iterable[str] = (),
+            required: bool = True):
+        """
+        Adds a task to run at startup.
+
+        Parameters
+        ----------
+        name : str
+            The name of the task, reported in the startup status.
+        task : Callable[[], Any]
+            The function or coroutine function to run.
+            Functions run on a worker thread so they never block the event loop.
+        depends_on : Iterable[str]
+            The names of the tasks that must complete before the task starts.
+        required : bool
+            Whether the API must wait for the task before serving requests.
+            A required task that fails stops the API from starting.
+        """
+        self._tasks[name] = (task, tuple(depends_on), required)
+        self._status[name] = 'pending'
+
+    async def start(self):
+        """
+        Starts every task and waits for the required tasks to complete.
+        """
+        for name, (task, depends_on, _) in self._tasks.items():
+            self._running[name] = asyncio.create_task(self.__run(name, task, depends_on))
+
+        required = [name for name, (_, _, required) in self._tasks.items() if required]
+        try:
+            await asyncio.gather(*[self._running[name] for name in required])
+        except BaseException:
+            await self.stop()
+            raise
+
+        for name in required:
+            if name in self._errors:
+                await self.stop()
+                raise self._errors[name]
+
+    async def stop(self):
+        """
+        Cancels the tasks that are still running.
+        """
+        for task in self._running.values():
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Indicates whether every task has finished and every required task has completed.
+        """
+        return all(
+            self._status[name] == 'completed' or (not required and self._status[name] == 'failed')
+            for name, (_, _, required) in self._tasks.items()
+        )
+
+    def get_status(self) -> Dict[str, str]:
+        """
+        Retrieves the status of each task: pending, running, completed, failed or cancelled.
+
+        Returns
+        -------
+        Dict[str, str]
+            Returns the status of each task, keyed by name.
+        """
+        return dict(self._status)
+
+    async def __run(self, name: str, task: Callable[[], Any], depends_on: Tuple[str, ...]):
+        """
+        Runs a task once its dependencies have completed.
+        """
+        try:
+            for dependency in depends_on:
+                await asyncio.shield(self._running[dependency])
+                if self._status[dependency] != 'completed':
+                    raise RuntimeError(f'The startup task {dependency} did not complete.')
+
+            self._status[name] = 'running'
+            start = time.time()
+            if asyncio.iscoroutinefunction(task):
+                await task()
+            else:
+                await asyncio.to_thread(task)
+            self._status[name] = 'completed'
+            logging.info(
+                'The startup task %s completed in %s seconds.', name, round(time.time()-start, 3))
+        except asyncio.CancelledError:
+            self._status[name] = 'cancelled'
+            raise
+        except Exception as e:
+            self._status[name] = 'failed'
+            self._errors[name] = e
+            logging.error(f'The startup task {name} failed: {e}', exc_info=True)
@@ -1,4 +1,5 @@
 """LangChain Agents module"""
+from .agent_plan import AgentPlan
 from .langchain_agent_base import LangChainAgentBase
 from .langchain_knowledge_management_agent import LangChainKnowledgeManagementAgent
 from .agent_factory import AgentFactory
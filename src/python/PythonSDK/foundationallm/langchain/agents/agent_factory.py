@@ -1,4 +1,6 @@
-from foundationallm.config import Configuration, Context
+import threading
+from typing import Dict, Tuple
+from foundationallm.config import Configuration, ConfigurationSnapshot, Context
 from foundationallm.models.orchestration import CompletionRequestBase
 from foundationallm.langchain.agents import (
     LangChainAgentBase,
@@ -8,7 +10,14 @@ from foundationallm.langchain.agents import (
 class AgentFactory:
     """
     Factory to determine which agent to use.
+
+    Agents keep no per-request state, so a single agent of each type is shared by
+    all requests that use the same configuration. The shared agent also shares its
+    compiled chains and retrievers. A new agent is created when the configuration
+    is replaced or refreshed.
     """
+    _agents: Dict[type, Tuple[LangChainAgentBase, ConfigurationSnapshot]] = {}
+    _lock = threading.Lock()
 
     def __init__(
             self,
@@ -48,6 +57,23 @@ class AgentFactory:
         
         match agent.type:
             case 'knowledge-management' | 'internal-context':
-                return LangChainKnowledgeManagementAgent(config=self.config)
+                return self.__get_shared_agent(LangChainKnowledgeManagementAgent)
             case _:
                 raise ValueError(f'The specified agent type {agent.type} is not supported.')
+
+    def __get_shared_agent(self, agent_class: type) -> LangChainAgentBase:
+        """
+        Retrieves the shared agent of the specified class, creating it
+        on first use and whenever the configuration is replaced or refreshed.
+        """
+        snapshot = self.config.snapshot
+        agent, agent_snapshot = self._agents.get(agent_class, (None, None))
+        if agent is not None and agent.config is self.config and agent_snapshot is snapshot:
+            return agent
+
+        with self._lock:
+            agent, agent_snapshot = self._agents.get(agent_class, (None, None))
+            if agent is None or agent.config is not self.config or agent_snapshot is not snapshot:
+                agent = agent_class(config=self.config)
+                self._agents[agent_class] = (agent, snapshot)
+        return agent
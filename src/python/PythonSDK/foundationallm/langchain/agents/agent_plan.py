@@ -0,0 +1,22 @@
+from typing import Optional
+from pydantic import BaseModel
+from foundationallm.models.orchestration import EndpointSettings
+from foundationallm.models.resource_providers.prompts.multipart_prompt import MultipartPrompt
+from foundationallm.models.resource_providers.vectorization import (
+    AzureAISearchIndexingProfile,
+    AzureOpenAIEmbeddingProfile
+)
+
+class AgentPlan(BaseModel):
+    """
+    The compiled form of an agent configuration.
+
+    Holds everything derived from the agent that does not change from one request to the next:
+    the validated settings, the profiles parsed from the agent parameters and the endpoint settings
+    resolved from the application configuration. Plans are shared between requests and must not be mutated.
+    """
+    key: str # hash of the agent configuration the plan was compiled from
+    prompt: MultipartPrompt
+    indexing_profile: Optional[AzureAISearchIndexingProfile] = None
+    text_embedding_profile: Optional[AzureOpenAIEmbeddingProfile] = None
+    endpoint_settings: EndpointSettings
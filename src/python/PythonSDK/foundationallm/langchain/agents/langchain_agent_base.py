@@ -1,14 +1,16 @@
+import asyncio
+import hashlib
 import re
 from abc import abstractmethod
-from typing import List, Optional
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Union
 
-from langchain_core.language_models import BaseLanguageModel
-from langchain_openai import AzureChatOpenAI, AzureOpenAI, ChatOpenAI, OpenAI
+from langchain_core.runnables import Runnable, RunnableBinding
 from foundationallm.config.configuration import Configuration
+from foundationallm.langchain.cache import TTLLRUCache
 from foundationallm.langchain.exceptions import LangChainException
-from foundationallm.models.agents import OperationTypes
-from foundationallm.models.agents import AgentBase
+from foundationallm.langchain.request_state import RequestState
+from foundationallm.langchain.language_models import LanguageModelClientRegistry
 from foundationallm.models.authentication import AuthenticationTypes
 from foundationallm.models.language_models import LanguageModelProvider
 from foundationallm.models.orchestration import (
@@ -23,11 +25,24 @@ from foundationallm.models.resource_providers.vectorization import (
     AzureAISearchIndexingProfile,
     AzureOpenAIEmbeddingProfile
 )
+from .agent_plan import AgentPlan
+
+"""
+The maximum number of compiled agent plans kept in memory.
+"""
+MAX_AGENT_PLANS = 1000
+
+"""
+The maximum number of compiled chains kept by an agent.
+"""
+MAX_CHAINS = 100
 
 class LangChainAgentBase():
     """
     Implements the base functionality for a LangChain agent.
     """
+    _agent_plans = TTLLRUCache(max_entries=MAX_AGENT_PLANS, ttl_seconds=float('inf'))
+
     def __init__(self, config: Configuration):
         """
         Initializes a knowledge management agent.
@@ -38,7 +53,7 @@ class LangChainAgentBase():
             Application configuration class for retrieving configuration settings.
         """
         self.config = config
-        self.full_prompt = ""
+        self._chains = TTLLRUCache(max_entries=MAX_CHAINS, ttl_seconds=float('inf'))
 
     @abstractmethod
     def invoke(self, request: CompletionRequestBase) -> CompletionResponse:
@@ -57,6 +72,129 @@ class LangChainAgentBase():
         """
         raise NotImplementedError()
 
+    async def ainvoke(self, request: CompletionRequestBase) -> CompletionResponse:
+        """
+        Gets the completion for the request asynchronously.
+        
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+
+        Returns
+        -------
+        CompletionResponse
+            Returns a completion response.
+        """
+        raise NotImplementedError()
+
+    def astream(self, request: CompletionRequestBase) -> AsyncIterator[Union[str, CompletionResponse]]:
+        """
+        Gets the completion for the request asynchronously, streaming the tokens as they are generated.
+        
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+
+        Returns
+        -------
+        AsyncIterator[Union[str, CompletionResponse]]
+            Yields the completion tokens as they arrive, followed by the completion response.
+        """
+        raise NotImplementedError()
+
+    def _get_agent_plan(self, request: CompletionRequestBase) -> AgentPlan:
+        """
+        Retrieves the compiled plan of the agent of the completion request.
+        The agent is validated and compiled the first time its configuration is seen.
+
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+
+        Returns
+        -------
+        AgentPlan
+            Returns the compiled agent plan.
+        """
+        key = self.__get_agent_plan_key(request)
+        plan = self._agent_plans.get(key)
+        if plan is None:
+            plan = self.__compile_agent_plan(request, key[1])
+            self._agent_plans.set(key, plan)
+        return plan
+
+    async def _aget_agent_plan(self, request: CompletionRequestBase) -> AgentPlan:
+        """
+        Retrieves the compiled plan of the agent of the completion request without blocking the event loop.
+        Compiling reads configuration settings that may not be in memory yet,
+        so agents seen for the first time are compiled on a worker thread.
+
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+
+        Returns
+        -------
+        AgentPlan
+            Returns the compiled agent plan.
+        """
+        plan = self._agent_plans.get(self.__get_agent_plan_key(request))
+        if plan is not None:
+            return plan
+        return await asyncio.to_thread(self._get_agent_plan, request)
+
+    @staticmethod
+    def __get_agent_plan_key(request: CompletionRequestBase) -> tuple:
+        """
+        Builds the key of the compiled plan of the agent of the completion request.
+        """
+        if request.agent is None:
+            raise LangChainException("The Agent property of the completion request cannot be null.", 400)
+
+        return (
+            request.agent.object_id or request.agent.name,
+            hashlib.sha256(request.agent.model_dump_json().encode('utf-8')).hexdigest()
+        )
+
+    @classmethod
+    def clear_agent_plans(cls):
+        """
+        Removes all compiled agent plans.
+        Plans hold resolved configuration values and must be cleared when the configuration is refreshed.
+        """
+        cls._agent_plans.clear()
+
+    def __compile_agent_plan(self, request: CompletionRequestBase, key: str) -> AgentPlan:
+        """
+        Validates the agent of the completion request and compiles its plan.
+        """
+        self._validate_request(request)
+        agent = request.agent
+        agent_parameters = agent.orchestration_settings.agent_parameters
+
+        indexing_profile = None
+        text_embedding_profile = None
+        vectorization = getattr(agent, 'vectorization', None)
+        if vectorization is not None:
+            indexing_profile = self._get_indexing_profile_from_object_id(
+                vectorization.indexing_profile_object_id,
+                agent_parameters)
+            text_embedding_profile = self._get_text_embedding_profile_from_object_id(
+                vectorization.text_embedding_profile_object_id,
+                agent_parameters)
+
+        return AgentPlan(
+            key = key,
+            prompt = self._get_prompt_from_object_id(agent.prompt_object_id, agent_parameters),
+            indexing_profile = indexing_profile,
+            text_embedding_profile = text_embedding_profile,
+            endpoint_settings = self.__extract_endpoint_configuration(agent.orchestration_settings.endpoint_configuration)
+        )
+
     def _get_prompt_from_object_id(self, prompt_object_id: str, agent_parameters: dict) -> MultipartPrompt:
         """
         Get the prompt from the object id.
@@ -114,8 +252,10 @@ class LangChainAgentBase():
 
         return text_embedding_profile
 
-    def __pascal_to_snake(self, name):  
-        # Convert PascalCase or camelCase to snake_case  
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def __pascal_to_snake(name):  
+        # Convert PascalCase or camelCase to snake_case, memoized as profiles repeat the same keys  
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)  
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()  
 
@@ -207,7 +347,7 @@ class LangChainAgentBase():
 
     def _record_full_prompt(self, prompt: str) -> str:
         """
-        Records the full prompt for the completion request.
+        Records the full prompt in the state of the current completion request.
 
         Parameters
         ----------
@@ -219,9 +359,49 @@ class LangChainAgentBase():
         str
             Returns the full prompt.
         """
-        self.full_prompt = prompt
+        RequestState.get().full_prompt = prompt
         return prompt
 
+    def _get_token_count(self, language_model: Runnable, text: str) -> int:
+        """
+        Estimates the number of tokens in the specified text using the tokenizer of the language model.
+
+        Parameters
+        ----------
+        language_model : Runnable
+            The language model, optionally bound to request-level model parameters.
+        text : str
+            The text for which to count tokens.
+
+        Returns
+        -------
+        int
+            Returns the number of tokens, or 0 if the tokens cannot be counted.
+        """
+        try:
+            return self._get_unbound_language_model(language_model).get_num_tokens(text)
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _get_unbound_language_model(language_model: Runnable) -> Runnable:
+        """
+        Retrieves the shared client of a language model bound to request-level model parameters.
+
+        Parameters
+        ----------
+        language_model : Runnable
+            The language model, optionally bound to request-level model parameters.
+
+        Returns
+        -------
+        Runnable
+            Returns the client of the language model.
+        """
+        if isinstance(language_model, RunnableBinding):
+            return language_model.bound
+        return language_model
+
     def __extract_endpoint_configuration(
             self,
             endpoint_configuration: dict) -> EndpointSettings:
@@ -262,96 +442,60 @@ class LangChainAgentBase():
     def _get_language_model(
             self,
             agent_orchestration_settings: OrchestrationSettings,
-            model_override_settings: Optional[OrchestrationSettings] = None) -> BaseLanguageModel:
+            model_override_settings: Optional[OrchestrationSettings] = None,
+            endpoint_settings: Optional[EndpointSettings] = None) -> Runnable:
         """
-        Create a language model using the specified endpoint settings.
+        Retrieves the shared language model for the specified endpoint settings,
+        bound to the model parameters of the completion request.
 
         Parameters
         ----------
-        config : Configuration
-            Application configuration class for retrieving configuration settings.
         agent_orchestration_settings : OrchestrationSettings
             The settings for the completion request configured on the agent.
         model_override_settings : Optional[OrchestrationSettings]
             Any settings specified on the completion request for overriding the model's settings.
+        endpoint_settings : Optional[EndpointSettings]
+            The endpoint settings resolved by the agent plan. Extracted from the
+            agent orchestration settings when not specified.
 
         Returns
         -------
-        BaseLanguageModel
+        Runnable
             Returns an API connector for a chat completion model.
         """
-        endpoint_settings = self.__extract_endpoint_configuration(agent_orchestration_settings.endpoint_configuration)
-                
-        langauge_model:BaseLanguageModel = None
+        if endpoint_settings is None:
+            endpoint_settings = self.__extract_endpoint_configuration(agent_orchestration_settings.endpoint_configuration)
 
+        override_model_parameters = (
+            model_override_settings.model_parameters
+            if model_override_settings is not None
+            else None
+        )
+
+        deployment_name = None
+        model_name = None
         if endpoint_settings.provider == LanguageModelProvider.MICROSOFT:
             # Get Azure OpenAI Chat model settings
-            deployment_name = (model_override_settings.model_parameters.get('deployment_name')
-                                if model_override_settings is not None
-                                    and model_override_settings.model_parameters is not None
-                                    and model_override_settings.model_parameters.get('deployment_name') is not None
+            deployment_name = (override_model_parameters.get('deployment_name')
+                                if override_model_parameters is not None
+                                    and override_model_parameters.get('deployment_name') is not None
                                 else agent_orchestration_settings.model_parameters.get('deployment_name'))
             if deployment_name is None:
                 raise ValueError("Deployment name is required for Azure OpenAI completion requests.")
-
-            if endpoint_settings.authentication_type == AuthenticationTypes.TOKEN:
-                try:
-                    # Set up a Azure AD token provider.
-                    # TODO: Determine if there is a more efficient way to get the token provider than making the request for every call.
-                    token_provider = get_bearer_token_provider(
-                        DefaultAzureCredential(exclude_environment_credential=True),
-                        'https://cognitiveservices.azure.com/.default'
-                    )
-                
-                    langauge_model = (
-                        AzureChatOpenAI(
-                            azure_endpoint=endpoint_settings.endpoint,
-                            api_version=endpoint_settings.api_version,
-                            openai_api_type=endpoint_settings.api_type,
-                            azure_ad_token_provider=token_provider,
-                            azure_deployment=deployment_name
-                        ) if endpoint_settings.operation_type == OperationTypes.CHAT
-                        else AzureOpenAI(
-                            azure_endpoint=endpoint_settings.endpoint,
-                            api_version=endpoint_settings.api_version,
-                            openai_api_type=endpoint_settings.api_type,
-                            azure_ad_token_provider=token_provider,
-                            azure_deployment=deployment_name
-                        )
-                    )
-                except Exception as e:
-                    raise LangChainException(f"Failed to create Azure OpenAI API connector: {str(e)}", 500)
-            else: # Key-based authentication
-                langauge_model = (
-                    AzureChatOpenAI(
-                        azure_endpoint=endpoint_settings.endpoint,
-                        api_key=endpoint_settings.api_key,
-                        api_version=endpoint_settings.api_version,
-                        azure_deployment=deployment_name
-                    ) if endpoint_settings.operation_type == OperationTypes.CHAT
-                    else AzureOpenAI(
-                        azure_endpoint=endpoint_settings.endpoint,
-                        api_key=endpoint_settings.api_key,
-                        api_version=endpoint_settings.api_version,
-                        azure_deployment=deployment_name
-                    )
-                )
         else:
-            langauge_model = (
-                ChatOpenAI(base_url=endpoint_settings.endpoint, api_key=endpoint_settings.api_key)
-                if endpoint_settings.operation_type == OperationTypes.CHAT
-                else OpenAI(base_url=endpoint_settings.endpoint, api_key=endpoint_settings.api_key)
-            )
-
-        # Set model parameters from agent orchestration settings.
-        for key, value in agent_orchestration_settings.model_parameters.items():
-            if hasattr(langauge_model, key):
-                setattr(langauge_model, key, value)
-
-        # Override model parameters from completion request settings, if any exist.
-        if model_override_settings is not None and model_override_settings.model_parameters is not None:            
-            for key, value in model_override_settings.model_parameters.items():
-                if hasattr(langauge_model, key):
-                    setattr(langauge_model, key, value)
-
-        return langauge_model
+            model_name = LanguageModelClientRegistry.get_model_name(
+                agent_orchestration_settings.model_parameters,
+                override_model_parameters)
+
+        try:
+            language_model = LanguageModelClientRegistry.get_client(endpoint_settings, deployment_name, model_name)
+        except Exception as e:
+            raise LangChainException(f"Failed to create Azure OpenAI API connector: {str(e)}", 500)
+
+        # Apply the model parameters from the agent orchestration settings, overridden by
+        # the completion request settings, to this call only. The client is shared and must not be mutated.
+        request_parameters = LanguageModelClientRegistry.get_request_parameters(
+            agent_orchestration_settings.model_parameters,
+            override_model_parameters)
+
+        return language_model.bind(**request_parameters) if request_parameters else language_model
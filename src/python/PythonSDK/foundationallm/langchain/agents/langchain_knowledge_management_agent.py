@@ -1,10 +1,17 @@
-﻿from typing import List
+﻿import asyncio
+from operator import itemgetter
+from typing import AsyncIterator, List, Optional, Tuple, Union
 from langchain_community.callbacks import get_openai_callback
+from langchain_community.callbacks.openai_info import OpenAICallbackHandler
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableLambda
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
-from foundationallm.langchain.agents import LangChainAgentBase
+from foundationallm.langchain.agents import AgentPlan, LangChainAgentBase
+from foundationallm.langchain.cache import QueryEmbeddingCache, SemanticCompletionCache
+from foundationallm.langchain.callbacks import CompletionTelemetryCallbackHandler
 from foundationallm.langchain.exceptions import LangChainException
+from foundationallm.langchain.request_state import RequestState
 from foundationallm.langchain.retrievers import RetrieverFactory, CitationRetrievalBase
 from foundationallm.models.orchestration import (
     CompletionResponse
@@ -31,87 +38,477 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
             Returns a CompletionResponse with the generated summary, the user_prompt,
             generated full prompt with context and token utilization and execution cost details.
         """
-        self._validate_request(request)
-        agent = request.agent
+        telemetry = self.__start_telemetry(request)
+        with telemetry.stage('agent_parsing'):
+            plan = self._get_agent_plan(request)
 
-        prompt = self._get_prompt_from_object_id(agent.prompt_object_id, agent.orchestration_settings.agent_parameters)
-        
         with get_openai_callback() as cb:
             try:
-                prompt_builder = ''
-
-                # Add the prefix, if it exists.
-                if prompt.prefix is not None:
-                    prompt_builder = f'{prompt.prefix}\n\n'
-
-                # Add the message history, if it exists.
-                conversation_history = agent.conversation_history
-                if conversation_history is not None and conversation_history.enabled:
-                    prompt_builder += self._build_conversation_history(
-                        request.message_history,
-                        conversation_history.max_history)
-
-                # Insert the context into the template.
-                prompt_builder += '{context}'   
-
-                # Add the suffix, if it exists.
-                if prompt.suffix is not None:
-                    prompt_builder += f'\n\n{prompt.suffix}'
-
-                # Get the vector document retriever, if it exists.
-                retriever = None
-                if request.agent.vectorization is not None:
-                    indexing_profile = self._get_indexing_profile_from_object_id(
-                        agent.vectorization.indexing_profile_object_id,
-                        agent.orchestration_settings.agent_parameters)
-
-                    text_embedding_profile = self._get_text_embedding_profile_from_object_id(
-                        agent.vectorization.text_embedding_profile_object_id,
-                        agent.orchestration_settings.agent_parameters)
-
-                    if (indexing_profile is not None) and (text_embedding_profile is not None):
-                        retriever_factory = RetrieverFactory(
-                                        indexing_profile,
-                                        text_embedding_profile,
-                                        self.config,
-                                        request.settings)
-                        retriever = retriever_factory.get_retriever()
-
-                # Insert the user prompt into the template.
-                if retriever is not None:    
-                    prompt_builder += "\n\nQuestion: {question}"
-
-                # Create the prompt template.
-                prompt_template = PromptTemplate.from_template(prompt_builder)
-
-                if retriever is not None:
-                    chain_context = { "context": retriever | retriever.format_docs, "question": RunnablePassthrough() }
-                else:
-                    chain_context = { "context": RunnablePassthrough() }
-
-                # Compose LCEL chain
-                chain = (
-                    chain_context
-                    | prompt_template
-                    | RunnableLambda(self._record_full_prompt)
-                    | self._get_language_model(agent.orchestration_settings, request.settings)
-                    | StrOutputParser()
-                )
-
-                completion = chain.invoke(request.user_prompt)
-                citations = []
-                if isinstance(retriever, CitationRetrievalBase):
-                    citations = retriever.get_document_citations()
-                    
-                return CompletionResponse(
-                    completion = completion,
-                    citations = citations,
-                    user_prompt = request.user_prompt,
-                    full_prompt = self.full_prompt.text,
-                    completion_tokens = cb.completion_tokens,
-                    prompt_tokens = cb.prompt_tokens,
-                    total_tokens = cb.total_tokens,
-                    total_cost = cb.total_cost
-                )
+                chain, retriever, language_model, cached_completion, prompt_embedding = \
+                    self.__prepare(request, plan, telemetry)
+                if cached_completion is not None:
+                    return cached_completion
+
+                completion = chain.invoke(self.__get_chain_input(request), config={'callbacks': [telemetry]})
+                return self.__complete(request, completion, retriever, language_model, cb, prompt_embedding)
             except Exception as e:
                 raise LangChainException(f"An unexpected exception occurred when executing the completion request: {str(e)}", 500) 
+
+    async def ainvoke(self, request: KnowledgeManagementCompletionRequest) -> CompletionResponse:
+        """
+        Executes a completion request asynchronously by querying the vector index with the user prompt.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        
+        Returns
+        -------
+        CompletionResponse
+            Returns a CompletionResponse with the generated summary, the user_prompt,
+            generated full prompt with context and token utilization and execution cost details.
+        """
+        telemetry = self.__start_telemetry(request)
+        with telemetry.stage('agent_parsing'):
+            plan = await self._aget_agent_plan(request)
+
+        with get_openai_callback() as cb:
+            try:
+                chain, retriever, language_model, cached_completion, prompt_embedding = \
+                    await self.__aprepare(request, plan, telemetry)
+                if cached_completion is not None:
+                    return cached_completion
+
+                completion = await chain.ainvoke(self.__get_chain_input(request), config={'callbacks': [telemetry]})
+                return self.__complete(request, completion, retriever, language_model, cb, prompt_embedding)
+            except Exception as e:
+                raise LangChainException(f"An unexpected exception occurred when executing the completion request: {str(e)}", 500)
+
+    async def astream(self, request: KnowledgeManagementCompletionRequest) -> AsyncIterator[Union[str, CompletionResponse]]:
+        """
+        Executes a completion request asynchronously by querying the vector index with the user prompt,
+        yielding the completion tokens as they are generated by the language model.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        
+        Returns
+        -------
+        AsyncIterator[Union[str, CompletionResponse]]
+            Yields the completion tokens as they arrive, followed by a CompletionResponse
+            with the full completion, citations and token utilization details.
+        """
+        telemetry = self.__start_telemetry(request)
+        with telemetry.stage('agent_parsing'):
+            plan = await self._aget_agent_plan(request)
+
+        with get_openai_callback() as cb:
+            try:
+                chain, retriever, language_model, cached_completion, prompt_embedding = \
+                    await self.__aprepare(request, plan, telemetry)
+                if cached_completion is not None:
+                    yield cached_completion.completion
+                    yield cached_completion
+                    return
+
+                completion = ''
+                async for token in chain.astream(self.__get_chain_input(request), config={'callbacks': [telemetry]}):
+                    completion += token
+                    yield token
+                yield self.__complete(request, completion, retriever, language_model, cb, prompt_embedding)
+            except Exception as e:
+                raise LangChainException(f"An unexpected exception occurred when executing the completion request: {str(e)}", 500)
+
+    def __prepare(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            plan: AgentPlan,
+            telemetry: CompletionTelemetryCallbackHandler) \
+                -> Tuple[Runnable, BaseRetriever, Runnable, Optional[CompletionResponse], Optional[List[float]]]:
+        """
+        Retrieves the chain of the completion request and looks up its completion in the semantic completion cache.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        plan : AgentPlan
+            The compiled plan of the agent.
+        telemetry : CompletionTelemetryCallbackHandler
+            The callback handler that records the stages of the request.
+
+        Returns
+        -------
+        Tuple[Runnable, BaseRetriever, Runnable, Optional[CompletionResponse], Optional[List[float]]]
+            Returns the chain, the vector document retriever and the language model used by the chain,
+            followed by the cached completion and the embeddings vector of the user prompt, if any.
+        """
+        chain, retriever, language_model = self.__get_chain(request, plan)
+        telemetry.set_attributes(**self.__get_telemetry_attributes(plan, language_model))
+        cached_completion, prompt_embedding = self.__get_cached_completion(request, retriever)
+        return chain, retriever, language_model, cached_completion, prompt_embedding
+
+    async def __aprepare(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            plan: AgentPlan,
+            telemetry: CompletionTelemetryCallbackHandler) \
+                -> Tuple[Runnable, BaseRetriever, Runnable, Optional[CompletionResponse], Optional[List[float]]]:
+        """
+        Retrieves the chain of the completion request and looks up its completion in the semantic completion cache,
+        without blocking the event loop.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        plan : AgentPlan
+            The compiled plan of the agent.
+        telemetry : CompletionTelemetryCallbackHandler
+            The callback handler that records the stages of the request.
+
+        Returns
+        -------
+        Tuple[Runnable, BaseRetriever, Runnable, Optional[CompletionResponse], Optional[List[float]]]
+            Returns the chain, the vector document retriever and the language model used by the chain,
+            followed by the cached completion and the embeddings vector of the user prompt, if any.
+        """
+        chain, retriever, language_model = await self.__aget_chain(request, plan)
+        telemetry.set_attributes(**self.__get_telemetry_attributes(plan, language_model))
+        cached_completion, prompt_embedding = await self.__aget_cached_completion(request, retriever)
+        return chain, retriever, language_model, cached_completion, prompt_embedding
+
+    def __complete(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            completion: str,
+            retriever: BaseRetriever,
+            language_model: Runnable,
+            cb: OpenAICallbackHandler,
+            prompt_embedding: Optional[List[float]]) -> CompletionResponse:
+        """
+        Builds the response to the completion request, records its token usage
+        and adds it to the semantic completion cache.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        completion : str
+            The completion generated by the chain.
+        retriever : BaseRetriever
+            The vector document retriever, whose documents are cited.
+        language_model : Runnable
+            The language model used by the chain, whose tokenizer counts streamed tokens.
+        cb : OpenAICallbackHandler
+            The callback handler that collected the token usage of the request.
+        prompt_embedding : Optional[List[float]]
+            The embeddings vector of the user prompt, or None if the completion cannot be cached.
+
+        Returns
+        -------
+        CompletionResponse
+            Returns the completion with its citations and token utilization details.
+        """
+        state = RequestState.get()
+        citations = []
+        if isinstance(retriever, CitationRetrievalBase):
+            citations = retriever.get_document_citations()
+
+        # Token usage is not reported by the service for streamed completions.
+        prompt_tokens = cb.prompt_tokens or self._get_token_count(language_model, state.full_prompt.text)
+        completion_tokens = cb.completion_tokens or self._get_token_count(language_model, completion)
+
+        response = CompletionResponse(
+            completion = completion,
+            citations = citations,
+            user_prompt = request.user_prompt,
+            full_prompt = state.full_prompt.text,
+            completion_tokens = completion_tokens,
+            prompt_tokens = prompt_tokens,
+            total_tokens = prompt_tokens + completion_tokens,
+            total_cost = cb.total_cost
+        )
+        state.telemetry.record_tokens(response.prompt_tokens, response.completion_tokens)
+        self.__cache_completion(request, prompt_embedding, response)
+        return response
+
+    def __start_telemetry(self, request: KnowledgeManagementCompletionRequest) -> CompletionTelemetryCallbackHandler:
+        """
+        Starts the state of the completion request and the recording of its stages.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+
+        Returns
+        -------
+        CompletionTelemetryCallbackHandler
+            Returns the callback handler that records the stages of the request.
+        """
+        state = RequestState.start()
+        state.telemetry = CompletionTelemetryCallbackHandler(agent_name=request.agent.name)
+        return state.telemetry
+
+    def __get_telemetry_attributes(self, plan: AgentPlan, language_model: Runnable) -> dict:
+        """
+        Retrieves the deployment and index names with which the stages of the request are tagged.
+
+        Parameters
+        ----------
+        plan : AgentPlan
+            The compiled plan of the agent.
+        language_model : Runnable
+            The language model used by the chain, optionally bound to request-level model parameters.
+
+        Returns
+        -------
+        dict
+            Returns the names of the language model deployment and of the index, if any.
+        """
+        return {
+            'deployment_name': getattr(self._get_unbound_language_model(language_model), 'deployment_name', None),
+            'index_name': plan.indexing_profile.settings.index_name if plan.indexing_profile is not None else None
+        }
+
+    def __get_cached_completion(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            retriever: BaseRetriever) -> Tuple[Optional[CompletionResponse], Optional[List[float]]]:
+        """
+        Looks up the completion of a similar user prompt in the semantic completion cache.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        retriever : BaseRetriever
+            The vector document retriever, whose embedding model embeds the user prompt.
+
+        Returns
+        -------
+        Tuple[Optional[CompletionResponse], Optional[List[float]]]
+            Returns the cached completion, or None on a cache miss, and the embeddings vector
+            of the user prompt, or None if the completion of the request cannot be cached.
+        """
+        embedding_model = getattr(retriever, 'embedding_model', None)
+        if embedding_model is None or not SemanticCompletionCache.is_enabled(request):
+            return None, None
+        with RequestState.get().stage('embedding'):
+            prompt_embedding = QueryEmbeddingCache.get_embedding(embedding_model, request.user_prompt)
+        return SemanticCompletionCache.get_completion(request, prompt_embedding), prompt_embedding
+
+    async def __aget_cached_completion(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            retriever: BaseRetriever) -> Tuple[Optional[CompletionResponse], Optional[List[float]]]:
+        """
+        Looks up the completion of a similar user prompt in the semantic completion cache asynchronously.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        retriever : BaseRetriever
+            The vector document retriever, whose embedding model embeds the user prompt.
+
+        Returns
+        -------
+        Tuple[Optional[CompletionResponse], Optional[List[float]]]
+            Returns the cached completion, or None on a cache miss, and the embeddings vector
+            of the user prompt, or None if the completion of the request cannot be cached.
+        """
+        embedding_model = getattr(retriever, 'embedding_model', None)
+        if embedding_model is None or not SemanticCompletionCache.is_enabled(request):
+            return None, None
+        with RequestState.get().stage('embedding'):
+            prompt_embedding = await QueryEmbeddingCache.aget_embedding(embedding_model, request.user_prompt)
+        return SemanticCompletionCache.get_completion(request, prompt_embedding), prompt_embedding
+
+    def __cache_completion(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            prompt_embedding: Optional[List[float]],
+            response: CompletionResponse):
+        """
+        Adds the completion to the semantic completion cache, if the completion of the request can be cached.
+        """
+        if prompt_embedding is not None:
+            SemanticCompletionCache.add_completion(request, prompt_embedding, response)
+
+    def __get_chain(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            plan: AgentPlan) -> Tuple[Runnable, BaseRetriever, Runnable]:
+        """
+        Retrieves the LCEL chain that executes the completion request, composing it
+        the first time the agent configuration and request settings are seen.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        plan : AgentPlan
+            The compiled plan of the agent.
+
+        Returns
+        -------
+        Tuple[Runnable, BaseRetriever, Runnable]
+            Returns the chain, the vector document retriever (or None if the agent
+            has no vectorization settings) and the language model used by the chain.
+        """
+        key = self.__get_chain_key(request, plan)
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = self.__build_chain(request, plan)
+            self._chains.set(key, chain)
+        return chain
+
+    async def __aget_chain(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            plan: AgentPlan) -> Tuple[Runnable, BaseRetriever, Runnable]:
+        """
+        Retrieves the LCEL chain that executes the completion request without blocking the event loop.
+        Composing reads configuration settings that may not be in memory yet,
+        so chains are composed on a worker thread.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        plan : AgentPlan
+            The compiled plan of the agent.
+
+        Returns
+        -------
+        Tuple[Runnable, BaseRetriever, Runnable]
+            Returns the chain, the vector document retriever (or None if the agent
+            has no vectorization settings) and the language model used by the chain.
+        """
+        chain = self._chains.get(self.__get_chain_key(request, plan))
+        if chain is not None:
+            return chain
+        return await asyncio.to_thread(self.__get_chain, request, plan)
+
+    @staticmethod
+    def __get_chain_key(request: KnowledgeManagementCompletionRequest, plan: AgentPlan) -> tuple:
+        """
+        Builds the key of the chain that executes the completion request.
+        """
+        # The request settings override the retriever and model parameters composed into the chain.
+        return (
+            plan.key,
+            request.settings.model_dump_json() if request.settings is not None else None
+        )
+
+    def __get_chain_input(self, request: KnowledgeManagementCompletionRequest) -> dict:
+        """
+        Builds the request-specific inputs of the chain.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+
+        Returns
+        -------
+        dict
+            Returns the user prompt and, if the agent has conversation history enabled, the chat history.
+        """
+        chain_input = { "question": request.user_prompt }
+
+        conversation_history = request.agent.conversation_history
+        if conversation_history is not None and conversation_history.enabled:
+            chain_input["history"] = self._build_conversation_history(
+                request.message_history,
+                conversation_history.max_history)
+
+        return chain_input
+
+    def __build_chain(
+            self,
+            request: KnowledgeManagementCompletionRequest,
+            plan: AgentPlan) -> Tuple[Runnable, BaseRetriever, Runnable]:
+        """
+        Composes the LCEL chain that executes completion requests for the agent configuration.
+        Request-specific inputs are supplied when the chain is invoked.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request to execute.
+        plan : AgentPlan
+            The compiled plan of the agent.
+
+        Returns
+        -------
+        Tuple[Runnable, BaseRetriever, Runnable]
+            Returns the chain, the vector document retriever (or None if the agent
+            has no vectorization settings) and the language model used by the chain.
+        """
+        agent = request.agent
+        prompt = plan.prompt
+
+        prompt_builder = ''
+
+        # Add the prefix, if it exists.
+        if prompt.prefix is not None:
+            prompt_builder = f'{prompt.prefix}\n\n'
+
+        # Add the message history, if it exists. It is supplied with each request.
+        conversation_history = agent.conversation_history
+        history_enabled = conversation_history is not None and conversation_history.enabled
+        if history_enabled:
+            prompt_builder += '{history}'
+
+        # Insert the context into the template.
+        prompt_builder += '{context}'   
+
+        # Add the suffix, if it exists.
+        if prompt.suffix is not None:
+            prompt_builder += f'\n\n{prompt.suffix}'
+
+        # Get the vector document retriever, if it exists.
+        retriever = None
+        if (plan.indexing_profile is not None) and (plan.text_embedding_profile is not None):
+            retriever_factory = RetrieverFactory(
+                            plan.indexing_profile,
+                            plan.text_embedding_profile,
+                            self.config,
+                            request.settings)
+            retriever = retriever_factory.get_retriever()
+
+        # Insert the user prompt into the template.
+        if retriever is not None:    
+            prompt_builder += "\n\nQuestion: {question}"
+
+        # Create the prompt template.
+        prompt_template = PromptTemplate.from_template(prompt_builder)
+
+        if retriever is not None:
+            chain_context = { "context": itemgetter("question") | retriever | retriever.format_docs, "question": itemgetter("question") }
+        else:
+            chain_context = { "context": itemgetter("question") }
+        if history_enabled:
+            chain_context["history"] = itemgetter("history")
+
+        language_model = self._get_language_model(
+            agent.orchestration_settings,
+            request.settings,
+            plan.endpoint_settings)
+
+        # Compose LCEL chain
+        chain = (
+            chain_context
+            | prompt_template
+            | RunnableLambda(self._record_full_prompt)
+            | language_model
+            | StrOutputParser()
+        )
+
+        return chain, retriever, language_model
@@ -0,0 +1,4 @@
+from .ttl_lru_cache import TTLLRUCache
+from .query_embedding_cache import QueryEmbeddingCache
+from .retrieval_result_cache import RetrievalResultCache
+from .semantic_completion_cache import SemanticCompletionCache
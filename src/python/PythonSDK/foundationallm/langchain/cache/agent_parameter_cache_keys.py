@@ -0,0 +1,19 @@
+"""
+Agent Parameters relevant to completion cache settings.
+"""
+
+"""
+Enables the semantic completion cache for the agent when set to True.
+"""
+SEMANTIC_CACHE_ENABLED = "semantic_cache_enabled"
+
+"""
+The minimum cosine similarity between two user prompts for the cached
+completion of one to be returned for the other.
+"""
+SEMANTIC_CACHE_SIMILARITY_THRESHOLD = "semantic_cache_similarity_threshold"
+
+"""
+The number of seconds a cached completion remains valid.
+"""
+SEMANTIC_CACHE_TTL_SECONDS = "semantic_cache_ttl_seconds"
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from contextlib import closing
+from typing import Iterator, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES,
+    FOUNDATIONALLM_EMBEDDING_CACHE_PATH,
+    FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS
+)
+from foundationallm.telemetry import Telemetry
+from .ttl_lru_cache import TTLLRUCache
+
+"""
+Defaults used when the cache is not configured through environment variables.
+"""
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 86400
+
+class QueryEmbeddingCache:
+    """
+    Process-wide cache of query embeddings.
+
+    Embeddings are keyed by the endpoint, deployment and model of the embedding model
+    and by a hash of the normalized text of the query, so repeated and trivially different questions
+    (case, surrounding or repeated whitespace) skip the call to the embedding model.
+    Queries may contain personal data, so their text is never kept.
+
+    The cache is configured with the following environment variables:
+        FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES: maximum number of entries, 0 disables the cache
+        FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS: number of seconds an entry remains valid
+        FOUNDATIONALLM_EMBEDDING_CACHE_PATH: optional SQLite file in which entries are persisted
+    """
+    _cache: Optional[TTLLRUCache] = None
+    _store: Optional['EmbeddingCacheStore'] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_embedding(cls, embedding_model: Embeddings, text: str) -> List[float]:
+        """
+        Retrieves the embeddings vector for the specified query,
+        calling the embedding model on a cache miss.
+
+        Parameters
+        ----------
+        embedding_model : Embeddings
+            The embedding model used to embed the query.
+        text : str
+            The query to embed.
+
+        Returns
+        -------
+        List[float]
+            Returns the embeddings vector of the query.
+        """
+        cache = cls.load()
+        if not cache.enabled:
+            with Telemetry.track_dependency('embedding'):
+                return embedding_model.embed_query(text)
+
+        key = cls.get_key(embedding_model, text)
+        embedding = cache.get(key)
+        if embedding is None:
+            with Telemetry.track_dependency('embedding'):
+                embedding = tuple(embedding_model.embed_query(text))
+            cls.__add(key, embedding)
+        return list(embedding)
+
+    @classmethod
+    async def aget_embedding(cls, embedding_model: Embeddings, text: str) -> List[float]:
+        """
+        Retrieves the embeddings vector for the specified query asynchronously,
+        calling the embedding model on a cache miss.
+
+        Parameters
+        ----------
+        embedding_model : Embeddings
+            The embedding model used to embed the query.
+        text : str
+            The query to embed.
+
+        Returns
+        -------
+        List[float]
+            Returns the embeddings vector of the query.
+        """
+        cache = cls.load()
+        if not cache.enabled:
+            with Telemetry.track_dependency('embedding'):
+                return await embedding_model.aembed_query(text)
+
+        key = cls.get_key(embedding_model, text)
+        embedding = cache.get(key)
+        if embedding is None:
+            with Telemetry.track_dependency('embedding'):
+                embedding = tuple(await embedding_model.aembed_query(text))
+            cls.__add(key, embedding)
+        return list(embedding)
+
+    @classmethod
+    def load(cls) -> TTLLRUCache:
+        """
+        Initializes the cache from the environment on first use,
+        restoring persisted entries when a cache file is configured.
+
+        Returns
+        -------
+        TTLLRUCache
+            Returns the underlying cache.
+        """
+        if cls._cache is not None:
+            return cls._cache
+
+        with cls._lock:
+            if cls._cache is None:
+                cache = TTLLRUCache(
+                    max_entries=int(os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES, DEFAULT_MAX_ENTRIES)),
+                    ttl_seconds=float(os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS, DEFAULT_TTL_SECONDS))
+                )
+                path = os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_PATH)
+                if cache.enabled and path:
+                    try:
+                        store = EmbeddingCacheStore(path, cache.ttl_seconds)
+                        for key, created, embedding in store.load(cache.max_entries):
+                            cache.set(key, embedding, created)
+                        cls._store = store
+                    except Exception as e:
+                        logging.warning(f'The query embedding cache could not be restored from {path}: {e}')
+                cls._cache = cache
+        return cls._cache
+
+    @classmethod
+    def get_statistics(cls) -> dict:
+        """
+        Retrieves the cache counters.
+
+        Returns
+        -------
+        dict
+            Returns the number of entries, hits, misses, evictions and expirations,
+            and the ratio of hits to lookups.
+        """
+        return cls.load().get_statistics()
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all cached embeddings from memory and from the cache file.
+        """
+        cls.load().clear()
+        if cls._store is not None:
+            cls._store.clear()
+
+    @staticmethod
+    def get_key(embedding_model: Embeddings, text: str) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """
+        Builds the cache key for the specified embedding model and query.
+
+        Parameters
+        ----------
+        embedding_model : Embeddings
+            The embedding model used to embed the query.
+        text : str
+            The query to embed.
+
+        Returns
+        -------
+        Tuple[Optional[str], Optional[str], Optional[str], str]
+            Returns the endpoint, deployment and model of the embedding model
+            and the SHA-256 hash of the normalized query.
+        """
+        endpoint = getattr(embedding_model, 'azure_endpoint', None) or getattr(embedding_model, 'openai_api_base', None)
+        return (
+            endpoint,
+            getattr(embedding_model, 'deployment', None),
+            getattr(embedding_model, 'model', None),
+            hashlib.sha256(QueryEmbeddingCache.normalize(text).encode('utf-8')).hexdigest()
+        )
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalizes a query so trivially different queries share a cache entry.
+        """
+        return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text)).strip().casefold()
+
+    @classmethod
+    def __add(cls, key: Tuple, embedding: Tuple[float, ...]):
+        """
+        Adds an embedding to the cache and to the cache file.
+        """
+        created = time.time()
+        cls._cache.set(key, embedding, created)
+        if cls._store is not None:
+            cls._store.save(key, created, embedding)
+
+class EmbeddingCacheStore:
+    """
+    SQLite file in which the query embedding cache is persisted.
+    Entries are written by a background thread so requests never wait on disk I/O.
+    The file is readable by its owner only, and expired entries are removed as new ones are written.
+    """
+    def __init__(self, path: str, ttl_seconds: float):
+        """
+        Initializes the cache file, creating it if it does not exist.
+
+        Parameters
+        ----------
+        path : str
+            The path of the SQLite file.
+        ttl_seconds : float
+            The number of seconds an entry remains valid.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._writes = queue.Queue()
+        # SQLite creates its journal files with the permissions of the database file.
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        # The connection context manager only commits, so the connection is closed explicitly.
+        with closing(self.__connect()) as connection, connection:
+            # Earlier versions keyed the entries by the text of the query.
+            connection.execute('DROP TABLE IF EXISTS embeddings')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, created REAL NOT NULL, embedding BLOB NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS query_embeddings_created ON query_embeddings (created)')
+            connection.execute('DELETE FROM query_embeddings WHERE created <= ?', (time.time() - ttl_seconds,))
+        self._writer = threading.Thread(
+            target=self.__write_entries,
+            name='foundationallm-embedding-cache-writer',
+            daemon=True)
+        self._writer.start()
+
+    def load(self, max_entries: int) -> Iterator[Tuple[Tuple, float, Tuple[float, ...]]]:
+        """
+        Reads the most recent entries that have not expired, oldest first,
+        and removes the entries that no longer fit in the cache from the file.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of entries to read.
+
+        Returns
+        -------
+        Iterator[Tuple[Tuple, float, Tuple[float, ...]]]
+            Yields the key, creation time and embeddings vector of each entry.
+        """
+        with closing(self.__connect()) as connection, connection:
+            rows = connection.execute(
+                'SELECT key, created, embedding FROM query_embeddings WHERE created > ? ORDER BY created DESC LIMIT ?',
+                (time.time() - self.ttl_seconds, max_entries)
+            ).fetchall()
+            connection.execute(
+                'DELETE FROM query_embeddings WHERE key NOT IN (SELECT key FROM query_embeddings ORDER BY created DESC LIMIT ?)',
+                (max_entries,)
+            )
+        for key, created, embedding in reversed(rows):
+            yield (tuple(json.loads(key)), created, tuple(array('d', embedding)))
+
+    def save(self, key: Tuple, created: float, embedding: Tuple[float, ...]):
+        """
+        Queues an entry to be written to the cache file.
+        """
+        self._writes.put((json.dumps(key), created, array('d', embedding).tobytes()))
+
+    def clear(self):
+        """
+        Queues the removal of all entries from the cache file.
+        """
+        self._writes.put(None)
+
+    def flush(self):
+        """
+        Waits until all queued writes have been written to the cache file.
+        """
+        self._writes.join()
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection to the cache file.
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __write_entries(self):
+        """
+        Writes queued entries to the cache file in batches.
+        """
+        connection = self.__connect()
+        while True:
+            writes = [self._writes.get()]
+            while not self._writes.empty():
+                writes.append(self._writes.get_nowait())
+            try:
+                with connection:
+                    for write in writes:
+                        if write is None:
+                            connection.execute('DELETE FROM query_embeddings')
+                        else:
+                            connection.execute(
+                                'INSERT OR REPLACE INTO query_embeddings (key, created, embedding) VALUES (?, ?, ?)', write)
+                    connection.execute('DELETE FROM query_embeddings WHERE created <= ?', (time.time() - self.ttl_seconds,))
+            except Exception as e:
+                logging.warning(f'Failed to persist the query embedding cache to {self.path}: {e}')
+            for _ in writes:
+                self._writes.task_done()
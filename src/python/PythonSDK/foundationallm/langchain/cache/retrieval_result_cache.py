@@ -0,0 +1,155 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES,
+    FOUNDATIONALLM_RETRIEVAL_CACHE_TTL_SECONDS
+)
+from .ttl_lru_cache import TTLLRUCache
+
+"""
+Defaults used when the cache is not configured through environment variables.
+"""
+DEFAULT_MAX_ENTRIES = 0
+DEFAULT_TTL_SECONDS = 300
+
+class RetrievalResultCache:
+    """
+    Process-wide cache of search results.
+
+    Results are keyed by the search endpoint, index, filter expression, number of results,
+    selected fields and query text. A cached result holds the document identifiers and the
+    documents, so citations are generated from it exactly as from a live search.
+
+    The cache is disabled by default and is configured with the following environment variables:
+        FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES: maximum number of entries, 0 disables the cache
+        FOUNDATIONALLM_RETRIEVAL_CACHE_TTL_SECONDS: number of seconds an entry remains valid
+
+    Cached results for an index should be invalidated when the index is re-vectorized.
+    """
+    _cache: Optional[TTLLRUCache] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_results(cls, key: Tuple) -> Optional[List[Tuple[str, Document]]]:
+        """
+        Retrieves the search results cached for the specified search.
+
+        Parameters
+        ----------
+        key : Tuple
+            The key of the search, built with get_key.
+
+        Returns
+        -------
+        List[Tuple[str, Document]]
+            Returns the document identifiers and documents, or None if the search is not cached.
+        """
+        cache = cls.load()
+        if not cache.enabled:
+            return None
+        results = cache.get(key)
+        return None if results is None else list(results)
+
+    @classmethod
+    def set_results(cls, key: Tuple, results: List[Tuple[str, Document]]):
+        """
+        Caches the results of the specified search.
+
+        Parameters
+        ----------
+        key : Tuple
+            The key of the search, built with get_key.
+        results : List[Tuple[str, Document]]
+            The document identifiers and documents returned by the search.
+        """
+        cls.load().set(key, tuple(results))
+
+    @classmethod
+    def invalidate(cls, index_name: Optional[str] = None) -> int:
+        """
+        Removes cached search results.
+
+        Parameters
+        ----------
+        index_name : str
+            The name of the index whose results are removed.
+            All results are removed when not specified.
+
+        Returns
+        -------
+        int
+            Returns the number of entries removed.
+        """
+        cache = cls.load()
+        if index_name is None:
+            count = len(cache)
+            cache.clear()
+            return count
+        return cache.remove_where(lambda key: key[1] == index_name)
+
+    @classmethod
+    def load(cls) -> TTLLRUCache:
+        """
+        Initializes the cache from the environment on first use.
+
+        Returns
+        -------
+        TTLLRUCache
+            Returns the underlying cache.
+        """
+        if cls._cache is None:
+            with cls._lock:
+                if cls._cache is None:
+                    cls._cache = TTLLRUCache(
+                        max_entries=int(os.environ.get(FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES, DEFAULT_MAX_ENTRIES)),
+                        ttl_seconds=float(os.environ.get(FOUNDATIONALLM_RETRIEVAL_CACHE_TTL_SECONDS, DEFAULT_TTL_SECONDS))
+                    )
+        return cls._cache
+
+    @classmethod
+    def get_statistics(cls) -> dict:
+        """
+        Retrieves the cache counters.
+
+        Returns
+        -------
+        dict
+            Returns the number of entries, hits, misses, evictions and expirations,
+            and the ratio of hits to lookups.
+        """
+        return cls.load().get_statistics()
+
+    @staticmethod
+    def get_key(
+            endpoint: str,
+            index_name: str,
+            filters: Optional[str],
+            top_n: int,
+            fields: Tuple[str, ...],
+            query: str) -> Tuple:
+        """
+        Builds the cache key for the specified search.
+
+        Parameters
+        ----------
+        endpoint : str
+            The Azure AI Search endpoint.
+        index_name : str
+            The name of the index searched.
+        filters : str
+            The filter expression of the search.
+        top_n : int
+            The number of results returned by the search.
+        fields : Tuple[str, ...]
+            The names of the fields searched and returned.
+        query : str
+            The query text.
+
+        Returns
+        -------
+        Tuple
+            Returns the cache key. The index name is always the second element.
+        """
+        return (endpoint, index_name, filters, top_n, fields, query)
@@ -0,0 +1,308 @@
+import hashlib
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+from foundationallm.models.orchestration import CompletionResponse
+from foundationallm.models.agents import KnowledgeManagementCompletionRequest
+from .agent_parameter_cache_keys import (
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS
+)
+from .ttl_lru_cache import TTLLRUCache
+
+"""
+Defaults used when the cache settings are not specified in the agent parameters.
+"""
+DEFAULT_SIMILARITY_THRESHOLD = 0.97
+DEFAULT_TTL_SECONDS = 3600
+
+"""
+The maximum number of completions cached for each agent.
+"""
+MAX_ENTRIES_PER_AGENT = 1000
+
+"""
+The maximum number of agent configurations for which completions are cached.
+"""
+MAX_AGENTS = 100
+
+class SemanticCacheIndex:
+    """
+    In-process nearest neighbour index of the completions cached for one agent.
+
+    The normalized embeddings of the user prompts are kept in a single NumPy matrix,
+    so a lookup is one matrix-vector product over all cached prompts.
+    When the index is full, the oldest completion is replaced.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initializes an empty index.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of completions kept in the index.
+        ttl_seconds : float
+            The number of seconds a completion remains valid after it is added.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None
+        self._created = np.zeros(0)
+        self._completions: List[CompletionResponse] = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def search(self, embedding: List[float], threshold: float) -> Optional[CompletionResponse]:
+        """
+        Finds the cached completion whose user prompt is most similar to the specified embedding.
+
+        Parameters
+        ----------
+        embedding : List[float]
+            The embeddings vector of the user prompt.
+        threshold : float
+            The minimum cosine similarity of a match.
+
+        Returns
+        -------
+        CompletionResponse
+            Returns the cached completion, or None if no prompt is similar enough.
+        """
+        query = self.__normalize(embedding)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                return None
+            similarities = self._vectors @ query
+            similarities[self._created <= time.time() - self.ttl_seconds] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                return None
+            return self._completions[best]
+
+    def add(self, embedding: List[float], completion: CompletionResponse):
+        """
+        Adds a completion to the index.
+
+        Parameters
+        ----------
+        embedding : List[float]
+            The embeddings vector of the user prompt.
+        completion : CompletionResponse
+            The completion generated for the user prompt.
+        """
+        vector = self.__normalize(embedding)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.empty((0, vector.shape[0]), dtype=np.float32)
+                self._created = np.zeros(0)
+                self._completions = []
+                self._next = 0
+            if len(self._completions) < self.max_entries:
+                self._vectors = np.vstack([self._vectors, vector])
+                self._created = np.append(self._created, time.time())
+                self._completions.append(completion)
+            else:
+                self._vectors[self._next] = vector
+                self._created[self._next] = time.time()
+                self._completions[self._next] = completion
+                self._next = (self._next + 1) % self.max_entries
+
+    def __len__(self) -> int:
+        return len(self._completions)
+
+    @staticmethod
+    def __normalize(embedding: List[float]) -> np.ndarray:
+        """
+        Scales an embeddings vector to unit length so dot products are cosine similarities.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+class SemanticCompletionCache:
+    """
+    Process-wide cache of completions generated by knowledge management agents,
+    matched on the semantic similarity of the user prompts.
+
+    The cache is enabled per agent with the semantic_cache_enabled agent parameter.
+    Completions are cached separately for each agent configuration, so changes to the agent,
+    its prompt or the request settings never return completions generated under the old ones.
+    Requests that carry conversation history are never served from or added to the cache,
+    because their completions depend on more than the user prompt.
+    """
+    _indexes = TTLLRUCache(max_entries=MAX_AGENTS, ttl_seconds=float('inf'))
+    _lock = threading.Lock()
+    _statistics = {
+        'lookups': 0,
+        'hits': 0,
+        'saved_tokens': 0
+    }
+
+    @classmethod
+    def is_enabled(cls, request: KnowledgeManagementCompletionRequest) -> bool:
+        """
+        Determines whether the completion of the specified request can be cached.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request.
+
+        Returns
+        -------
+        bool
+            Returns True if the agent has the semantic cache enabled and the request
+            carries no conversation history.
+        """
+        # Agent parameters may carry booleans as strings, so "false" must not enable the cache.
+        if str(cls.__get_agent_parameter(request, SEMANTIC_CACHE_ENABLED, False)).lower() != 'true':
+            return False
+        conversation_history = request.agent.conversation_history
+        if conversation_history is not None and conversation_history.enabled and request.message_history:
+            return False
+        return True
+
+    @classmethod
+    def get_completion(
+            cls,
+            request: KnowledgeManagementCompletionRequest,
+            embedding: List[float]) -> Optional[CompletionResponse]:
+        """
+        Retrieves the cached completion of a prompt similar to the user prompt of the request.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request.
+        embedding : List[float]
+            The embeddings vector of the user prompt.
+
+        Returns
+        -------
+        CompletionResponse
+            Returns the cached completion and citations for the user prompt of the request,
+            or None if no similar prompt is cached. The prompt that generated the cached
+            completion is never returned.
+        """
+        threshold = float(cls.__get_agent_parameter(
+            request, SEMANTIC_CACHE_SIMILARITY_THRESHOLD, DEFAULT_SIMILARITY_THRESHOLD))
+
+        index = cls._indexes.get(cls.get_scope(request))
+        completion = index.search(embedding, threshold) if index is not None else None
+
+        with cls._lock:
+            cls._statistics['lookups'] += 1
+            if completion is not None:
+                cls._statistics['hits'] += 1
+                cls._statistics['saved_tokens'] += completion.total_tokens
+        if completion is None:
+            return None
+
+        # No tokens were consumed to answer this request.
+        return completion.model_copy(update={
+            'user_prompt': request.user_prompt,
+            'full_prompt': None,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0,
+            'total_cost': 0.0
+        })
+
+    @classmethod
+    def add_completion(
+            cls,
+            request: KnowledgeManagementCompletionRequest,
+            embedding: List[float],
+            completion: CompletionResponse):
+        """
+        Caches the completion generated for the user prompt of the request.
+        Only the completion, its citations and its token usage are kept, so the prompt
+        and retrieved context of the request are never returned to another request.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request.
+        embedding : List[float]
+            The embeddings vector of the user prompt.
+        completion : CompletionResponse
+            The completion generated for the request.
+        """
+        scope = cls.get_scope(request)
+        with cls._lock:
+            index = cls._indexes.get(scope)
+            if index is None:
+                index = SemanticCacheIndex(
+                    MAX_ENTRIES_PER_AGENT,
+                    float(cls.__get_agent_parameter(request, SEMANTIC_CACHE_TTL_SECONDS, DEFAULT_TTL_SECONDS)))
+                cls._indexes.set(scope, index)
+        index.add(embedding, CompletionResponse(
+            user_prompt='',
+            completion=completion.completion,
+            citations=completion.citations,
+            total_tokens=completion.total_tokens
+        ))
+
+    @classmethod
+    def get_statistics(cls) -> dict:
+        """
+        Retrieves the cache counters.
+
+        Returns
+        -------
+        dict
+            Returns the number of lookups and hits, the ratio of hits to lookups,
+            the number of tokens saved by hits and the number of cached completions.
+        """
+        with cls._lock:
+            statistics = dict(cls._statistics)
+        statistics['hit_ratio'] = statistics['hits'] / statistics['lookups'] if statistics['lookups'] > 0 else 0.0
+        statistics['entries'] = sum(len(index) for index in cls._indexes.values())
+        return statistics
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all cached completions.
+        """
+        cls._indexes.clear()
+
+    @staticmethod
+    def get_scope(request: KnowledgeManagementCompletionRequest) -> Tuple[Optional[str], str]:
+        """
+        Builds the scope of the cached completions of the agent of the specified request.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request.
+
+        Returns
+        -------
+        Tuple[Optional[str], str]
+            Returns the object id of the agent and a hash of the agent configuration and request settings.
+        """
+        configuration = request.agent.model_dump_json()
+        if request.settings is not None:
+            configuration += request.settings.model_dump_json()
+        return (
+            request.agent.object_id or request.agent.name,
+            hashlib.sha256(configuration.encode('utf-8')).hexdigest()
+        )
+
+    @staticmethod
+    def __get_agent_parameter(request: KnowledgeManagementCompletionRequest, name: str, default):
+        """
+        Retrieves an agent parameter, overridden by the request settings.
+        """
+        value = default
+        agent_parameters = request.agent.orchestration_settings.agent_parameters
+        if agent_parameters is not None and name in agent_parameters:
+            value = agent_parameters[name]
+        if request.settings is not None and request.settings.agent_parameters is not None \
+                and name in request.settings.agent_parameters:
+            value = request.settings.agent_parameters[name]
+        return value
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+class TTLLRUCache:
+    """
+    Thread-safe, size-bounded cache with least-recently-used eviction
+    and a time to live for every entry.
+
+    Entries are stamped with the wall clock time at which they were created,
+    so entries restored from a persisted cache expire at the right time.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initializes a cache.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of entries kept in the cache.
+            The cache stores nothing when set to 0.
+        ttl_seconds : float
+            The number of seconds an entry remains valid after it is created.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._statistics = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indicates whether the cache stores entries.
+        """
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retrieves the value cached for the specified key.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the entry.
+
+        Returns
+        -------
+        Any
+            Returns the cached value, or None if the key is not cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._statistics['misses'] += 1
+                return None
+            created, value = entry
+            if self.__is_expired(created):
+                del self._entries[key]
+                self._statistics['expirations'] += 1
+                self._statistics['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._statistics['hits'] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, created: Optional[float] = None):
+        """
+        Adds or replaces the value cached for the specified key,
+        evicting the least recently used entries when the cache is full.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the entry.
+        value : Any
+            The value to cache.
+        created : float
+            The time at which the value was created, in seconds since the epoch.
+            Defaults to the current time.
+        """
+        if not self.enabled:
+            return
+        created = time.time() if created is None else created
+        if self.__is_expired(created):
+            return
+        with self._lock:
+            self._entries[key] = (created, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._statistics['evictions'] += 1
+
+    def remove(self, key: Hashable):
+        """
+        Removes the entry for the specified key, if it is cached.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the entry.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def remove_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Removes every entry whose key matches the specified predicate.
+
+        Parameters
+        ----------
+        predicate : Callable[[Hashable], bool]
+            Returns True for the keys of the entries to remove.
+
+        Returns
+        -------
+        int
+            Returns the number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def values(self) -> List[Any]:
+        """
+        Retrieves the cached values, including values that have expired
+        but have not been removed yet. Does not affect the eviction order.
+
+        Returns
+        -------
+        List[Any]
+            Returns the cached values.
+        """
+        with self._lock:
+            return [value for _, value in self._entries.values()]
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> dict:
+        """
+        Retrieves the cache counters.
+
+        Returns
+        -------
+        dict
+            Returns the number of entries, hits, misses, evictions and expirations,
+            and the ratio of hits to lookups.
+        """
+        with self._lock:
+            statistics = dict(self._statistics)
+            statistics['entries'] = len(self._entries)
+        lookups = statistics['hits'] + statistics['misses']
+        statistics['hit_ratio'] = statistics['hits'] / lookups if lookups > 0 else 0.0
+        return statistics
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __is_expired(self, created: float) -> bool:
+        """
+        Determines whether an entry created at the specified time has expired.
+        """
+        return time.time() - created >= self.ttl_seconds
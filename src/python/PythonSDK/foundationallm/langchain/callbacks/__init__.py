@@ -0,0 +1 @@
+from .completion_telemetry_callback_handler import CompletionTelemetryCallbackHandler
@@ -0,0 +1,216 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from langchain_core.outputs import LLMResult
+from opentelemetry import trace
+from opentelemetry.trace import Span
+from foundationallm.telemetry import Telemetry
+
+tracer = Telemetry.get_tracer(__name__)
+meter = Telemetry.get_meter(__name__)
+
+stage_duration = meter.create_histogram(
+    'foundationallm.completion.stage.duration',
+    unit='s',
+    description='The duration of each stage of a completion request.'
+)
+token_usage = meter.create_histogram(
+    'foundationallm.completion.tokens',
+    unit='{token}',
+    description='The number of prompt and completion tokens of a completion request.'
+)
+
+"""
+The stages recorded for the LangChain runs of each type.
+"""
+RUN_TYPE_STAGES = {
+    'prompt': 'prompt',
+    'parser': 'output_parsing'
+}
+
+class CompletionTelemetryCallbackHandler(BaseCallbackHandler):
+    """
+    Records a child span and a duration measurement for each stage of a completion request:
+    agent parsing, embedding, search, prompt assembly, the language model call and output parsing.
+
+    The stages executed by the chain are recorded from the LangChain callbacks. Stages that
+    run outside of the chain, such as compiling the agent or embedding the user prompt,
+    are recorded with the stage context manager. Spans are children of the span that was
+    current when the handler was created, or of the span of the enclosing stage.
+
+    A handler records a single completion request and must not be shared between requests.
+    """
+    # Spans are started and ended on the thread that runs the stage, so they are timed accurately.
+    run_inline = True
+
+    def __init__(self, **attributes: Any):
+        """
+        Initializes a handler for the completion request executing in the current context.
+
+        Parameters
+        ----------
+        attributes : Any
+            The attributes added to every span and measurement, such as the agent name.
+            Attributes whose value is None are ignored.
+        """
+        self.attributes: Dict[str, Any] = {}
+        self.set_attributes(**attributes)
+        self._parent = trace.get_current_span()
+        self._runs: Dict[UUID, Tuple[Span, str, float]] = {}
+
+    def set_attributes(self, **attributes: Any):
+        """
+        Adds attributes to the spans and measurements of the stages that have not started yet.
+
+        Parameters
+        ----------
+        attributes : Any
+            The attributes to add, such as the deployment or index name.
+            Attributes whose value is None are ignored.
+        """
+        self.attributes.update({ name: value for name, value in attributes.items() if value is not None })
+
+    @contextmanager
+    def stage(self, stage: str, parent_run_id: Optional[UUID] = None) -> Iterator[Span]:
+        """
+        Records a stage that does not run as part of the chain.
+
+        Parameters
+        ----------
+        stage : str
+            The name of the stage.
+        parent_run_id : UUID
+            The LangChain run during which the stage runs, if any.
+
+        Returns
+        -------
+        Iterator[Span]
+            Yields the span of the stage.
+        """
+        span, _, start = self.__start_stage(stage, parent_run_id)
+        try:
+            yield span
+        except Exception as e:
+            Telemetry.record_exception(span, e)
+            raise
+        finally:
+            self.__end_stage(span, stage, start)
+
+    def record_tokens(self, prompt_tokens: int, completion_tokens: int):
+        """
+        Records the token usage of the completion request.
+
+        Parameters
+        ----------
+        prompt_tokens : int
+            The number of tokens in the prompt.
+        completion_tokens : int
+            The number of tokens in the completion.
+        """
+        self._parent.set_attribute('prompt_tokens', prompt_tokens)
+        self._parent.set_attribute('completion_tokens', completion_tokens)
+        token_usage.record(prompt_tokens, { **self.attributes, 'token_type': 'prompt' })
+        token_usage.record(completion_tokens, { **self.attributes, 'token_type': 'completion' })
+
+    def on_chain_start(
+            self,
+            serialized: Dict[str, Any],
+            inputs: Dict[str, Any],
+            *,
+            run_id: UUID,
+            parent_run_id: Optional[UUID] = None,
+            **kwargs: Any):
+        stage = RUN_TYPE_STAGES.get(kwargs.get('run_type'))
+        if stage is not None:
+            self._runs[run_id] = self.__start_stage(stage, parent_run_id)
+
+    def on_chain_end(self, outputs: Dict[str, Any], *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id, error)
+
+    def on_retriever_start(
+            self,
+            serialized: Dict[str, Any],
+            query: str,
+            *,
+            run_id: UUID,
+            parent_run_id: Optional[UUID] = None,
+            **kwargs: Any):
+        self._runs[run_id] = self.__start_stage('search', parent_run_id)
+
+    def on_retriever_end(self, documents: List[Document], *, run_id: UUID, **kwargs: Any):
+        run = self._runs.get(run_id)
+        if run is not None:
+            run[0].set_attribute('document_count', len(documents))
+        self.__end_run(run_id)
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id, error)
+
+    def on_llm_start(
+            self,
+            serialized: Dict[str, Any],
+            prompts: List[str],
+            *,
+            run_id: UUID,
+            parent_run_id: Optional[UUID] = None,
+            **kwargs: Any):
+        self._runs[run_id] = self.__start_stage('llm', parent_run_id)
+
+    def on_chat_model_start(
+            self,
+            serialized: Dict[str, Any],
+            messages: List[List[Any]],
+            *,
+            run_id: UUID,
+            parent_run_id: Optional[UUID] = None,
+            **kwargs: Any):
+        self._runs[run_id] = self.__start_stage('llm', parent_run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        run = self._runs.get(run_id)
+        # Token usage is not reported by the service for streamed completions.
+        usage = (response.llm_output or {}).get('token_usage') or {}
+        if run is not None and usage:
+            run[0].set_attribute('prompt_tokens', usage.get('prompt_tokens', 0))
+            run[0].set_attribute('completion_tokens', usage.get('completion_tokens', 0))
+        self.__end_run(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id, error)
+
+    def __start_stage(self, stage: str, parent_run_id: Optional[UUID]) -> Tuple[Span, str, float]:
+        """
+        Starts the span of a stage as a child of the span of the enclosing stage, if any.
+        """
+        parent = self._runs.get(parent_run_id)
+        context = trace.set_span_in_context(parent[0] if parent is not None else self._parent)
+        span = tracer.start_span(stage, context=context, attributes=self.attributes)
+        return span, stage, time.perf_counter()
+
+    def __end_stage(self, span: Span, stage: str, start: float, success: bool = True):
+        """
+        Ends the span of a stage and records its duration.
+        """
+        duration = time.perf_counter() - start
+        stage_duration.record(duration, { **self.attributes, 'stage': stage })
+        if stage == 'llm':
+            Telemetry.record_dependency('llm', duration, success)
+        span.end()
+
+    def __end_run(self, run_id: UUID, error: Optional[BaseException] = None):
+        """
+        Ends the stage recorded for a LangChain run, if any.
+        """
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        span, stage, start = run
+        if error is not None:
+            Telemetry.record_exception(span, error)
+        self.__end_stage(span, stage, start, error is None)
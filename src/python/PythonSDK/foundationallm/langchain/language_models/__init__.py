@@ -1,3 +1,4 @@
 """Language model module"""
 from .language_model_base import LanguageModelBase
 from .language_model_factory import LanguageModelFactory
+from .language_model_client_registry import LanguageModelClientRegistry
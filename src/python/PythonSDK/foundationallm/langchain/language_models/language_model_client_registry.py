@@ -0,0 +1,230 @@
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+from langchain_core.language_models import BaseLanguageModel
+from langchain_openai import AzureChatOpenAI, AzureOpenAI, ChatOpenAI, OpenAI
+from foundationallm.config import CredentialManager
+from foundationallm.models.agents import OperationTypes
+from foundationallm.models.authentication import AuthenticationTypes
+from foundationallm.models.language_models import LanguageModelProvider
+from foundationallm.models.orchestration import EndpointSettings
+
+"""
+Model parameters that are sent with each request to the language model.
+These are applied per call instead of being set on the shared client.
+"""
+REQUEST_PARAMETERS = frozenset([
+    'frequency_penalty',
+    'logit_bias',
+    'max_tokens',
+    'n',
+    'presence_penalty',
+    'seed',
+    'stop',
+    'temperature',
+    'top_p',
+    'user'
+])
+
+"""
+Model parameters naming the model served by a non-Azure OpenAI endpoint, in order of precedence.
+The model is set on the client, so it is part of the registry key.
+"""
+MODEL_PARAMETERS = ('model_name', 'model')
+
+class LanguageModelClientRegistry:
+    """
+    Process-wide registry of long-lived language model clients.
+
+    Clients are keyed by provider, endpoint, API version, deployment or model, authentication type
+    and operation type. Each client owns an OpenAI SDK client whose HTTP connection pool
+    is kept alive for the lifetime of the process, so completion requests reuse open
+    TLS connections instead of negotiating new ones.
+
+    Registered clients are shared between requests and must never be mutated.
+    Request-level model parameters are bound at invocation time.
+    """
+    _clients: Dict[Tuple, BaseLanguageModel] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(
+            cls,
+            endpoint_settings: EndpointSettings,
+            deployment_name: Optional[str] = None,
+            model_name: Optional[str] = None) -> BaseLanguageModel:
+        """
+        Retrieves the shared client for the specified endpoint settings,
+        creating it on first use.
+
+        Parameters
+        ----------
+        endpoint_settings : EndpointSettings
+            The settings of the endpoint hosting the language model.
+        deployment_name : str
+            The name of the model deployment. Required for Azure OpenAI.
+        model_name : str
+            The name of the model served by a non-Azure OpenAI endpoint.
+            The default model of the endpoint is used when not specified.
+
+        Returns
+        -------
+        BaseLanguageModel
+            Returns the shared API connector for the language model.
+        """
+        key = cls.__get_key(endpoint_settings, deployment_name, model_name)
+
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = cls.__create_client(endpoint_settings, deployment_name, model_name)
+                cls._clients[key] = client
+        return client
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all registered clients. Clients that are in use by
+        in-flight requests remain valid until those requests complete.
+        """
+        with cls._lock:
+            cls._clients = {}
+
+    @staticmethod
+    def get_request_parameters(*model_parameters: Optional[dict]) -> dict:
+        """
+        Merges the specified model parameters, in order of precedence,
+        and returns the ones that are sent with each request.
+
+        Parameters
+        ----------
+        model_parameters : dict
+            One or more dictionaries of model parameters. Later dictionaries
+            override the values of earlier ones.
+
+        Returns
+        -------
+        dict
+            Returns the request-level model parameters.
+        """
+        parameters = {}
+        for params in model_parameters:
+            if params is None:
+                continue
+            for key, value in params.items():
+                if key in REQUEST_PARAMETERS and value is not None:
+                    parameters[key] = value
+        return parameters
+
+    @staticmethod
+    def get_model_name(*model_parameters: Optional[dict]) -> Optional[str]:
+        """
+        Retrieves the name of the model from the specified model parameters, in order of precedence.
+
+        Parameters
+        ----------
+        model_parameters : dict
+            One or more dictionaries of model parameters. Later dictionaries
+            override the values of earlier ones.
+
+        Returns
+        -------
+        str
+            Returns the name of the model, or None if no model is specified.
+        """
+        model_name = None
+        for params in model_parameters:
+            if params is None:
+                continue
+            for key in MODEL_PARAMETERS:
+                if params.get(key) is not None:
+                    model_name = params[key]
+                    break
+        return model_name
+
+    @staticmethod
+    def __get_key(
+            endpoint_settings: EndpointSettings,
+            deployment_name: Optional[str],
+            model_name: Optional[str]) -> Tuple:
+        """
+        Builds the registry key for the specified endpoint settings.
+        API keys are hashed so a rotated key results in a new client.
+        """
+        api_key_hash = (
+            hashlib.sha256(endpoint_settings.api_key.encode('utf-8')).hexdigest()
+            if endpoint_settings.api_key is not None
+            else None
+        )
+        return (
+            endpoint_settings.provider,
+            endpoint_settings.endpoint,
+            endpoint_settings.api_version,
+            deployment_name,
+            model_name,
+            endpoint_settings.authentication_type,
+            endpoint_settings.operation_type,
+            api_key_hash
+        )
+
+    @staticmethod
+    def __create_client(
+            endpoint_settings: EndpointSettings,
+            deployment_name: Optional[str],
+            model_name: Optional[str]) -> BaseLanguageModel:
+        """
+        Creates a new API connector for the language model.
+        """
+        if endpoint_settings.provider == LanguageModelProvider.MICROSOFT:
+            if deployment_name is None:
+                raise ValueError("Deployment name is required for Azure OpenAI completion requests.")
+
+            if endpoint_settings.authentication_type == AuthenticationTypes.TOKEN:
+                # Use the shared, proactively refreshed Azure AD token provider.
+                token_provider = CredentialManager.get_bearer_token_provider(
+                    'https://cognitiveservices.azure.com/.default'
+                )
+                return (
+                    AzureChatOpenAI(
+                        azure_endpoint=endpoint_settings.endpoint,
+                        api_version=endpoint_settings.api_version,
+                        openai_api_type=endpoint_settings.api_type,
+                        azure_ad_token_provider=token_provider,
+                        azure_deployment=deployment_name
+                    ) if endpoint_settings.operation_type == OperationTypes.CHAT
+                    else AzureOpenAI(
+                        azure_endpoint=endpoint_settings.endpoint,
+                        api_version=endpoint_settings.api_version,
+                        openai_api_type=endpoint_settings.api_type,
+                        azure_ad_token_provider=token_provider,
+                        azure_deployment=deployment_name
+                    )
+                )
+
+            # Key-based authentication
+            return (
+                AzureChatOpenAI(
+                    azure_endpoint=endpoint_settings.endpoint,
+                    api_key=endpoint_settings.api_key,
+                    api_version=endpoint_settings.api_version,
+                    azure_deployment=deployment_name
+                ) if endpoint_settings.operation_type == OperationTypes.CHAT
+                else AzureOpenAI(
+                    azure_endpoint=endpoint_settings.endpoint,
+                    api_key=endpoint_settings.api_key,
+                    api_version=endpoint_settings.api_version,
+                    azure_deployment=deployment_name
+                )
+            )
+
+        # Fall back to the default model of the client when the model is not specified.
+        model = { 'model': model_name } if model_name is not None else {}
+        return (
+            ChatOpenAI(base_url=endpoint_settings.endpoint, api_key=endpoint_settings.api_key, **model)
+            if endpoint_settings.operation_type == OperationTypes.CHAT
+            else OpenAI(base_url=endpoint_settings.endpoint, api_key=endpoint_settings.api_key, **model)
+        )
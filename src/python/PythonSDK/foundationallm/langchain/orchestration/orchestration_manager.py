@@ -1,3 +1,4 @@
+from typing import AsyncIterator, Union
 from foundationallm.config import Configuration, Context
 from foundationallm.langchain.agents import AgentFactory, LangChainAgentBase
 from foundationallm.models.orchestration import (
@@ -58,3 +59,39 @@ class OrchestrationManager:
             Object containing the completion response and token usage details.
         """
         return self.agent.invoke(request)
+
+    async def ainvoke(self, request: CompletionRequestBase) -> CompletionResponse:
+        """
+        Executes a completion request asynchronously against the LanguageModel using 
+        the LangChain agent assembled by the OrchestrationManager.
+        
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+            
+        Returns
+        -------
+        CompletionResponse
+            Object containing the completion response and token usage details.
+        """
+        return await self.agent.ainvoke(request)
+
+    def astream(self, request: CompletionRequestBase) -> AsyncIterator[Union[str, CompletionResponse]]:
+        """
+        Executes a completion request asynchronously against the LanguageModel using 
+        the LangChain agent assembled by the OrchestrationManager,
+        streaming the completion tokens as they are generated.
+        
+        Parameters
+        ----------
+        request : CompletionRequestBase
+            The completion request to execute.
+            
+        Returns
+        -------
+        AsyncIterator[Union[str, CompletionResponse]]
+            Yields the completion tokens as they arrive, followed by an object
+            containing the completion response and token usage details.
+        """
+        return self.agent.astream(request)
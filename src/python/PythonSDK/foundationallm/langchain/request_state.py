@@ -0,0 +1,76 @@
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, ContextManager, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.documents import Document
+from langchain_core.prompt_values import PromptValue
+
+if TYPE_CHECKING:
+    from foundationallm.langchain.callbacks import CompletionTelemetryCallbackHandler
+
+class RequestState:
+    """
+    State of the completion request being executed in the current context.
+
+    Agents, chains and retrievers are shared between concurrent requests, so anything
+    recorded while a request executes is kept here instead of on those objects.
+    The state lives in a context variable. Tasks and worker threads started by LangChain
+    copy the context, and so share the state object of the request that started them.
+    """
+    _current: ContextVar[Optional['RequestState']] = ContextVar('foundationallm_request_state', default=None)
+
+    def __init__(self):
+        self.full_prompt: Optional[PromptValue] = None
+        self.search_results: List[Tuple[str, Document]] = [] # Tuple of document id and document
+        self.telemetry: Optional['CompletionTelemetryCallbackHandler'] = None
+
+    @classmethod
+    def start(cls) -> 'RequestState':
+        """
+        Starts a new request in the current context.
+
+        Returns
+        -------
+        RequestState
+            Returns the state of the new request.
+        """
+        state = RequestState()
+        cls._current.set(state)
+        return state
+
+    @classmethod
+    def get(cls) -> 'RequestState':
+        """
+        Retrieves the state of the request executing in the current context,
+        starting a new request if none is executing.
+
+        Returns
+        -------
+        RequestState
+            Returns the state of the current request.
+        """
+        state = cls._current.get()
+        if state is None:
+            state = cls.start()
+        return state
+
+    def stage(self, stage: str, parent_run_id: Optional[UUID] = None) -> ContextManager:
+        """
+        Records a stage of the request that does not run as part of the chain,
+        if the request records its stages.
+
+        Parameters
+        ----------
+        stage : str
+            The name of the stage.
+        parent_run_id : UUID
+            The LangChain run during which the stage runs, if any.
+
+        Returns
+        -------
+        ContextManager
+            Returns a context manager that records the stage while it is entered.
+        """
+        if self.telemetry is None:
+            return nullcontext()
+        return self.telemetry.stage(stage, parent_run_id)
@@ -1,4 +1,5 @@
 from .citation_retrieval_base import CitationRetrievalBase
 from .azure_ai_search_service_retriever import AzureAISearchServiceRetriever
 from .search_service_filter_retriever import SearchServiceFilterRetriever
+from .search_client_pool import SearchClientPool
 from .retriever_factory import RetrieverFactory
@@ -11,12 +11,15 @@ from langchain_core.callbacks import (
 )
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
-from azure.search.documents import SearchClient
 from azure.search.documents.models import VectorizedQuery
-from azure.core.credentials import AzureKeyCredential
-from azure.identity import DefaultAzureCredential
+from azure.core.credentials import AzureKeyCredential, TokenCredential
+from azure.core.credentials_async import AsyncTokenCredential
+from foundationallm.langchain.cache import QueryEmbeddingCache, RetrievalResultCache
+from foundationallm.langchain.request_state import RequestState
 from foundationallm.models.orchestration import Citation
+from foundationallm.telemetry import Telemetry
 from .citation_retrieval_base import CitationRetrievalBase
+from .search_client_pool import SearchClientPool
 
 class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
     """
@@ -31,6 +34,7 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
         metadata_field_name -> str -> name of the field containing the JSON metadata as a string
         filters: str -> Azure AI Search filter expression
         credential: AzureKeyCredential -> Azure AI Search credential
+        async_credential: AsyncTokenCredential -> Azure AI Search credential for asynchronous searches
         embedding_model: OpenAIEmbeddings -> OpenAIEmbeddings model
 
     Searches embedding and text fields in the index for the top_n most relevant documents.
@@ -54,15 +58,22 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
     id_field_name: Optional[str] = "Id"
     metadata_field_name: Optional[str] = "AdditionalMetadata"
     filters: Optional[str] = None
-    credential: Union[AzureKeyCredential, DefaultAzureCredential] = None
+    credential: Union[AzureKeyCredential, TokenCredential] = None
+    async_credential: Optional[Union[AzureKeyCredential, AsyncTokenCredential]] = None
     embedding_model: OpenAIEmbeddings
-    search_results: Optional[Tuple[str, Document]] = [] # Tuple of document id and document
 
     def __get_embeddings(self, text: str) -> List[float]:
         """
         Returns embeddings vector for a given text.
         """
-        embedding = self.embedding_model.embed_query(text)        
+        embedding = QueryEmbeddingCache.get_embedding(self.embedding_model, text)
+        return embedding
+
+    async def __aget_embeddings(self, text: str) -> List[float]:
+        """
+        Returns embeddings vector for a given text asynchronously.
+        """
+        embedding = await QueryEmbeddingCache.aget_embedding(self.embedding_model, text)
         return embedding
 
     def _get_relevant_documents(
@@ -71,47 +82,106 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
         """
         Performs a synchronous hybrid search on Azure AI Search index        
         """        
-        search_client = SearchClient(self.endpoint, self.index_name, self.credential)        
-        vector_query = VectorizedQuery(vector=self.__get_embeddings(query),
-                                        k_nearest_neighbors=3,
-                                        fields=self.embedding_field_name)
+        state = RequestState.get()
+        cache_key = self.__get_cache_key(query)
+        cached_results = RetrievalResultCache.get_results(cache_key)
+        if cached_results is not None:
+            state.search_results = cached_results
+            return [doc for _, doc in cached_results]
 
-        results = search_client.search(
-            search_text=query,
-            filter=self.filters,
-            vector_queries=[vector_query],
-            top=self.top_n,
-            select=[self.id_field_name, self.text_field_name, self.metadata_field_name]
-        )
-        self.search_results.clear()
-        for result in results:
-            metadata = json.loads(result[self.metadata_field_name]) if self.metadata_field_name in result else {}
-            document = Document(
-                    page_content=result[self.text_field_name],
-                    metadata=metadata                                        
+        with state.stage('embedding', run_manager.run_id):
+            embedding = self.__get_embeddings(query)
+        search_client = SearchClientPool.get_client(self.endpoint, self.index_name, self.credential)
+        with Telemetry.track_dependency('search'):
+            results = search_client.search(
+                **self.__get_search_parameters(query, embedding)
             )
-            self.search_results.append((result[self.id_field_name], document))
-        return [doc for _, doc in self.search_results]
+            search_results = [self.__get_search_result(result) for result in results]
+        state.search_results = search_results
+        RetrievalResultCache.set_results(cache_key, search_results)
+        return [doc for _, doc in search_results]
 
     async def _aget_relevant_documents(
         self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
     ) -> List[Document]:
         """
         Performs an asynchronous hybrid search on Azure AI Search index
-        NOTE: This functionality is not currently supported in the underlying Azure SDK.
         """
-        raise Exception(f"Asynchronous search not supported.")
+        credential = self.async_credential
+        if credential is None and isinstance(self.credential, AzureKeyCredential):
+            credential = self.credential
+        if credential is None:
+            raise ValueError('An asynchronous credential is required for asynchronous searches.')
+
+        state = RequestState.get()
+        cache_key = self.__get_cache_key(query)
+        cached_results = RetrievalResultCache.get_results(cache_key)
+        if cached_results is not None:
+            state.search_results = cached_results
+            return [doc for _, doc in cached_results]
+
+        with state.stage('embedding', run_manager.run_id):
+            embedding = await self.__aget_embeddings(query)
+        search_client = SearchClientPool.get_async_client(self.endpoint, self.index_name, credential)
+        with Telemetry.track_dependency('search'):
+            results = await search_client.search(
+                **self.__get_search_parameters(query, embedding)
+            )
+            search_results = [self.__get_search_result(result) async for result in results]
+        state.search_results = search_results
+        RetrievalResultCache.set_results(cache_key, search_results)
+        return [doc for _, doc in search_results]
+
+    def __get_search_parameters(self, query: str, embedding: List[float]) -> dict:
+        """
+        Returns the parameters of the hybrid search for a given query and its embeddings vector.
+        """
+        vector_query = VectorizedQuery(vector=embedding,
+                                        k_nearest_neighbors=3,
+                                        fields=self.embedding_field_name)
+        return {
+            'search_text': query,
+            'filter': self.filters,
+            'vector_queries': [vector_query],
+            'top': self.top_n,
+            'select': [self.id_field_name, self.text_field_name, self.metadata_field_name]
+        }
+
+    def __get_cache_key(self, query: str) -> tuple:
+        """
+        Returns the key of the retrieval cache entry for a given query.
+        """
+        return RetrievalResultCache.get_key(
+            self.endpoint,
+            self.index_name,
+            self.filters,
+            self.top_n,
+            (self.embedding_field_name, self.id_field_name, self.text_field_name, self.metadata_field_name),
+            query
+        )
+
+    def __get_search_result(self, result: dict) -> Tuple[str, Document]:
+        """
+        Converts a search result into a tuple of document id and document.
+        """
+        metadata = json.loads(result[self.metadata_field_name]) if self.metadata_field_name in result else {}
+        document = Document(
+                page_content=result[self.text_field_name],
+                metadata=metadata
+        )
+        return (result[self.id_field_name], document)
 
     def get_document_citations(self) -> List[Citation]:
         """
-        Gets sources from the documents retrieved from the retriever.
+        Gets sources from the documents retrieved from the retriever
+        for the current completion request.
   
         Returns:
             List of citations from the retrieved documents.
         """
         citations = []
         added_ids = set()  # Avoid duplicates
-        for result_id, result in self.search_results:  # Unpack the tuple
+        for result_id, result in RequestState.get().search_results:  # Unpack the tuple
             metadata = result.metadata
             if metadata is not None and 'multipart_id' in metadata and metadata['multipart_id']:
                 if result_id not in added_ids:          
@@ -1,7 +1,6 @@
 from typing import Optional
-from azure.identity import DefaultAzureCredential
 from langchain_core.retrievers import BaseRetriever
-from foundationallm.config import Configuration
+from foundationallm.config import Configuration, CredentialManager
 from foundationallm.langchain.language_models.openai import OpenAIModel
 from foundationallm.models.orchestration import OrchestrationSettings
 from foundationallm.models.language_models import EmbeddingModel, LanguageModelType, LanguageModelProvider
@@ -62,8 +61,10 @@ class RetrieverFactory:
         
         credential_type = self.config.get_value(self.indexing_profile.configuration_references.authentication_type)
         credential = None
+        async_credential = None
         if credential_type == "AzureIdentity":            
-            credential = DefaultAzureCredential(exclude_environment_credential=True)
+            credential = CredentialManager.get_credential()
+            async_credential = CredentialManager.get_async_credential()
         # NOTE: Support for all other authentication types has been removed.
 
         # defaults for agent parameters
@@ -86,7 +87,8 @@ class RetrieverFactory:
             id_field_name = self.indexing_profile.settings.id_field_name,
             metadata_field_name = self.indexing_profile.settings.metadata_field_name,
             filters = filters,
-            credential = credential,            
+            credential = credential,
+            async_credential = async_credential,
             embedding_model = embedding_model
         )
         return retriever
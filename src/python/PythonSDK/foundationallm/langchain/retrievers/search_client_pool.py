@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Dict, Tuple, Union
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.credentials import AzureKeyCredential, TokenCredential
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
+from foundationallm.config.credential_manager import (
+    AsyncCachedTokenCredential,
+    CachedTokenCredential
+)
+
+"""
+The maximum number of connections kept open to each Azure AI Search endpoint.
+"""
+CONNECTION_POOL_SIZE = 100
+
+class SearchClientPool:
+    """
+    Process-wide pool of Azure AI Search clients.
+
+    Clients are keyed by endpoint, index name and credential and are shared by every
+    retriever that targets the same index. All synchronous clients send requests through
+    a single HTTP session and all asynchronous clients running on the same event loop
+    share a single aiohttp session, so searches reuse open TLS connections instead of
+    negotiating new ones.
+
+    Pooled clients are owned by the pool and must never be closed by callers.
+    """
+    _clients: Dict[Tuple, SearchClient] = {}
+    _session: requests.Session = None
+    _async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, AsyncSearchClient]]' = weakref.WeakKeyDictionary()
+    _async_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]' = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(
+            cls,
+            endpoint: str,
+            index_name: str,
+            credential: Union[AzureKeyCredential, TokenCredential]) -> SearchClient:
+        """
+        Retrieves the shared search client for the specified index,
+        creating it on first use.
+
+        Parameters
+        ----------
+        endpoint : str
+            The Azure AI Search endpoint.
+        index_name : str
+            The name of the index to search.
+        credential : Union[AzureKeyCredential, TokenCredential]
+            The credential used to authenticate with Azure AI Search.
+
+        Returns
+        -------
+        SearchClient
+            Returns the shared search client.
+        """
+        key = cls.__get_key(endpoint, index_name, credential)
+
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                if cls._session is None:
+                    cls._session = cls.__create_session()
+                client = SearchClient(
+                    endpoint,
+                    index_name,
+                    credential,
+                    transport=RequestsTransport(session=cls._session, session_owner=False)
+                )
+                cls._clients[key] = client
+        return client
+
+    @classmethod
+    def get_async_client(
+            cls,
+            endpoint: str,
+            index_name: str,
+            credential: Union[AzureKeyCredential, AsyncTokenCredential]) -> AsyncSearchClient:
+        """
+        Retrieves the shared asynchronous search client for the specified index
+        on the running event loop, creating it on first use.
+
+        Parameters
+        ----------
+        endpoint : str
+            The Azure AI Search endpoint.
+        index_name : str
+            The name of the index to search.
+        credential : Union[AzureKeyCredential, AsyncTokenCredential]
+            The credential used to authenticate with Azure AI Search.
+
+        Returns
+        -------
+        AsyncSearchClient
+            Returns the shared asynchronous search client.
+        """
+        # aiohttp sessions are bound to the event loop they were created on.
+        loop = asyncio.get_running_loop()
+        key = cls.__get_key(endpoint, index_name, credential)
+
+        clients = cls._async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = AsyncSearchClient(
+                endpoint,
+                index_name,
+                credential,
+                transport=AioHttpTransport(session=cls.__get_async_session(loop), session_owner=False)
+            )
+            clients[key] = client
+        return client
+
+    @classmethod
+    async def open(cls):
+        """
+        Creates the shared HTTP sessions ahead of the first search.
+        The asynchronous session is created for the running event loop.
+        """
+        with cls._lock:
+            if cls._session is None:
+                cls._session = cls.__create_session()
+        cls.__get_async_session(asyncio.get_running_loop())
+
+    @classmethod
+    def is_open(cls) -> bool:
+        """
+        Indicates whether the shared HTTP sessions are open on the running event loop.
+
+        Returns
+        -------
+        bool
+            Returns True if both the synchronous and the asynchronous sessions are open.
+        """
+        session = cls._async_sessions.get(asyncio.get_running_loop())
+        return cls._session is not None and session is not None and not session.closed
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all pooled clients. Clients that are in use by
+        in-flight requests remain valid until those requests complete.
+        """
+        with cls._lock:
+            cls._clients = {}
+            cls._async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    async def aclose(cls):
+        """
+        Closes the shared HTTP sessions and removes all pooled clients.
+        Called when the application shuts down.
+        """
+        loop = asyncio.get_running_loop()
+        session = cls._async_sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+            cls._clients = {}
+            cls._async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def __get_async_session(cls, loop: asyncio.AbstractEventLoop) -> aiohttp.ClientSession:
+        """
+        Retrieves the aiohttp session shared by the asynchronous clients on the specified event loop,
+        creating it on first use.
+        """
+        session = cls._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=CONNECTION_POOL_SIZE),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                auto_decompress=False
+            )
+            cls._async_sessions[loop] = session
+        return session
+
+    @staticmethod
+    def __get_key(
+            endpoint: str,
+            index_name: str,
+            credential: Union[AzureKeyCredential, TokenCredential, AsyncTokenCredential]) -> Tuple:
+        """
+        Builds the pool key for the specified index and credential.
+        API keys are hashed so a rotated key results in a new client.
+        """
+        if isinstance(credential, AzureKeyCredential):
+            credential_key = ('key', hashlib.sha256(credential.key.encode('utf-8')).hexdigest())
+        elif isinstance(credential, (CachedTokenCredential, AsyncCachedTokenCredential)):
+            # Every instance is backed by the shared CredentialManager token cache.
+            credential_key = ('shared', type(credential).__name__)
+        else:
+            credential_key = ('instance', id(credential))
+        return (endpoint, index_name, credential_key)
+
+    @staticmethod
+    def __create_session() -> requests.Session:
+        """
+        Creates the HTTP session shared by all synchronous clients.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
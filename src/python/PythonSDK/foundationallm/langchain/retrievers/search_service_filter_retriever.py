@@ -2,6 +2,7 @@
 Class: SearchServiceRetriever
 Description: LangChain retriever for Azure AI Search.
 """
+import logging
 from typing import List, Optional
 
 from langchain_openai import OpenAIEmbeddings , AzureOpenAIEmbeddings
@@ -12,9 +13,10 @@ from langchain_core.callbacks import (
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 
-from azure.search.documents import SearchClient
 from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
+from foundationallm.langchain.cache import QueryEmbeddingCache
+from .search_client_pool import SearchClientPool
 
 class SearchServiceFilterRetriever(BaseRetriever):
     """
@@ -58,7 +60,7 @@ class SearchServiceFilterRetriever(BaseRetriever):
         """
         Returns embeddings vector for a given text.
         """
-        embedding = self.embedding_model.embed_query(text)
+        embedding = QueryEmbeddingCache.get_embedding(self.embedding_model, text)
         return embedding
 
     def _get_relevant_documents(
@@ -70,17 +72,19 @@ class SearchServiceFilterRetriever(BaseRetriever):
 
         results_list = []
 
-        search_client = SearchClient(self.endpoint, self.index_name, self.credential)
+        embedding = self.__get_embeddings(query)
+
+        search_client = SearchClientPool.get_client(self.endpoint, self.index_name, self.credential)
 
         for filter in self.filters:
 
             try:
-                vector_query = VectorizedQuery(vector=self.__get_embeddings(query),
+                vector_query = VectorizedQuery(vector=embedding,
                                                 k_nearest_neighbors=3,
                                                 fields=self.embedding_field_name)
 
                 if (filter == "search.ismatch('*', 'metadata', 'simple', 'all')"):
-                        results = search_client.search(
+                    results = search_client.search(
                         search_text=query,
                         vector_queries=[vector_query],
                         top=self.top_n,
@@ -96,15 +100,16 @@ class SearchServiceFilterRetriever(BaseRetriever):
                     )
 
                 for result in results:
-                    try:
-                        results_list.append(Document(
-                            page_content=result[self.text_field_name]
-                        ))
-                    except Exception as e:
-                        print(e)
+                    if self.text_field_name not in result:
+                        logging.warning(f'Skipping a search result of index {self.index_name} without the {self.text_field_name} field.')
+                        continue
+                    results_list.append(Document(
+                        page_content=result[self.text_field_name]
+                    ))
 
             except Exception as e:
-                print(e)
+                logging.error(f'The search of index {self.index_name} with filter {filter} failed: {e}')
+                raise
 
             if ( filter == "search.ismatch('*', 'metadata', 'simple', 'all')"):
                 break
@@ -116,6 +121,50 @@ class SearchServiceFilterRetriever(BaseRetriever):
     ) -> List[Document]:
         """
         Performs an asynchronous hybrid search on Azure AI Search index
-        NOTE: This functionality is not currently supported in the underlying Azure SDK.
         """
-        raise Exception(f"Asynchronous search not supported.")
+
+        results_list = []
+
+        embedding = await QueryEmbeddingCache.aget_embedding(self.embedding_model, query)
+
+        search_client = SearchClientPool.get_async_client(self.endpoint, self.index_name, self.credential)
+
+        for filter in self.filters:
+
+            try:
+                vector_query = VectorizedQuery(vector=embedding,
+                                                k_nearest_neighbors=3,
+                                                fields=self.embedding_field_name)
+
+                if (filter == "search.ismatch('*', 'metadata', 'simple', 'all')"):
+                    results = await search_client.search(
+                        search_text=query,
+                        vector_queries=[vector_query],
+                        top=self.top_n,
+                        select=[self.text_field_name]
+                    )
+                else:
+                    results = await search_client.search(
+                        search_text=query,
+                        filter=filter,
+                        vector_queries=[vector_query],
+                        top=self.top_n,
+                        select=[self.text_field_name]
+                    )
+
+                async for result in results:
+                    if self.text_field_name not in result:
+                        logging.warning(f'Skipping a search result of index {self.index_name} without the {self.text_field_name} field.')
+                        continue
+                    results_list.append(Document(
+                        page_content=result[self.text_field_name]
+                    ))
+
+            except Exception as e:
+                logging.error(f'The search of index {self.index_name} with filter {filter} failed: {e}')
+                raise
+
+            if ( filter == "search.ismatch('*', 'metadata', 'simple', 'all')"):
+                break
+
+        return results_list
@@ -4,6 +4,7 @@ from langchain_community.tools.sql_database.tool import BaseSQLDatabaseTool
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.pydantic_v1 import Field
 from langchain_core.tools import BaseTool
+from foundationallm.telemetry import Telemetry
 
 class SecureSQLDatabaseQueryTool(BaseSQLDatabaseTool, BaseTool):
     """Tool for querying a SQL database."""
@@ -40,4 +41,5 @@ class SecureSQLDatabaseQueryTool(BaseSQLDatabaseTool, BaseTool):
         else:
             query = query
 
-        return self.db.run_no_throw(query)
+        with Telemetry.track_dependency('sql'):
+            return self.db.run_no_throw(query)
@@ -5,3 +5,4 @@ from .orchestration_settings import OrchestrationSettings
 from .completion_request_base import CompletionRequestBase
 from .completion_response import CompletionResponse
 from .endpoint_settings import EndpointSettings
+from .batch_completion_result import BatchCompletionResult
@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel
+from .completion_response import CompletionResponse
+
+class BatchCompletionResult(BaseModel):
+    """
+    Result of one completion request of a batch.
+    """
+    index: int # position of the request in the batch
+    request_id: Optional[str] = None
+    status_code: int = 200
+    response: Optional[CompletionResponse] = None
+    error: Optional[str] = None
@@ -1,8 +1,9 @@
 from io import BytesIO
 import fnmatch
 from azure.storage.blob import BlobServiceClient
+from foundationallm.config import CredentialManager
 from foundationallm.storage import StorageManagerBase
-from azure.identity import DefaultAzureCredential
+from foundationallm.telemetry import Telemetry
 
 class BlobStorageManager(StorageManagerBase):
     """
@@ -23,7 +24,7 @@ class BlobStorageManager(StorageManagerBase):
         if authentication_type == 'AzureIdentity':
             if account_name is None or account_name == '':
                 raise ValueError('The account_name parameter must be set to a valid account name.')
-            credential = DefaultAzureCredential(exclude_environment_credential=True)
+            credential = CredentialManager.get_credential()
             blob_service_client = BlobServiceClient(account_url=f"https://{account_name}.blob.core.windows.net", credential=credential)
         else:
             if blob_connection_string is None or blob_connection_string == '':
@@ -95,7 +96,8 @@ class BlobStorageManager(StorageManagerBase):
         """
         full_path = self.__get_full_path(path)
         blob = self.blob_container_client.get_blob_client(full_path)
-        return blob.exists()
+        with Telemetry.track_dependency('blob'):
+            return blob.exists()
 
     def read_file_content(self, path, read_into_stream=True) -> bytes:
         """
@@ -116,14 +118,15 @@ class BlobStorageManager(StorageManagerBase):
         """
         if self.file_exists(path):
             full_path = self.__get_full_path(path)
-            if read_into_stream:
-                blob = self.blob_container_client.get_blob_client(full_path)
-                stream = BytesIO()
-                blob.download_blob().readinto(stream)
-                return stream.getvalue()
-            else:
-                blob = self.blob_container_client.download_blob(full_path)
-                return blob.content_as_bytes()
+            with Telemetry.track_dependency('blob'):
+                if read_into_stream:
+                    blob = self.blob_container_client.get_blob_client(full_path)
+                    stream = BytesIO()
+                    blob.download_blob().readinto(stream)
+                    return stream.getvalue()
+                else:
+                    blob = self.blob_container_client.download_blob(full_path)
+                    return blob.content_as_bytes()
         else:
             return None
 
@@ -145,7 +148,8 @@ class BlobStorageManager(StorageManagerBase):
         """
         full_path = self.__get_full_path(path)
         blob = self.blob_container_client.get_blob_client(full_path)
-        blob.upload_blob(content, overwrite=overwrite, lease=lease)
+        with Telemetry.track_dependency('blob'):
+            blob.upload_blob(content, overwrite=overwrite, lease=lease)
 
     def delete_file(self, path):
         """
@@ -157,4 +161,5 @@ class BlobStorageManager(StorageManagerBase):
             The path to the blob to be deleted.
         """
         full_path = self.__get_full_path(path)
-        self.blob_container_client.delete_blob(full_path, delete_snapshots='include')
+        with Telemetry.track_dependency('blob'):
+            self.blob_container_client.delete_blob(full_path, delete_snapshots='include')
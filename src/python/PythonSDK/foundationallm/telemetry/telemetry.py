@@ -1,13 +1,43 @@
+import asyncio
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 from azure.monitor.opentelemetry import configure_azure_monitor
-from opentelemetry import trace
+from azure.monitor.opentelemetry.exporter import AzureMonitorMetricExporter
+from opentelemetry import metrics, trace
+from opentelemetry.exporter.prometheus import PrometheusMetricReader
+from opentelemetry.metrics import CallbackOptions, Meter, Observation
+from opentelemetry.sdk.metrics import Histogram, MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+from opentelemetry.sdk.resources import Resource
 from opentelemetry.trace import Span, Status, StatusCode, Tracer
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from foundationallm.config import Configuration
 
+"""
+The number of seconds between measurements of the event loop lag.
+"""
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 1.0
+
+"""
+The bucket boundaries of the histograms of durations measured in seconds.
+The default boundaries are meant for durations measured in milliseconds.
+"""
+SECONDS_HISTOGRAM_BOUNDARIES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
 class Telemetry:
     """
     Manages logging and the recording of application telemetry.
+
+    Metrics are recorded with the OpenTelemetry metrics SDK. They are exported to Azure Monitor
+    and exposed in the Prometheus text format, to be scraped from the /metrics endpoint of each API.
     """
+    _metrics_configured = False
+    _cache_statistics: Dict[str, Callable[[], dict]] = {}
+    _lock = threading.Lock()
 
     @staticmethod
     def configure_monitoring(config: Configuration, telemetry_connection_string: str):
@@ -22,10 +52,120 @@ class Telemetry:
         telemetry_connection_string : str
             The connection string used to connect to Azure Application Insights.
         """
+        connection_string = config.get_value(telemetry_connection_string)
+        # Metrics are configured separately, so they can also be exposed to Prometheus.
         configure_azure_monitor(
-            connection_string=config.get_value(telemetry_connection_string),
-            disable_offline_storage=True
+            connection_string=connection_string,
+            disable_offline_storage=True,
+            disable_metrics=True
         )
+        Telemetry.configure_metrics(connection_string)
+
+    @staticmethod
+    def configure_metrics(telemetry_connection_string: Optional[str] = None):
+        """
+        Configures the OpenTelemetry meter provider, exposing metrics to Prometheus and,
+        if a connection string is specified, sending them to Azure Monitor.
+        Metrics are only configured once per process.
+
+        Parameters
+        ----------
+        telemetry_connection_string : str
+            The connection string used to connect to Azure Application Insights.
+        """
+        with Telemetry._lock:
+            if Telemetry._metrics_configured:
+                return
+            readers = [PrometheusMetricReader()]
+            if telemetry_connection_string is not None:
+                readers.append(PeriodicExportingMetricReader(
+                    AzureMonitorMetricExporter(connection_string=telemetry_connection_string)))
+            views = [
+                View(
+                    instrument_type=Histogram,
+                    instrument_unit='s',
+                    aggregation=ExplicitBucketHistogramAggregation(SECONDS_HISTOGRAM_BOUNDARIES))
+            ]
+            metrics.set_meter_provider(MeterProvider(metric_readers=readers, resource=Resource.create(), views=views))
+            Telemetry._metrics_configured = True
+
+    @staticmethod
+    def generate_metrics() -> Tuple[bytes, str]:
+        """
+        Renders the current value of every metric in the Prometheus text format.
+
+        Returns
+        -------
+        Tuple[bytes, str]
+            Returns the metrics and their content type.
+        """
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+    @staticmethod
+    @contextmanager
+    def track_dependency(dependency: str) -> Iterator[None]:
+        """
+        Records the duration of a call to a downstream dependency while the context is entered.
+
+        Parameters
+        ----------
+        dependency : str
+            The name of the dependency, such as llm, embedding, search, blob or sql.
+        """
+        start = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            Telemetry.record_dependency(dependency, time.perf_counter() - start, success)
+
+    @staticmethod
+    def record_dependency(dependency: str, duration: float, success: bool = True):
+        """
+        Records the duration of a call to a downstream dependency.
+
+        Parameters
+        ----------
+        dependency : str
+            The name of the dependency, such as llm, embedding, search, blob or sql.
+        duration : float
+            The duration of the call, in seconds.
+        success : bool
+            Whether the call succeeded.
+        """
+        dependency_duration.record(duration, { 'dependency': dependency, 'success': success })
+
+    @staticmethod
+    def add_cache_statistics(name: str, get_statistics: Callable[[], dict]):
+        """
+        Registers a cache whose hit ratio is reported by the foundationallm.cache.hit_ratio gauge.
+
+        Parameters
+        ----------
+        name : str
+            The name of the cache.
+        get_statistics : Callable[[], dict]
+            Retrieves the cache counters, including the hit_ratio.
+        """
+        Telemetry._cache_statistics[name] = get_statistics
+
+    @staticmethod
+    async def monitor_event_loop(interval: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        """
+        Measures how late the running event loop resumes a task, until cancelled.
+        A growing lag means the event loop is saturated or blocked by synchronous work.
+
+        Parameters
+        ----------
+        interval : float
+            The number of seconds between measurements.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            event_loop_lag.record(max(loop.time() - start - interval, 0))
 
     @staticmethod
     def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -65,6 +205,23 @@ class Telemetry:
         """
         return trace.get_tracer(name)
 
+    @staticmethod
+    def get_meter(name: str) -> Meter:
+        """
+        Creates an OpenTelemetry meter with the specified name.
+
+        Parameters
+        ----------
+        name : str
+            The name to assign to the meter.
+
+        Returns
+        -------
+        Meter
+            Returns an OpenTelemetry meter for creating metric instruments.
+        """
+        return metrics.get_meter(name)
+
     @staticmethod
     def record_exception(span: Span, ex: Exception):
         """
@@ -79,3 +236,27 @@ class Telemetry:
         """
         span.set_status(Status(StatusCode.ERROR))
         span.record_exception(ex)
+
+def observe_cache_hit_ratios(options: CallbackOptions) -> Iterable[Observation]:
+    """
+    Reports the hit ratio of each registered cache.
+    """
+    for name, get_statistics in list(Telemetry._cache_statistics.items()):
+        yield Observation(get_statistics().get('hit_ratio', 0.0), { 'cache': name })
+
+meter = Telemetry.get_meter(__name__)
+dependency_duration = meter.create_histogram(
+    'foundationallm.dependency.duration',
+    unit='s',
+    description='The duration of calls to downstream dependencies.'
+)
+event_loop_lag = meter.create_histogram(
+    'foundationallm.event_loop.lag',
+    unit='s',
+    description='How late the event loop resumes a task that is ready to run.'
+)
+meter.create_observable_gauge(
+    'foundationallm.cache.hit_ratio',
+    callbacks=[observe_cache_hit_ratios],
+    description='The ratio of hits to lookups of each cache.'
+)
@@ -0,0 +1,38 @@
+import pytest
+from foundationallm.integration.config import Configuration
+from foundationallm.integration.config import configuration as configuration_module
+
+class LoadedSettings(dict):
+    """
+    Settings returned in place of the Azure App Configuration provider.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+class ConfigurationRefreshTests:
+    """
+    ConfigurationRefreshTests is responsible for testing that the configuration settings
+    are loaded once and replaced by a refresh.
+    """
+    def test_settings_are_loaded_once_and_refreshed(self, monkeypatch):
+        loads = []
+        def load(**kwargs):
+            loads.append(kwargs)
+            return LoadedSettings({'FoundationaLLM:APIs:GatekeeperIntegrationAPI:APIKey': f'Key{len(loads)}'})
+        monkeypatch.setenv('foundationallm-app-configuration-uri', 'https://test.azconfig.io')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS', '0')
+        monkeypatch.setattr(configuration_module, 'load', load)
+        monkeypatch.setattr(configuration_module, 'DefaultAzureCredential', lambda **kwargs: object())
+
+        config = Configuration()
+        for _ in range(3):
+            assert config.get_value('FoundationaLLM:APIs:GatekeeperIntegrationAPI:APIKey') == 'Key1'
+        assert len(loads) == 1
+
+        config.refresh().result(5)
+        assert config.get_value('FoundationaLLM:APIs:GatekeeperIntegrationAPI:APIKey') == 'Key2'
+        with pytest.raises(KeyError):
+            config.get_value('FoundationaLLM:APIs:GatekeeperIntegrationAPI:Missing')
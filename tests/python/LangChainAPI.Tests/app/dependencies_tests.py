@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app import dependencies
+
+class FakeConfig:
+    """
+    Fake configuration returning the configured values and raising the configured errors.
+    """
+    def __init__(self, values: dict):
+        self.snapshot = object()
+        self.values = values
+        self.reads = 0
+
+    async def aget_value(self, key: str) -> str:
+        self.reads += 1
+        value = self.values.get(key)
+        if value is None:
+            raise KeyError(f'The configuration variable {key} was not found.')
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+@pytest.fixture
+def use_config(monkeypatch):
+    def use(values: dict) -> FakeConfig:
+        config = FakeConfig(values)
+        monkeypatch.setattr(dependencies, 'get_config', lambda: config)
+        monkeypatch.setattr(dependencies, '__api_keys', (None, []))
+        return config
+    return use
+
+class DependenciesTests:
+    """
+    DependenciesTests is responsible for testing the API keys accepted by the API.
+    """
+    def test_secondary_key_is_optional(self, use_config):
+        config = use_config({'FoundationaLLM:APIs:LangChainAPI:APIKey': 'primary'})
+        assert asyncio.run(dependencies.get_api_keys()) == [b'primary']
+        assert asyncio.run(dependencies.get_api_keys()) == [b'primary']
+        assert config.reads == 2
+
+    def test_secondary_key_is_accepted(self, use_config):
+        use_config({
+            'FoundationaLLM:APIs:LangChainAPI:APIKey': 'primary',
+            'FoundationaLLM:APIs:LangChainAPI:SecondaryAPIKey': 'secondary'
+        })
+        assert asyncio.run(dependencies.get_api_keys()) == [b'primary', b'secondary']
+
+    def test_failed_secondary_key_lookup_is_raised_and_not_cached(self, use_config):
+        config = use_config({
+            'FoundationaLLM:APIs:LangChainAPI:APIKey': 'primary',
+            'FoundationaLLM:APIs:LangChainAPI:SecondaryAPIKey': ConnectionError('Key Vault is unavailable.')
+        })
+        with pytest.raises(ConnectionError):
+            asyncio.run(dependencies.get_api_keys())
+
+        config.values['FoundationaLLM:APIs:LangChainAPI:SecondaryAPIKey'] = 'secondary'
+        assert asyncio.run(dependencies.get_api_keys()) == [b'primary', b'secondary']
@@ -0,0 +1,97 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_community.chat_models.fake import FakeListChatModel
+from foundationallm.langchain.agents import LangChainAgentBase
+from foundationallm.langchain.orchestration import OrchestrationManager
+from app.dependencies import validate_api_key_header
+from app.routers import orchestration
+from app.routers.orchestration import get_batch_limit
+
+PROMPT_OBJECT_ID = '/instances/11111111-1111-1111-1111-111111111111/providers/FoundationaLLM.Prompt/prompts/test'
+
+COMPLETION_REQUEST = {
+    'user_prompt': 'Hello',
+    'agent': {
+        'name': 'test',
+        'type': 'knowledge-management',
+        'description': 'Test agent',
+        'prompt_object_id': PROMPT_OBJECT_ID,
+        'orchestration_settings': {
+            'agent_parameters': {
+                PROMPT_OBJECT_ID: {'name': 'test', 'description': 'Test prompt', 'type': 'multipart', 'prefix': 'Be helpful.'}
+            },
+            'endpoint_configuration': {
+                'auth_type': 'key',
+                'provider': 'openai',
+                'endpoint': 'https://api.openai.com/v1'
+            },
+            'model_parameters': {}
+        }
+    }
+}
+
+class FakeConfig:
+    """
+    Fake configuration returning the same value for every setting.
+    """
+    snapshot = None
+
+    def get_value(self, key: str) -> str:
+        return 'key'
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(
+        LangChainAgentBase,
+        '_get_language_model',
+        lambda self, *args: FakeListChatModel(responses=['Hi there']))
+    app = FastAPI(config=FakeConfig())
+    app.include_router(orchestration.router)
+    app.dependency_overrides[validate_api_key_header] = lambda: True
+    return TestClient(app)
+
+def parse_server_sent_events(text: str) -> list:
+    events = []
+    for message in text.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+class OrchestrationTests:
+    """
+    OrchestrationTests is responsible for testing the completion endpoints and the limits of the batch completion endpoint.
+    """
+    @pytest.mark.parametrize('value, expected', [('5', 5), ('0', 8), ('-1', 8), ('abc', 8), ('', 8)])
+    def test_batch_limit_falls_back_to_the_default_on_invalid_values(self, monkeypatch, value, expected):
+        monkeypatch.setenv('FOUNDATIONALLM_TEST_BATCH_LIMIT', value)
+        assert get_batch_limit('FOUNDATIONALLM_TEST_BATCH_LIMIT', 8) == expected
+
+    def test_batch_limit_uses_the_default_when_not_set(self, monkeypatch):
+        monkeypatch.delenv('FOUNDATIONALLM_TEST_BATCH_LIMIT', raising=False)
+        assert get_batch_limit('FOUNDATIONALLM_TEST_BATCH_LIMIT', 8) == 8
+
+    def test_completion_is_streamed_as_server_sent_events(self, client):
+        response = client.post('/orchestration/completion/stream', json=COMPLETION_REQUEST)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+
+        events = parse_server_sent_events(response.text)
+        tokens = [data['token'] for event, data in events if event == 'token']
+        assert ''.join(tokens) == 'Hi there'
+        assert events[-1][0] == 'completion'
+        assert events[-1][1]['completion'] == 'Hi there'
+
+    def test_streamed_completion_ends_with_an_error_event_on_failure(self, monkeypatch, client):
+        async def astream(self, request):
+            yield 'Hi'
+            raise ValueError('The language model is unavailable.')
+        monkeypatch.setattr(OrchestrationManager, 'astream', astream)
+
+        response = client.post('/orchestration/completion/stream', json=COMPLETION_REQUEST)
+        assert response.status_code == 200
+        assert parse_server_sent_events(response.text) == [
+            ('token', {'token': 'Hi'}),
+            ('error', {'detail': 'The language model is unavailable.'})
+        ]
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from foundationallm.hosting import Startup
+from app.main import create_readiness
+from app.routers import status
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('HOSTNAME', 'test')
+    monkeypatch.setenv('FOUNDATIONALLM_VERSION', '0.0.0')
+    app = FastAPI()
+    app.include_router(status.router)
+    return app, TestClient(app)
+
+def start(startup: Startup):
+    try:
+        asyncio.run(startup.start())
+    except Exception:
+        pass
+
+class StatusTests:
+    """
+    StatusTests is responsible for testing the readiness reported by the status endpoints.
+    """
+    def test_ready_when_the_config_is_loaded(self, client):
+        app, test_client = client
+        startup = Startup()
+        startup.add_task('config', lambda: None)
+        start(startup)
+        app.state.startup = startup
+        app.state.readiness = create_readiness(startup, warm_up=False)
+
+        response = test_client.get('/status/ready')
+        assert response.status_code == 200
+        assert response.json()['checks']['config'] is True
+
+    def test_not_ready_when_loading_the_config_fails(self, client):
+        def fail():
+            raise ValueError('The app configuration is unavailable.')
+
+        app, test_client = client
+        startup = Startup()
+        startup.add_task('config', fail)
+        start(startup)
+        app.state.startup = startup
+        app.state.readiness = create_readiness(startup, warm_up=False)
+
+        response = test_client.get('/status/ready')
+        assert response.status_code == 503
+        assert response.json()['checks']['config'] is False
+        assert response.json()['startup'] == {'config': 'failed'}
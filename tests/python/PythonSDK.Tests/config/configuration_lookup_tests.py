@@ -0,0 +1,121 @@
+import threading
+import pytest
+from azure.appconfiguration import ConfigurationSetting, SecretReferenceConfigurationSetting
+from azure.core.exceptions import (
+    ClientAuthenticationError,
+    HttpResponseError,
+    ResourceNotFoundError,
+    ServiceRequestError
+)
+from foundationallm.config import Configuration, KeyVaultReference
+from foundationallm.config import configuration as configuration_module
+
+class LoadedSettings(dict):
+    """
+    Settings returned in place of the Azure App Configuration provider.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+@pytest.fixture
+def test_config(monkeypatch):
+    monkeypatch.setenv('foundationallm-app-configuration-uri', 'https://test.azconfig.io')
+    monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS', '0')
+    monkeypatch.setattr(configuration_module, 'load', lambda **kwargs: LoadedSettings({
+        'FoundationaLLM:Test:TestSetting': 'Original'
+    }))
+    return Configuration()
+
+class ConfigurationLookupTests:
+    """
+    ConfigurationLookupTests is responsible for testing configuration lookups against the loaded snapshot.
+    """
+    def test_missing_key_fails_fast(self, test_config):
+        assert test_config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+        for _ in range(2):
+            with pytest.raises(Exception, match='FoundationaLLM:Test:MissingSetting'):
+                test_config.get_value('FoundationaLLM:Test:MissingSetting')
+        assert test_config.get_feature_flag('MissingFlag') is False
+
+    def test_refresh_swaps_the_snapshot_once(self, monkeypatch, test_config):
+        loading = threading.Event()
+        loads = []
+        def load(**kwargs):
+            loads.append(kwargs)
+            loading.wait(5)
+            return LoadedSettings({'FoundationaLLM:Test:TestSetting': 'Changed'})
+        monkeypatch.setattr(configuration_module, 'load', load)
+        listener = threading.Event()
+        test_config.add_refresh_listener(listener.set)
+
+        refresh = test_config.refresh()
+        assert test_config.refresh() is refresh
+        # Reads are served from the current snapshot while the reload runs.
+        assert test_config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+
+        loading.set()
+        refresh.result(5)
+        assert test_config.get_value('FoundationaLLM:Test:TestSetting') == 'Changed'
+        assert len(loads) == 1
+        assert listener.is_set()
+
+    def test_unloaded_settings_and_secrets_are_fetched_once(self, monkeypatch):
+        secret_id = 'https://test.vault.azure.net/secrets/test-secret'
+        loads = []
+        def load(**kwargs):
+            loads.append(kwargs)
+            return LoadedSettings({'FoundationaLLM:APIs:TestAPI:APIKey': KeyVaultReference(secret_id)})
+        requests = []
+        class AppConfigurationClient:
+            def __init__(self, *args):
+                pass
+            def get_configuration_setting(self, key):
+                requests.append(key)
+                if key == 'FoundationaLLM:Test:SecretSetting':
+                    return SecretReferenceConfigurationSetting(key, secret_id)
+                if key == 'FoundationaLLM:Test:TestSetting':
+                    return ConfigurationSetting(key=key, value='Fetched')
+                raise ResourceNotFoundError('Not found')
+        class SecretClient:
+            def __init__(self, vault_url, credential):
+                pass
+            def get_secret(self, name, version=None):
+                requests.append(name)
+                return type('Secret', (), {'value': 'Resolved'})
+        monkeypatch.setenv('foundationallm-app-configuration-uri', 'https://test.azconfig.io')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS', '0')
+        monkeypatch.setattr(configuration_module, 'load', load)
+        monkeypatch.setattr(configuration_module, 'AzureAppConfigurationClient', AppConfigurationClient)
+        monkeypatch.setattr(configuration_module, 'SecretClient', SecretClient)
+
+        config = Configuration(key_prefixes=['FoundationaLLM:APIs:TestAPI:'])
+        for _ in range(2):
+            assert config.get_value('FoundationaLLM:APIs:TestAPI:APIKey') == 'Resolved'
+            assert config.get_value('FoundationaLLM:Test:SecretSetting') == 'Resolved'
+            assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Fetched'
+            with pytest.raises(Exception):
+                config.get_value('FoundationaLLM:Test:MissingSetting')
+
+        assert [select.key_filter for select in loads[0]['selects']] == \
+            ['FoundationaLLM:APIs:TestAPI:*', '.appconfig.featureflag/*']
+        assert requests == [
+            'test-secret',
+            'FoundationaLLM:Test:SecretSetting',
+            'FoundationaLLM:Test:TestSetting',
+            'FoundationaLLM:Test:MissingSetting'
+        ]
+
+    def test_only_transport_failures_are_retried(self):
+        throttled = HttpResponseError('Throttled')
+        throttled.status_code = 429
+        not_found = HttpResponseError('Not found')
+        not_found.status_code = 404
+
+        assert configuration_module.is_transient_error(ServiceRequestError('Connection refused'))
+        assert configuration_module.is_transient_error(throttled)
+        assert not configuration_module.is_transient_error(not_found)
+        assert not configuration_module.is_transient_error(ClientAuthenticationError('Unauthorized'))
+        assert not configuration_module.is_transient_error(KeyError('FoundationaLLM:Test:MissingSetting'))
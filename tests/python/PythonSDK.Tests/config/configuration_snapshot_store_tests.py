@@ -0,0 +1,60 @@
+import threading
+from cryptography.fernet import Fernet
+from foundationallm.config import Configuration, ConfigurationSnapshot, ConfigurationSnapshotStore, KeyVaultReference
+from foundationallm.config import configuration as configuration_module
+
+class LoadedSettings(dict):
+    """
+    Settings returned in place of the Azure App Configuration provider.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+class ConfigurationSnapshotStoreTests:
+    """
+    ConfigurationSnapshotStoreTests is responsible for testing the persisted last known good configuration.
+    """
+    def test_snapshot_is_encrypted_and_restored(self, tmp_path):
+        path = str(tmp_path / 'configuration.snapshot')
+        secret_id = 'https://test.vault.azure.net/secrets/test-secret'
+        store = ConfigurationSnapshotStore(path, Fernet.generate_key(), ['FoundationaLLM:APIs:TestAPI:'])
+        store.save(ConfigurationSnapshot({
+            'FoundationaLLM:APIs:TestAPI:APIUrl': 'https://test',
+            'FoundationaLLM:APIs:TestAPI:APIKey': KeyVaultReference(secret_id)
+        }), {secret_id: 'Resolved'})
+
+        with open(path, 'rb') as file:
+            assert b'Resolved' not in file.read()
+        snapshot, secrets = store.load()
+        assert snapshot.settings['FoundationaLLM:APIs:TestAPI:APIUrl'] == 'https://test'
+        assert snapshot.settings['FoundationaLLM:APIs:TestAPI:APIKey'].secret_id == secret_id
+        assert secrets == {secret_id: 'Resolved'}
+
+        # A file encrypted with another key is ignored.
+        assert ConfigurationSnapshotStore(path, Fernet.generate_key(), ['FoundationaLLM:APIs:TestAPI:']).load() is None
+
+    def test_configuration_starts_from_the_snapshot(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('foundationallm-app-configuration-uri', 'https://test.azconfig.io')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_REFRESH_INTERVAL_SECONDS', '0')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_PATH', str(tmp_path / 'configuration.snapshot'))
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_SNAPSHOT_KEY', Fernet.generate_key().decode('utf-8'))
+        monkeypatch.setattr(configuration_module, 'load',
+            lambda **kwargs: LoadedSettings({'FoundationaLLM:Test:TestSetting': 'Original'}))
+        Configuration()
+
+        loading = threading.Event()
+        def load(**kwargs):
+            loading.wait(5)
+            return LoadedSettings({'FoundationaLLM:Test:TestSetting': 'Changed'})
+        monkeypatch.setattr(configuration_module, 'load', load)
+
+        # The new process serves the persisted configuration while App Configuration is slow.
+        config = Configuration()
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+
+        loading.set()
+        config.refresh().result(5)
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Changed'
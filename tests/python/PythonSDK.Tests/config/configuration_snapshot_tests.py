@@ -0,0 +1,30 @@
+import pytest
+from foundationallm.config import ConfigurationSnapshot
+
+class ConfigurationSnapshotTests:
+    """
+    ConfigurationSnapshotTests is responsible for testing the immutable configuration snapshot.
+    """
+    def test_feature_flags_are_parsed_once(self):
+        snapshot = ConfigurationSnapshot({
+            'FoundationaLLM:Test:TestSetting': 'Original',
+            'FeatureManagementFeatureFlags': {
+                'Enabled': '{"id": "Enabled", "enabled": true}',
+                'Disabled': '{"id": "Disabled", "enabled": false}',
+                'Invalid': 'not json'
+            }
+        })
+
+        assert snapshot.settings['FoundationaLLM:Test:TestSetting'] == 'Original'
+        assert dict(snapshot.feature_flags) == {'Enabled': True, 'Disabled': False, 'Invalid': False}
+
+    def test_snapshot_is_immutable(self):
+        settings = {'FoundationaLLM:Test:TestSetting': 'Original'}
+        snapshot = ConfigurationSnapshot(settings)
+        settings['FoundationaLLM:Test:TestSetting'] = 'Changed'
+
+        assert snapshot.settings['FoundationaLLM:Test:TestSetting'] == 'Original'
+        with pytest.raises(TypeError):
+            snapshot.settings['FoundationaLLM:Test:TestSetting'] = 'Changed'
+        with pytest.raises(AttributeError):
+            snapshot.settings = {}
@@ -0,0 +1,75 @@
+import time
+import pytest
+from azure.core.credentials import AccessToken
+from azure.identity import ManagedIdentityCredential
+from foundationallm.config import CredentialManager
+
+class FakeCredential:
+    """
+    Credential that issues sequentially numbered tokens without calling Azure.
+    """
+    def __init__(self, lifetime: int = 3600):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls += 1
+        return AccessToken(f'token-{self.calls}', int(time.time()) + self.lifetime)
+
+@pytest.fixture
+def fake_credential():
+    credential = FakeCredential()
+    CredentialManager._credential = credential
+    CredentialManager._tokens = {}
+    yield credential
+    CredentialManager._credential = None
+    CredentialManager._tokens = {}
+
+class CredentialManagerTests:
+    """
+    CredentialManagerTests is responsible for testing the shared token cache.
+    """
+    def test_token_is_fetched_once_per_scope(self, fake_credential):
+        provider = CredentialManager.get_bearer_token_provider('https://test/.default')
+        tokens = [provider() for _ in range(5)]
+        assert tokens == ['token-1'] * 5
+        assert fake_credential.calls == 1
+
+    def test_scopes_are_cached_separately(self, fake_credential):
+        first = CredentialManager.get_token('https://first/.default')
+        second = CredentialManager.get_token('https://second/.default')
+        assert first.token != second.token
+        assert fake_credential.calls == 2
+
+    def test_expiring_token_is_fetched_again(self, fake_credential):
+        fake_credential.lifetime = 1
+        CredentialManager.get_token('https://test/.default')
+        fake_credential.lifetime = 3600
+        token = CredentialManager.get_token('https://test/.default')
+        assert token.token == 'token-2'
+
+    def test_credential_serves_cached_tokens(self, fake_credential):
+        credential = CredentialManager.get_credential()
+        first = credential.get_token('https://test/.default')
+        second = credential.get_token('https://test/.default')
+        assert first is second
+        assert fake_credential.calls == 1
+
+    def test_statistics_report_the_hit_ratio(self, fake_credential):
+        CredentialManager._statistics = dict.fromkeys(CredentialManager._statistics, 0)
+        for _ in range(4):
+            CredentialManager.get_token('https://test/.default')
+
+        statistics = CredentialManager.get_statistics()
+        assert statistics['token_fetches'] == 1
+        assert statistics['token_cache_hits'] == 3
+        assert statistics['hit_ratio'] == 0.75
+
+    def test_configured_credential_type_is_created(self, monkeypatch):
+        monkeypatch.setenv('FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE', 'ManagedIdentity')
+        monkeypatch.setenv('FOUNDATIONALLM_AZURE_CREDENTIAL_CLIENT_ID', '00000000-0000-0000-0000-000000000000')
+        assert isinstance(CredentialManager.create_credential(), ManagedIdentityCredential)
+
+        monkeypatch.setenv('FOUNDATIONALLM_AZURE_CREDENTIAL_TYPE', 'Unknown')
+        with pytest.raises(ValueError):
+            CredentialManager.create_credential()
@@ -0,0 +1,37 @@
+import asyncio
+from foundationallm.hosting import Readiness
+
+class ReadinessTests:
+    """
+    ReadinessTests is responsible for testing the evaluation and caching of readiness checks.
+    """
+    def test_ready_only_when_every_check_passes(self):
+        def fail():
+            raise ConnectionError('unreachable')
+
+        readiness = Readiness()
+        readiness.add_check('config', lambda: True)
+        readiness.add_check('probe', fail)
+
+        ready, checks = asyncio.run(readiness.evaluate())
+        assert not ready
+        assert checks == {'config': True, 'probe': False}
+
+    def test_optional_checks_are_reported_without_gating(self):
+        readiness = Readiness()
+        readiness.add_check('config', lambda: True)
+        readiness.add_check('credentials', lambda: False, required=False)
+
+        ready, checks = asyncio.run(readiness.evaluate())
+        assert ready
+        assert checks == {'config': True, 'credentials': False}
+
+    def test_probe_result_is_reused_until_it_expires(self):
+        calls = []
+        readiness = Readiness()
+        readiness.add_check('probe', lambda: calls.append(1) or True, cache_seconds=60)
+
+        for _ in range(3):
+            ready, _ = asyncio.run(readiness.evaluate())
+            assert ready
+        assert len(calls) == 1
@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from foundationallm.hosting import Startup
+
+class StartupTests:
+    """
+    StartupTests is responsible for testing the ordering and readiness of the startup tasks.
+    """
+    def test_required_tasks_complete_before_start_returns(self):
+        order = []
+
+        async def run():
+            startup = Startup()
+            startup.add_task('config', lambda: order.append('config'))
+            startup.add_task('telemetry', lambda: order.append('telemetry'), depends_on=['config'])
+            await startup.start()
+            return startup
+
+        startup = asyncio.run(run())
+        assert order == ['config', 'telemetry']
+        assert startup.is_ready
+
+    def test_failed_warm_up_does_not_prevent_readiness(self):
+        def fail():
+            raise ValueError('unavailable')
+
+        async def run():
+            startup = Startup()
+            startup.add_task('config', lambda: None)
+            startup.add_task('tokens', fail, required=False)
+            await startup.start()
+            await asyncio.sleep(0.1)
+            return startup
+
+        startup = asyncio.run(run())
+        assert startup.get_status() == {'config': 'completed', 'tokens': 'failed'}
+        assert startup.is_ready
+
+    def test_failed_required_task_stops_startup(self):
+        def fail():
+            raise ValueError('unavailable')
+
+        async def run():
+            startup = Startup()
+            startup.add_task('config', fail)
+            startup.add_task('telemetry', lambda: None, depends_on=['config'])
+            await startup.start()
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
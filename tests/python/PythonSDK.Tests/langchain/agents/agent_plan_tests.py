@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import pytest
+from foundationallm.models.orchestration import OrchestrationSettings
+from foundationallm.models.agents import KnowledgeManagementAgent, KnowledgeManagementCompletionRequest
+from foundationallm.langchain.agents import LangChainKnowledgeManagementAgent
+from foundationallm.langchain.exceptions import LangChainException
+
+PROMPT_OBJECT_ID = '/instances/11111111-1111-1111-1111-111111111111/providers/FoundationaLLM.Prompt/prompts/test'
+
+def create_request(prefix: str = 'You are a helpful assistant.') -> KnowledgeManagementCompletionRequest:
+    return KnowledgeManagementCompletionRequest(
+        user_prompt='Hello',
+        agent=KnowledgeManagementAgent(
+            name='test',
+            type='knowledge-management',
+            description='Test agent',
+            object_id='/instances/11111111-1111-1111-1111-111111111111/providers/FoundationaLLM.Agent/agents/test',
+            prompt_object_id=PROMPT_OBJECT_ID,
+            orchestration_settings=OrchestrationSettings(
+                agent_parameters={
+                    PROMPT_OBJECT_ID: {'name': 'test', 'description': 'Test prompt', 'type': 'multipart', 'prefix': prefix}
+                },
+                endpoint_configuration={
+                    'auth_type': 'token',
+                    'provider': 'microsoft',
+                    'endpoint': 'https://test-openai.openai.azure.com/',
+                    'api_version': '2024-02-15-preview'
+                },
+                model_parameters={'deployment_name': 'completions'}
+            )
+        )
+    )
+
+@pytest.fixture
+def agent():
+    LangChainKnowledgeManagementAgent.clear_agent_plans()
+    yield LangChainKnowledgeManagementAgent(config=None)
+    LangChainKnowledgeManagementAgent.clear_agent_plans()
+
+class AgentPlanTests:
+    """
+    AgentPlanTests is responsible for testing the compilation and caching of agent plans.
+    """
+    def test_plan_is_compiled_once_per_agent_configuration(self, agent):
+        first = agent._get_agent_plan(create_request())
+        second = agent._get_agent_plan(create_request())
+        assert first is second
+        assert first.prompt.prefix == 'You are a helpful assistant.'
+        assert first.endpoint_settings.endpoint == 'https://test-openai.openai.azure.com/'
+
+    def test_changed_agent_configuration_is_recompiled(self, agent):
+        first = agent._get_agent_plan(create_request())
+        second = agent._get_agent_plan(create_request(prefix='You are a pirate.'))
+        assert first is not second
+        assert second.prompt.prefix == 'You are a pirate.'
+
+    def test_plan_is_keyed_by_the_hash_of_the_agent_configuration(self, agent):
+        request = create_request()
+        plan = agent._get_agent_plan(request)
+        assert plan.key == hashlib.sha256(request.agent.model_dump_json().encode('utf-8')).hexdigest()
+
+    def test_agents_with_the_same_configuration_have_separate_plans(self, agent):
+        first = agent._get_agent_plan(create_request())
+        request = create_request()
+        request.agent.object_id = request.agent.object_id.replace('agents/test', 'agents/other')
+        second = agent._get_agent_plan(request)
+        assert first is not second
+
+    def test_plans_are_recompiled_after_they_are_cleared(self, agent):
+        first = agent._get_agent_plan(create_request())
+        LangChainKnowledgeManagementAgent.clear_agent_plans()
+        second = agent._get_agent_plan(create_request())
+        assert first is not second
+
+    def test_async_retrieval_reuses_the_compiled_plan(self, agent):
+        first = asyncio.run(agent._aget_agent_plan(create_request()))
+        second = asyncio.run(agent._aget_agent_plan(create_request()))
+        assert first is second
+        assert first is agent._get_agent_plan(create_request())
+
+    def test_invalid_agent_is_rejected(self, agent):
+        request = create_request()
+        request.agent.orchestration_settings.endpoint_configuration.pop('endpoint')
+        with pytest.raises(LangChainException) as e:
+            agent._get_agent_plan(request)
+        assert e.value.code == 400
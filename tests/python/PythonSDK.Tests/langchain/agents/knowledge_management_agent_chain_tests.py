@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from langchain_community.chat_models.fake import FakeListChatModel
+from foundationallm.models.orchestration import OrchestrationSettings
+from foundationallm.models.agents import KnowledgeManagementAgent, KnowledgeManagementCompletionRequest
+from foundationallm.langchain.agents import LangChainAgentBase, LangChainKnowledgeManagementAgent
+
+PROMPT_OBJECT_ID = '/instances/11111111-1111-1111-1111-111111111111/providers/FoundationaLLM.Prompt/prompts/test'
+
+def create_request(settings: OrchestrationSettings = None) -> KnowledgeManagementCompletionRequest:
+    return KnowledgeManagementCompletionRequest(
+        user_prompt='Hello',
+        settings=settings,
+        agent=KnowledgeManagementAgent(
+            name='test',
+            type='knowledge-management',
+            description='Test agent',
+            prompt_object_id=PROMPT_OBJECT_ID,
+            orchestration_settings=OrchestrationSettings(
+                agent_parameters={
+                    PROMPT_OBJECT_ID: {'name': 'test', 'description': 'Test prompt', 'type': 'multipart', 'prefix': 'Be helpful.'}
+                },
+                endpoint_configuration={
+                    'auth_type': 'token',
+                    'provider': 'microsoft',
+                    'endpoint': 'https://test-openai.openai.azure.com/',
+                    'api_version': '2024-02-15-preview'
+                },
+                model_parameters={'deployment_name': 'completions'}
+            )
+        )
+    )
+
+@pytest.fixture
+def agent():
+    return LangChainKnowledgeManagementAgent(config=None)
+
+def get_chain(agent: LangChainKnowledgeManagementAgent, request: KnowledgeManagementCompletionRequest):
+    return agent._LangChainKnowledgeManagementAgent__get_chain(request, agent._get_agent_plan(request))
+
+class KnowledgeManagementAgentChainTests:
+    """
+    KnowledgeManagementAgentChainTests is responsible for testing the reuse of compiled chains.
+    """
+    def test_chain_is_composed_once_per_agent_configuration(self, agent):
+        first, _, _ = get_chain(agent, create_request())
+        second, _, _ = get_chain(agent, create_request())
+        assert first is second
+
+    def test_request_settings_compose_a_separate_chain(self, agent):
+        first, _, _ = get_chain(agent, create_request())
+        second, _, _ = get_chain(agent, create_request(OrchestrationSettings(model_parameters={'temperature': 0.9})))
+        assert first is not second
+
+    def test_telemetry_is_tagged_with_the_deployment_of_a_bound_model(self, agent):
+        request = create_request(OrchestrationSettings(model_parameters={'temperature': 0.9}))
+        plan = agent._get_agent_plan(request)
+        _, _, language_model = get_chain(agent, request)
+        attributes = agent._LangChainKnowledgeManagementAgent__get_telemetry_attributes(plan, language_model)
+        assert attributes['deployment_name'] == 'completions'
+
+    def test_async_invoke_completes_the_request(self, monkeypatch, agent):
+        monkeypatch.setattr(
+            LangChainAgentBase,
+            '_get_language_model',
+            lambda self, *args: FakeListChatModel(responses=['Hi there']))
+        response = asyncio.run(agent.ainvoke(create_request()))
+        assert response.completion == 'Hi there'
+        assert response.user_prompt == 'Hello'
+        assert response.full_prompt.startswith('Be helpful.')
@@ -0,0 +1,101 @@
+import os
+import stat
+import time
+import pytest
+from langchain_core.embeddings import Embeddings
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES,
+    FOUNDATIONALLM_EMBEDDING_CACHE_PATH,
+    FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS
+)
+from foundationallm.langchain.cache import QueryEmbeddingCache, TTLLRUCache
+
+class FakeEmbeddings(Embeddings):
+    """
+    Embedding model that counts calls and returns a vector derived from the text.
+    """
+    deployment = 'embeddings'
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [float(len(text)), 1.0]
+
+def reset_cache():
+    QueryEmbeddingCache._cache = None
+    QueryEmbeddingCache._store = None
+
+@pytest.fixture
+def embedding_cache(monkeypatch):
+    monkeypatch.delenv(FOUNDATIONALLM_EMBEDDING_CACHE_PATH, raising=False)
+    monkeypatch.setenv(FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES, '2')
+    reset_cache()
+    yield QueryEmbeddingCache
+    reset_cache()
+
+class QueryEmbeddingCacheTests:
+    """
+    QueryEmbeddingCacheTests is responsible for testing the caching of query embeddings.
+    """
+    def test_repeated_query_is_embedded_once(self, embedding_cache):
+        model = FakeEmbeddings()
+        first = embedding_cache.get_embedding(model, 'What is FoundationaLLM?')
+        second = embedding_cache.get_embedding(model, '  what is   FoundationaLLM? ')
+        assert first == second
+        assert model.calls == 1
+        statistics = embedding_cache.get_statistics()
+        assert statistics['hits'] == 1
+        assert statistics['misses'] == 1
+
+    def test_least_recently_used_query_is_evicted(self, embedding_cache):
+        model = FakeEmbeddings()
+        for text in ['first', 'second', 'first', 'third', 'first', 'second']:
+            embedding_cache.get_embedding(model, text)
+        assert model.calls == 4
+        assert embedding_cache.get_statistics()['evictions'] == 2
+
+    def test_disabled_cache_always_embeds(self, embedding_cache, monkeypatch):
+        monkeypatch.setenv(FOUNDATIONALLM_EMBEDDING_CACHE_MAX_ENTRIES, '0')
+        reset_cache()
+        model = FakeEmbeddings()
+        embedding_cache.get_embedding(model, 'query')
+        embedding_cache.get_embedding(model, 'query')
+        assert model.calls == 2
+
+    def test_entries_survive_a_restart(self, embedding_cache, monkeypatch, tmp_path):
+        monkeypatch.setenv(FOUNDATIONALLM_EMBEDDING_CACHE_PATH, str(tmp_path / 'embeddings.db'))
+        monkeypatch.setenv(FOUNDATIONALLM_EMBEDDING_CACHE_TTL_SECONDS, '3600')
+        reset_cache()
+        model = FakeEmbeddings()
+        expected = embedding_cache.get_embedding(model, 'query')
+        embedding_cache._store.flush()
+
+        reset_cache()
+        assert embedding_cache.get_embedding(model, 'query') == expected
+        assert model.calls == 1
+
+    def test_cache_file_does_not_contain_the_query(self, embedding_cache, monkeypatch, tmp_path):
+        path = tmp_path / 'embeddings.db'
+        monkeypatch.setenv(FOUNDATIONALLM_EMBEDDING_CACHE_PATH, str(path))
+        reset_cache()
+        embedding_cache.get_embedding(FakeEmbeddings(), 'My account number is 12345')
+        embedding_cache._store.flush()
+
+        assert b'12345' not in path.read_bytes()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+class TTLLRUCacheTests:
+    """
+    TTLLRUCacheTests is responsible for testing cache expiration.
+    """
+    def test_expired_entry_is_not_returned(self):
+        cache = TTLLRUCache(max_entries=10, ttl_seconds=60)
+        cache.set('key', 'value', created=time.time() - 61)
+        cache.set('other', 'value')
+        assert cache.get('key') is None
+        assert cache.get('other') == 'value'
@@ -0,0 +1,52 @@
+import pytest
+from azure.core.credentials import AzureKeyCredential
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+from foundationallm.config.environment_variables import FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES
+from foundationallm.langchain.cache import RetrievalResultCache
+from foundationallm.langchain.retrievers import AzureAISearchServiceRetriever
+
+ENDPOINT = 'https://test.search.windows.net'
+FIELDS = ('Embedding', 'Id', 'Text', 'AdditionalMetadata')
+
+@pytest.fixture
+def retrieval_cache(monkeypatch):
+    monkeypatch.setenv(FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES, '100')
+    RetrievalResultCache._cache = None
+    yield RetrievalResultCache
+    RetrievalResultCache._cache = None
+
+def get_key(index_name: str, query: str):
+    return RetrievalResultCache.get_key(ENDPOINT, index_name, None, 3, FIELDS, query)
+
+class RetrievalResultCacheTests:
+    """
+    RetrievalResultCacheTests is responsible for testing the caching of search results.
+    """
+    def test_cached_results_are_returned_without_searching(self, retrieval_cache):
+        results = [('1', Document(page_content='cached', metadata={'multipart_id': ['container', 'file.pdf']}))]
+        retrieval_cache.set_results(get_key('index', 'query'), results)
+        retriever = AzureAISearchServiceRetriever(
+            endpoint=ENDPOINT,
+            index_name='index',
+            top_n=3,
+            credential=AzureKeyCredential('key'),
+            embedding_model=OpenAIEmbeddings(api_key='key')
+        )
+        documents = retriever.invoke('query')
+        assert [document.page_content for document in documents] == ['cached']
+        assert retriever.get_document_citations()[0].title == 'file.pdf'
+
+    def test_invalidating_an_index_keeps_other_indexes(self, retrieval_cache):
+        retrieval_cache.set_results(get_key('first', 'query'), [])
+        retrieval_cache.set_results(get_key('second', 'query'), [])
+        assert retrieval_cache.invalidate('first') == 1
+        assert retrieval_cache.get_results(get_key('first', 'query')) is None
+        assert retrieval_cache.get_results(get_key('second', 'query')) == []
+
+    def test_cache_is_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv(FOUNDATIONALLM_RETRIEVAL_CACHE_MAX_ENTRIES, raising=False)
+        RetrievalResultCache._cache = None
+        RetrievalResultCache.set_results(get_key('index', 'query'), [])
+        assert RetrievalResultCache.get_results(get_key('index', 'query')) is None
+        RetrievalResultCache._cache = None
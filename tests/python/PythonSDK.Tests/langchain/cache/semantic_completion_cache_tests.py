@@ -0,0 +1,89 @@
+import pytest
+from foundationallm.models.orchestration import CompletionResponse, OrchestrationSettings
+from foundationallm.models.agents import (
+    AgentConversationHistorySettings,
+    KnowledgeManagementAgent,
+    KnowledgeManagementCompletionRequest
+)
+from foundationallm.langchain.cache import SemanticCompletionCache
+
+def create_request(user_prompt: str, message_history: list = None, **agent_parameters) -> KnowledgeManagementCompletionRequest:
+    return KnowledgeManagementCompletionRequest(
+        user_prompt=user_prompt,
+        agent=KnowledgeManagementAgent(
+            name='faq',
+            type='knowledge-management',
+            description='FAQ agent',
+            orchestration_settings=OrchestrationSettings(
+                agent_parameters={'semantic_cache_enabled': True, **agent_parameters}
+            ),
+            conversation_history=AgentConversationHistorySettings(enabled=True, max_history=5)
+        ),
+        message_history=message_history or []
+    )
+
+@pytest.fixture
+def semantic_cache():
+    SemanticCompletionCache.clear()
+    SemanticCompletionCache._statistics = {'lookups': 0, 'hits': 0, 'saved_tokens': 0}
+    yield SemanticCompletionCache
+    SemanticCompletionCache.clear()
+
+class SemanticCompletionCacheTests:
+    """
+    SemanticCompletionCacheTests is responsible for testing the semantic completion cache.
+    """
+    def test_similar_prompt_returns_cached_completion(self, semantic_cache):
+        request = create_request('What are the opening hours?')
+        semantic_cache.add_completion(
+            request,
+            [1.0, 0.0, 0.0],
+            CompletionResponse(user_prompt=request.user_prompt, completion='9 to 5', total_tokens=120))
+
+        paraphrase = create_request('When are you open?')
+        response = semantic_cache.get_completion(paraphrase, [0.99, 0.05, 0.0])
+        assert response.completion == '9 to 5'
+        assert response.user_prompt == 'When are you open?'
+        assert response.total_tokens == 0
+
+        statistics = semantic_cache.get_statistics()
+        assert statistics['hit_ratio'] == 1.0
+        assert statistics['saved_tokens'] == 120
+
+    def test_cached_completion_does_not_return_the_original_prompt(self, semantic_cache):
+        request = create_request('What are my opening hours, I am Alice?')
+        semantic_cache.add_completion(
+            request,
+            [1.0, 0.0, 0.0],
+            CompletionResponse(
+                user_prompt=request.user_prompt,
+                full_prompt='Context: ... Question: What are my opening hours, I am Alice?',
+                completion='9 to 5',
+                user_prompt_embedding=[1.0, 0.0, 0.0]))
+
+        response = semantic_cache.get_completion(create_request('When are you open?'), [1.0, 0.0, 0.0])
+        assert response.completion == '9 to 5'
+        assert response.user_prompt == 'When are you open?'
+        assert response.full_prompt is None
+        assert response.user_prompt_embedding == []
+
+    def test_dissimilar_prompt_is_a_miss(self, semantic_cache):
+        request = create_request('What are the opening hours?')
+        semantic_cache.add_completion(request, [1.0, 0.0, 0.0], CompletionResponse(user_prompt='', completion='9 to 5'))
+        assert semantic_cache.get_completion(create_request('Where is the exit?'), [0.0, 1.0, 0.0]) is None
+
+    def test_completions_are_scoped_to_the_agent_configuration(self, semantic_cache):
+        request = create_request('What are the opening hours?')
+        semantic_cache.add_completion(request, [1.0, 0.0, 0.0], CompletionResponse(user_prompt='', completion='9 to 5'))
+        changed = create_request('What are the opening hours?', semantic_cache_similarity_threshold=0.5)
+        assert semantic_cache.get_completion(changed, [1.0, 0.0, 0.0]) is None
+
+    def test_cache_is_disabled_with_conversation_history(self, semantic_cache):
+        assert semantic_cache.is_enabled(create_request('Hi'))
+        history = [{'sender': 'User', 'text': 'Hello'}, {'sender': 'Assistant', 'text': 'Hi there'}]
+        assert not semantic_cache.is_enabled(create_request('And the opening hours?', history))
+
+    def test_cache_enabled_parameter_is_parsed_as_a_boolean(self, semantic_cache):
+        assert semantic_cache.is_enabled(create_request('Hi', semantic_cache_enabled='True'))
+        assert not semantic_cache.is_enabled(create_request('Hi', semantic_cache_enabled='false'))
+        assert not semantic_cache.is_enabled(create_request('Hi', semantic_cache_enabled=False))
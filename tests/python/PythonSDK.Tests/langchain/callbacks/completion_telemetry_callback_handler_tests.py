@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from langchain_community.chat_models.fake import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from foundationallm.langchain.callbacks import CompletionTelemetryCallbackHandler
+
+exporter = InMemorySpanExporter()
+
+@pytest.fixture(scope='module', autouse=True)
+def tracer_provider():
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+@pytest.fixture(autouse=True)
+def clear_spans():
+    exporter.clear()
+
+def create_chain():
+    return (
+        PromptTemplate.from_template('Answer: {question}')
+        | FakeListChatModel(responses=['42'])
+        | StrOutputParser()
+    )
+
+def invoke(chain, handler: CompletionTelemetryCallbackHandler):
+    with handler.stage('agent_parsing'):
+        pass
+    return chain.invoke({'question': 'What is the answer?'}, config={'callbacks': [handler]})
+
+class CompletionTelemetryCallbackHandlerTests:
+    """
+    CompletionTelemetryCallbackHandlerTests is responsible for testing the spans recorded for the stages of a completion.
+    """
+    def test_stages_are_children_of_the_completion_span(self):
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span('completion') as completion_span:
+            handler = CompletionTelemetryCallbackHandler(agent_name='test', index_name=None)
+            assert invoke(create_chain(), handler) == '42'
+
+        spans = { span.name: span for span in exporter.get_finished_spans() }
+        assert set(spans) == {'completion', 'agent_parsing', 'prompt', 'llm', 'output_parsing'}
+        for name in ['agent_parsing', 'prompt', 'llm', 'output_parsing']:
+            assert spans[name].parent.span_id == completion_span.get_span_context().span_id
+            assert dict(spans[name].attributes) == {'agent_name': 'test'}
+
+    def test_asynchronous_stages_are_recorded(self):
+        handler = CompletionTelemetryCallbackHandler(agent_name='test')
+        handler.set_attributes(deployment_name='completions')
+
+        completion = asyncio.run(create_chain().ainvoke({'question': 'What is the answer?'}, config={'callbacks': [handler]}))
+
+        assert completion == '42'
+        spans = exporter.get_finished_spans()
+        assert [span.name for span in spans] == ['prompt', 'llm', 'output_parsing']
+        assert spans[1].attributes['deployment_name'] == 'completions'
+
+    def test_failed_stage_is_recorded_as_an_error(self):
+        handler = CompletionTelemetryCallbackHandler(agent_name='test')
+        with pytest.raises(ValueError):
+            with handler.stage('embedding'):
+                raise ValueError('unavailable')
+
+        span, = exporter.get_finished_spans()
+        assert span.name == 'embedding'
+        assert not span.status.is_ok
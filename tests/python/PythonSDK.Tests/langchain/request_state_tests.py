@@ -0,0 +1,30 @@
+import asyncio
+from foundationallm.langchain.request_state import RequestState
+
+class RequestStateTests:
+    """
+    RequestStateTests is responsible for testing the isolation of per-request state.
+    """
+    def test_concurrent_requests_have_separate_state(self):
+        async def execute(name: str) -> str:
+            state = RequestState.start()
+            await asyncio.sleep(0)
+            # Work started by the request, such as chain steps, shares its state.
+            await asyncio.create_task(record(name))
+            await asyncio.sleep(0)
+            return state.full_prompt
+
+        async def record(name: str):
+            RequestState.get().full_prompt = name
+
+        async def main():
+            return await asyncio.gather(*[execute(f'request-{i}') for i in range(10)])
+
+        assert asyncio.run(main()) == [f'request-{i}' for i in range(10)]
+
+    def test_state_is_started_on_first_use(self):
+        async def main():
+            RequestState.get().search_results.append(('1', None))
+            return RequestState.get().search_results
+
+        assert asyncio.run(main()) == [('1', None)]
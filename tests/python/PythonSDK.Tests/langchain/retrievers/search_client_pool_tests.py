@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+from azure.core.credentials import AzureKeyCredential
+from foundationallm.config import CredentialManager
+from foundationallm.langchain.retrievers import SearchClientPool
+
+ENDPOINT = 'https://test.search.windows.net'
+
+@pytest.fixture(autouse=True)
+def clear_pool():
+    SearchClientPool.clear()
+    yield
+    SearchClientPool.clear()
+
+class SearchClientPoolTests:
+    """
+    SearchClientPoolTests is responsible for testing the reuse of Azure AI Search clients.
+    """
+    def test_client_is_reused_for_the_same_index(self):
+        first = SearchClientPool.get_client(ENDPOINT, 'index', CredentialManager.get_credential())
+        second = SearchClientPool.get_client(ENDPOINT, 'index', CredentialManager.get_credential())
+        assert first is second
+
+    def test_clients_are_separate_per_index(self):
+        first = SearchClientPool.get_client(ENDPOINT, 'first', AzureKeyCredential('key'))
+        second = SearchClientPool.get_client(ENDPOINT, 'second', AzureKeyCredential('key'))
+        assert first is not second
+
+    def test_rotated_api_key_creates_a_new_client(self):
+        first = SearchClientPool.get_client(ENDPOINT, 'index', AzureKeyCredential('key'))
+        second = SearchClientPool.get_client(ENDPOINT, 'index', AzureKeyCredential('rotated'))
+        assert first is not second
+
+    def test_async_client_is_reused_on_the_same_event_loop(self):
+        async def get_clients():
+            credential = CredentialManager.get_async_credential()
+            first = SearchClientPool.get_async_client(ENDPOINT, 'index', credential)
+            second = SearchClientPool.get_async_client(ENDPOINT, 'index', credential)
+            return first, second
+        first, second = asyncio.run(get_clients())
+        assert first is second
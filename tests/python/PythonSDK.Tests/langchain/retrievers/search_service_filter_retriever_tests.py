@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import ServiceRequestError
+from langchain_openai import OpenAIEmbeddings
+from foundationallm.langchain.cache import QueryEmbeddingCache
+from foundationallm.langchain.retrievers import SearchClientPool, SearchServiceFilterRetriever
+
+class FakeSearchClient:
+    """
+    Fake search client returning the configured results, or raising the configured error.
+    """
+    def __init__(self, results: list = None, error: Exception = None):
+        self.results = results or []
+        self.error = error
+
+    def search(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return iter(self.results)
+
+class FakeAsyncSearchClient(FakeSearchClient):
+    """
+    Fake asynchronous search client returning the configured results, or raising the configured error.
+    """
+    async def search(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+
+        async def results():
+            for result in self.results:
+                yield result
+        return results()
+
+@pytest.fixture
+def retriever(monkeypatch):
+    async def aget_embedding(embedding_model, text):
+        return [0.1, 0.2]
+    monkeypatch.setattr(QueryEmbeddingCache, 'get_embedding', lambda embedding_model, text: [0.1, 0.2])
+    monkeypatch.setattr(QueryEmbeddingCache, 'aget_embedding', aget_embedding)
+    return SearchServiceFilterRetriever(
+        endpoint='https://test.search.windows.net',
+        index_name='index',
+        filters=["search.ismatch('*', 'metadata', 'simple', 'all')"],
+        top_n=3,
+        credential=AzureKeyCredential('key'),
+        embedding_model=OpenAIEmbeddings(openai_api_key='key')
+    )
+
+def use_client(monkeypatch, client: FakeSearchClient):
+    monkeypatch.setattr(SearchClientPool, 'get_client', lambda endpoint, index_name, credential: client)
+    monkeypatch.setattr(SearchClientPool, 'get_async_client', lambda endpoint, index_name, credential: client)
+
+class SearchServiceFilterRetrieverTests:
+    """
+    SearchServiceFilterRetrieverTests is responsible for testing the documents and errors returned by searches.
+    """
+    def test_results_without_the_text_field_are_skipped(self, monkeypatch, retriever):
+        use_client(monkeypatch, FakeSearchClient([{'Text': 'first'}, {'Other': 'skipped'}]))
+        documents = retriever.get_relevant_documents('query')
+        assert [document.page_content for document in documents] == ['first']
+
+    def test_failed_search_is_raised(self, monkeypatch, retriever):
+        use_client(monkeypatch, FakeSearchClient(error=ServiceRequestError('unavailable')))
+        with pytest.raises(ServiceRequestError):
+            retriever.get_relevant_documents('query')
+
+    def test_async_results_without_the_text_field_are_skipped(self, monkeypatch, retriever):
+        use_client(monkeypatch, FakeAsyncSearchClient([{'Text': 'first'}, {'Other': 'skipped'}]))
+        documents = asyncio.run(retriever.aget_relevant_documents('query'))
+        assert [document.page_content for document in documents] == ['first']
+
+    def test_async_failed_search_is_raised(self, monkeypatch, retriever):
+        use_client(monkeypatch, FakeAsyncSearchClient(error=ServiceRequestError('unavailable')))
+        with pytest.raises(ServiceRequestError):
+            asyncio.run(retriever.aget_relevant_documents('query'))
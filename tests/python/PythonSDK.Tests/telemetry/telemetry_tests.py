@@ -0,0 +1,30 @@
+import pytest
+from foundationallm.telemetry import Telemetry
+
+@pytest.fixture(scope='module', autouse=True)
+def configure_metrics():
+    Telemetry.configure_metrics()
+
+def get_samples() -> list:
+    content, _ = Telemetry.generate_metrics()
+    return [line for line in content.decode('utf-8').splitlines() if not line.startswith('#')]
+
+class TelemetryTests:
+    """
+    TelemetryTests is responsible for testing the metrics exposed to Prometheus.
+    """
+    def test_dependency_duration_is_recorded_with_its_outcome(self):
+        with Telemetry.track_dependency('search'):
+            pass
+        with pytest.raises(ConnectionError):
+            with Telemetry.track_dependency('search'):
+                raise ConnectionError('unreachable')
+
+        samples = get_samples()
+        assert 'foundationallm_dependency_duration_s_count{dependency="search",success="true"} 1.0' in samples
+        assert 'foundationallm_dependency_duration_s_count{dependency="search",success="false"} 1.0' in samples
+
+    def test_cache_hit_ratio_is_read_from_the_cache_statistics(self):
+        Telemetry.add_cache_statistics('test', lambda: { 'hits': 3, 'misses': 1, 'hit_ratio': 0.75 })
+
+        assert 'foundationallm_cache_hit_ratio{cache="test"} 0.75' in get_samples()